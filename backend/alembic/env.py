@@ -28,6 +28,9 @@ from app.models.destination import Destination
 from app.models.user import User 
 from app.models.booking import Booking 
 from app.models.review import Review  
+from app.models.inventory import DestinationInventory
+from app.models.idempotency import IdempotencyRecord
+from app.models.payment import Payment
 # from app.models.user import User  # Import all your models
 from app.core.database import Base  # FIXED: Changed from app.db to app.core.database
 
@@ -0,0 +1,54 @@
+"""add destination_inventory and destinations.daily_capacity
+
+Revision ID: 4f2c9a7d1e36
+Revises: dc49a17a1672
+Create Date: 2026-10-17 18:05:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2c9a7d1e36'
+down_revision: Union[str, Sequence[str], None] = 'dc49a17a1672'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('destinations', sa.Column('daily_capacity', sa.Integer(), nullable=True))
+    op.create_table(
+        'destination_inventory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('destination_id', sa.Integer(), nullable=False),
+        sa.Column('travel_day', sa.Date(), nullable=False),
+        sa.Column('capacity', sa.Integer(), nullable=True),
+        sa.Column('reserved', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['destination_id'], ['destinations.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('destination_id', 'travel_day', name='uq_inventory_destination_day')
+    )
+    op.create_index(op.f('ix_destination_inventory_id'), 'destination_inventory', ['id'], unique=False)
+
+    # Backfill the reserved seats from the bookings that still hold them
+    op.execute(
+        """
+        INSERT INTO destination_inventory (destination_id, travel_day, reserved)
+        SELECT destination_id, DATE(travel_date), SUM(number_of_travelers)
+        FROM bookings
+        WHERE destination_id IS NOT NULL AND travel_date IS NOT NULL
+            AND UPPER(status) NOT IN ('CANCELLED', 'DELETED')
+        GROUP BY destination_id, DATE(travel_date)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_destination_inventory_id'), table_name='destination_inventory')
+    op.drop_table('destination_inventory')
+    op.drop_column('destinations', 'daily_capacity')
@@ -0,0 +1,55 @@
+"""add payments
+
+Revision ID: b8e1f04c6a27
+Revises: 7a3e5c1b9d42
+Create Date: 2026-10-17 21:03:12.418605
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e1f04c6a27'
+down_revision: Union[str, Sequence[str], None] = '7a3e5c1b9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'payments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('payment_reference', sa.String(length=36), nullable=False),
+        sa.Column('booking_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('card_token', sa.String(length=100), nullable=False),
+        sa.Column('card_last4', sa.String(length=4), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('gateway_reference', sa.String(length=100), nullable=True),
+        sa.Column('error', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payments_id'), 'payments', ['id'], unique=False)
+    op.create_index(op.f('ix_payments_payment_reference'), 'payments', ['payment_reference'], unique=True)
+    op.create_index(op.f('ix_payments_booking_id'), 'payments', ['booking_id'], unique=False)
+    op.create_index('ix_payments_status_next_attempt_at', 'payments', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payments_status_next_attempt_at', table_name='payments')
+    op.drop_index(op.f('ix_payments_booking_id'), table_name='payments')
+    op.drop_index(op.f('ix_payments_payment_reference'), table_name='payments')
+    op.drop_index(op.f('ix_payments_id'), table_name='payments')
+    op.drop_table('payments')
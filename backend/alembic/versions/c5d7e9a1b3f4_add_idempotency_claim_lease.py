@@ -0,0 +1,31 @@
+"""add idempotency claim lease
+
+Revision ID: c5d7e9a1b3f4
+Revises: b8e1f04c6a27
+Create Date: 2026-10-17 22:41:05.733192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d7e9a1b3f4'
+down_revision: Union[str, Sequence[str], None] = 'b8e1f04c6a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('idempotency_keys', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.add_column('idempotency_keys', sa.Column('claim_token', sa.String(length=32), nullable=True))
+    op.execute("UPDATE idempotency_keys SET claimed_at = created_at")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotency_keys', 'claim_token')
+    op.drop_column('idempotency_keys', 'claimed_at')
@@ -0,0 +1,45 @@
+"""add review_count and rating_sum to destinations
+
+Revision ID: dc49a17a1672
+Revises: b6a5b3471f48
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dc49a17a1672'
+down_revision: Union[str, Sequence[str], None] = 'b6a5b3471f48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('destinations', sa.Column('review_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('destinations', sa.Column('rating_sum', sa.Float(), server_default='0', nullable=False))
+
+    # Backfill the aggregates from the existing reviews
+    op.execute(
+        """
+        UPDATE destinations SET
+            review_count = (SELECT COUNT(*) FROM reviews WHERE reviews.destination_id = destinations.id),
+            rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM reviews WHERE reviews.destination_id = destinations.id)
+        """
+    )
+    op.execute(
+        """
+        UPDATE destinations SET rating = ROUND(rating_sum / review_count, 1)
+        WHERE review_count > 0
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('destinations', 'rating_sum')
+    op.drop_column('destinations', 'review_count')
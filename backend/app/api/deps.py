@@ -2,12 +2,12 @@
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+from jose import JWTError
 
 # We will create these files next
-from app.core.database import SessionLocal
-from app.core.config import SECRET_KEY, ALGORITHM
+from app.core.database import SessionLocal, AsyncSessionLocal
+from app.core.security import decode_token
 from app.crud import user as user_crud
 from app.models.user import User
 
@@ -23,9 +23,20 @@ def get_db():
     finally:
         db.close()
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_async_db():
+    """
+    Dependency to get an asyncio database session.
+    Used by read-heavy endpoints so they run on the event loop
+    instead of occupying a threadpool worker.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """
     Dependency to get the current authenticated user.
+    Resolved on the event loop (usually from the user cache), so even
+    authenticated async routes never need a threadpool worker.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -33,14 +44,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    user = user_crud.get_user_by_email(db, email=email)
+    user = await user_crud.get_user_by_email_cached_async(db, email=email)
     if user is None:
         raise credentials_exception
     return user
\ No newline at end of file
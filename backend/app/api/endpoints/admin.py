@@ -1,15 +1,22 @@
 # app/api/endpoints/admin.py
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from typing import Any, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func  # Used for efficient sum queries
 
 from app.api.deps import get_current_user, get_db
+from app.api.pagination import decode_cursor, set_next_cursor
+from app.core.cache import all_cache_stats
+from app.crud.review import bulk_create_reviews
+from app.core.database import engine, async_engine
+from app.core.pool_monitor import pool_monitor, async_pool_monitor
 from app.models.user import User
 from app.models.booking import Booking
 from app.models.destination import Destination
-from app.schemas.booking import BookingResponse
+from app.schemas.booking import BookingBulkResult, BookingBulkTransition, BookingResponse
 from app.schemas.destination import DestinationResponse
 from app.services.booking_service import BookingService
 
@@ -48,8 +55,10 @@ def get_dashboard_stats(
 
 @router.get("/bookings", response_model=List[BookingResponse])
 def get_all_bookings_for_admin(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -64,13 +73,47 @@ def get_all_bookings_for_admin(
     
     # Use the BookingService instead of the missing CRUD function
     booking_service = BookingService(db)
-    return booking_service.get_all_bookings(skip=skip, limit=limit)
+    bookings = booking_service.get_all_bookings(skip=skip, limit=limit, after_id=decode_cursor(cursor))
+    set_next_cursor(response, bookings, limit)
+    return bookings
+
+
+@router.post("/bookings/bulk/{action}", response_model=BookingBulkResult)
+def bulk_transition_bookings(
+    action: Literal["confirm", "cancel", "complete"],
+    transition: BookingBulkTransition,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Confirm, cancel or complete many bookings at once (admin only), e.g.
+    complete every confirmed booking whose travel date has passed.
+
+    Bookings are selected by `booking_ids` or by `filter`. The same rules as
+    for single bookings apply, and each booking gets its own outcome.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+    filters = transition.filter.model_dump() if transition.filter else {}
+    results = BookingService(db).bulk_transition(
+        action, booking_ids=transition.booking_ids, limit=transition.limit, **filters
+    )
+    counts = {outcome: 0 for outcome in ("updated", "rejected", "not_found")}
+    for result in results:
+        counts[result["outcome"]] += 1
+    return {"action": action, **counts, "results": results}
 
 
 @router.get("/destinations", response_model=List[DestinationResponse])
 def get_all_destinations_for_admin(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -85,4 +128,121 @@ def get_all_destinations_for_admin(
     
     # For simplicity, we'll do a direct database query here.
     # You could also create a DestinationService for this.
-    return db.query(Destination).offset(skip).limit(limit).all()
\ No newline at end of file
+    query = db.query(Destination)
+    after_id = decode_cursor(cursor)
+    if after_id is not None:
+        query = query.filter(Destination.id > after_id)
+
+    destinations = query.order_by(Destination.id).offset(skip).limit(limit).all()
+    set_next_cursor(response, destinations, limit)
+    return destinations
+
+
+@router.get("/db/pool")
+def get_database_pool_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get live database connection pool statistics (admin only).
+    Useful for sizing the number of workers against the database.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+    return {
+        "sync": pool_monitor.snapshot(engine.pool),
+        "async": async_pool_monitor.snapshot(async_engine.sync_engine.pool),
+    }
+
+
+@router.get("/cache/stats")
+def get_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get size and hit/miss counters for the in-process caches (admin only).
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+    return all_cache_stats()
+
+
+async def _read_ndjson(request: Request) -> Tuple[List[Tuple[int, Any]], List[dict]]:
+    """
+    Parse a newline-delimited JSON body as it streams in.
+    Returns the (index, row) pairs and the errors for lines that aren't valid JSON.
+    """
+    items, errors = [], []
+    buffer = b""
+    index = 0
+
+    def parse(line: bytes):
+        nonlocal index
+        if not line.strip():
+            return
+        try:
+            items.append((index, json.loads(line)))
+        except ValueError:
+            errors.append({"index": index, "error": "Invalid JSON"})
+        index += 1
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            parse(line)
+    parse(buffer)
+
+    return items, errors
+
+
+@router.post("/reviews/bulk")
+async def bulk_import_reviews(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Import many reviews at once (admin only), e.g. when migrating from a partner platform.
+
+    The body is either a JSON array of reviews or, with an
+    application/x-ndjson content type, one review per line.
+    Invalid rows are reported per index without aborting the import.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items, parse_errors = await _read_ndjson(request)
+    else:
+        try:
+            rows = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+        if not isinstance(rows, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Expected a JSON array of reviews"
+            )
+        items, parse_errors = list(enumerate(rows)), []
+
+    # The import itself uses the sync session, so keep it off the event loop
+    result = await run_in_threadpool(bulk_create_reviews, db, items, current_user.id)
+
+    if parse_errors:
+        result["received"] += len(parse_errors)
+        result["failed"] += len(parse_errors)
+        result["errors"] = sorted(result["errors"] + parse_errors, key=lambda error: error["index"])
+
+    return result
@@ -2,11 +2,16 @@
 
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from app.api.deps import get_db, get_current_user
-from app.core.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, verify_password
+from app.api.deps import get_async_db, get_current_user
+from app.core.security import (
+    create_access_token,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    verify_password_async,
+    PasswordHasherBusy,
+)
 from app.crud import user as user_crud
 from app.schemas.user import UserCreate, User, Token
 
@@ -21,30 +26,46 @@ class LoginRequest(BaseModel):
     password: str
 
 
+def _hasher_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 # --------------------------
 # Register endpoint
 # --------------------------
 @router.post("/register", response_model=User)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user.
     """
-    db_user = user_crud.get_user_by_email(db, email=user.email)
+    db_user = await user_crud.get_user_by_email_async(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return user_crud.create_user(db=db, user=user)
+    try:
+        return await user_crud.create_user_async(db=db, user=user)
+    except PasswordHasherBusy:
+        raise _hasher_busy_exception()
 
 
 # --------------------------
 # Login endpoint
 # --------------------------
 @router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Login with email and password, return JWT token.
     """
-    user = user_crud.get_user_by_email(db, email=login_data.email)
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    user = await user_crud.get_user_by_email_async(db, email=login_data.email)
+    try:
+        password_ok = user is not None and await verify_password_async(login_data.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy_exception()
+
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
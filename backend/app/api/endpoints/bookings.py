@@ -1,9 +1,13 @@
 # app/api/endpoints/bookings.py
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user, get_db, get_async_db
+from app.api.idempotency import IDEMPOTENCY_KEY_HEADER, run_idempotent
+from app.api.pagination import decode_cursor, set_next_cursor
+from app.crud.booking import get_user_bookings_async, get_booking_by_id_async
 from app.models.user import User
 from app.models.booking import Booking as BookingModel  # Alias to avoid confusion
 from app.schemas.booking import BookingCreate, BookingResponse, BookingUpdate  # <-- FIX IS HERE
@@ -14,45 +18,55 @@ router = APIRouter()
 @router.post("/", response_model=BookingResponse)
 def create_booking(
     booking: BookingCreate,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Create a new booking
+    Create a new booking.
+    Send an Idempotency-Key header to make retries safe: a retry with the
+    same key returns the original response instead of booking again.
     """
-    try:
-        booking_service = BookingService(db)
-        return booking_service.create_booking(booking, current_user.id)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
+    def create():
+        try:
+            booking_service = BookingService(db)
+            return booking_service.create_booking(booking, current_user.id)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    return run_idempotent(current_user.id, "bookings.create", idempotency_key, booking, BookingResponse, create)
 
 @router.get("/", response_model=List[BookingResponse])
-def get_bookings(
+async def get_bookings(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get all bookings for the current user
     """
-    booking_service = BookingService(db)
-    return booking_service.get_user_bookings(current_user.id, skip=skip, limit=limit)
+    bookings = await get_user_bookings_async(
+        db, current_user.id, skip=skip, limit=limit, after_id=decode_cursor(cursor)
+    )
+    set_next_cursor(response, bookings, limit)
+    return bookings
 
 @router.get("/{booking_id}", response_model=BookingResponse)
-def get_booking(
+async def get_booking(
     booking_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get a specific booking by ID
     """
-    booking_service = BookingService(db)
-    booking = booking_service.get_booking(booking_id)
+    booking = await get_booking_by_id_async(db, booking_id=booking_id)
     
     if not booking:
         raise HTTPException(
@@ -1,26 +1,61 @@
 # app/api/endpoints/destinations.py
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user, get_db, get_async_db
+from app.api.etag import cached_json_response, render_payload
+from app.api.pagination import decode_cursor, next_cursor
+from app.crud.destination import (
+    get_active_destinations_async,
+    get_destination_by_id_async,
+    get_destinations_by_ids_async,
+    get_destination_facets_async,
+)
+from app.services.catalog_cache import destination_catalog
+from app.services.geo_index import geo_index
+from app.services.search_index import search_index
+from app.services.similar_index import similar_index
+from app.services.suggest_index import suggest_index
+from app.services.trending import trending_counters
 from app.models.user import User
 from app.models.destination import Destination as DestinationModel  # Alias to avoid confusion
-from app.schemas.destination import DestinationCreate, DestinationResponse, DestinationUpdate  # <-- FIX IS HERE
+from app.schemas.destination import (
+    DestinationCreate,
+    DestinationFacetsResponse,
+    DestinationResponse,
+    DestinationSuggestion,
+    DestinationUpdate,
+    NearbyDestinationResponse,
+    SimilarDestinationResponse,
+    TrendingDestinationResponse,
+)
 
 router = APIRouter()
 
 @router.get("/", response_model=List[DestinationResponse])
-def get_destinations(
+async def get_destinations(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retrieve all active destinations.
+    Pass the X-Next-Cursor header of the previous page as `cursor` to get the next page.
+    Supports If-None-Match: unchanged pages are answered with 304 Not Modified.
     """
-    destinations = db.query(DestinationModel).filter(DestinationModel.is_active == True).offset(skip).limit(limit).all()
-    return destinations
+    after_id = decode_cursor(cursor)
+
+    async def load():
+        rows = await get_active_destinations_async(db, skip=skip, limit=limit, after_id=after_id)
+        destinations = [DestinationResponse.model_validate(row) for row in rows]
+        return render_payload(destinations, next_cursor=next_cursor(rows, limit))
+
+    payload = await destination_catalog.get_or_load(("list", skip, limit, after_id), load)
+    return cached_json_response(request, payload)
 
 @router.post("/", response_model=DestinationResponse)
 def create_destination(
@@ -43,21 +78,154 @@ def create_destination(
     db.refresh(db_destination)
     return db_destination
 
+@router.get("/search", response_model=List[DestinationResponse])
+async def search_destinations(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Full-text search over destination titles, locations and descriptions,
+    ranked by relevance (BM25).
+    """
+    await search_index.ensure_loaded(db)
+    matches = search_index.search(q, limit=limit)
+    return await get_destinations_by_ids_async(db, [destination_id for destination_id, _ in matches])
+
+@router.get("/suggest", response_model=List[DestinationSuggestion])
+async def suggest_destinations(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Typeahead suggestions: destination titles and locations starting with
+    `prefix`, ranked by rating and popularity. Served from memory.
+    """
+    await suggest_index.ensure_loaded(db)
+    return suggest_index.suggest(prefix, limit=limit)
+
+@router.get("/facets", response_model=DestinationFacetsResponse)
+async def get_destination_facets(
+    request: Request,
+    location: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_rating: Optional[float] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Count active destinations per location, price range and rating range,
+    within the active filters. Results are cached per filter set.
+    """
+    # Normalize the filters so equivalent requests share a cache entry
+    location = location.strip().lower() if location and location.strip() else None
+    filters = (location, min_price, max_price, min_rating)
+
+    async def load():
+        facets = await get_destination_facets_async(db, *filters)
+        return render_payload(DestinationFacetsResponse(**facets))
+
+    payload = await destination_catalog.get_or_load(("facets",) + filters, load)
+    return cached_json_response(request, payload)
+
+@router.get("/nearby", response_model=List[NearbyDestinationResponse])
+async def get_nearby_destinations(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(50, gt=0, le=20000),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get active destinations within `radius_km` of a point, nearest first.
+    """
+    await geo_index.ensure_loaded(db)
+    matches = geo_index.nearby(lat, lon, radius_km, limit=limit)
+    destinations = await get_destinations_by_ids_async(db, [destination_id for destination_id, _ in matches])
+
+    distances = dict(matches)
+    return [
+        NearbyDestinationResponse(
+            **DestinationResponse.model_validate(destination).model_dump(),
+            distance_km=round(distances[destination.id], 3),
+        )
+        for destination in destinations
+    ]
+
+@router.get("/trending", response_model=List[TrendingDestinationResponse])
+async def get_trending_destinations(
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the most popular active destinations right now, ranked by recent
+    bookings, reviews and views (older events count exponentially less).
+    Served from in-memory counters.
+    """
+    await trending_counters.ensure_loaded(db)
+    matches = trending_counters.trending(limit=limit)
+    destinations = await get_destinations_by_ids_async(db, [destination_id for destination_id, _ in matches])
+
+    scores = dict(matches)
+    return [
+        TrendingDestinationResponse(
+            **DestinationResponse.model_validate(destination).model_dump(),
+            trending_score=round(scores[destination.id], 4),
+        )
+        for destination in destinations
+    ]
+
 @router.get("/{destination_id}", response_model=DestinationResponse)
-def get_destination(
+async def get_destination(
     destination_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific destination by ID.
+    Supports If-None-Match: an unchanged destination is answered with 304 Not Modified.
+    """
+    async def load():
+        row = await get_destination_by_id_async(db, destination_id=destination_id)
+        return render_payload(DestinationResponse.model_validate(row)) if row else None
+
+    payload = await destination_catalog.get_or_load(("detail", destination_id), load)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Destination not found"
+        )
+    trending_counters.record_view(destination_id)
+    return cached_json_response(request, payload)
+
+@router.get("/{destination_id}/similar", response_model=List[SimilarDestinationResponse])
+async def get_similar_destinations(
+    destination_id: int,
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the active destinations most similar to a destination (by
+    description, title and location, price and distance), most similar first.
     """
-    destination = db.query(DestinationModel).filter(DestinationModel.id == destination_id).first()
-    if not destination:
+    await similar_index.ensure_loaded(db)
+    matches = similar_index.similar(destination_id, limit=limit)
+    if matches is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Destination not found"
         )
-    return destination
+    destinations = await get_destinations_by_ids_async(db, [similar_id for similar_id, _ in matches])
+
+    similarities = dict(matches)
+    return [
+        SimilarDestinationResponse(
+            **DestinationResponse.model_validate(destination).model_dump(),
+            similarity=round(similarities[destination.id], 4),
+        )
+        for destination in destinations
+    ]
 
 @router.put("/{destination_id}", response_model=DestinationResponse)
 def update_destination(
@@ -1,84 +1,119 @@
 # app/api/endpoints/payments.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
-import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session # Make sure to import Session
 
 from app.api.deps import get_db, get_current_user
-from app.crud.booking import get_booking_by_id, update_booking_status
+from app.api.idempotency import IDEMPOTENCY_KEY_HEADER, run_idempotent
+from app.crud.booking import get_booking_by_id
+from app.models.payment import Payment
 from app.models.user import User
+from app.schemas.payment import PaymentRequest, PaymentResponse
+from app.services.payment_gateway import CardDetails
+from app.services.payments import enqueue_payment, get_payment_by_reference, payment_gateway, payment_workers
 
 router = APIRouter()
 
-class PaymentRequest(BaseModel):
-    booking_id: int
-    card_number: str
-    expiry_date: str
-    cvv: str
-    cardholder_name: str
+PAYMENT_MESSAGES = {
+    "PENDING": "Payment is being processed",
+    "PROCESSING": "Payment is being processed",
+    "SUCCEEDED": "Payment processed successfully",
+}
 
-class PaymentResponse(BaseModel):
-    success: bool
-    payment_id: str
-    message: str
+def _payment_response(payment: Payment) -> dict:
+    return {
+        "payment_id": payment.payment_reference,
+        "booking_id": payment.booking_id,
+        "amount": payment.amount,
+        "status": payment.status,
+        "message": PAYMENT_MESSAGES.get(payment.status) or payment.error or "Payment failed",
+        "card_last4": payment.card_last4,
+        "created_at": payment.created_at,
+        "updated_at": payment.updated_at,
+    }
 
-@router.post("/process", response_model=PaymentResponse)
+@router.post("/process", response_model=PaymentResponse, status_code=status.HTTP_202_ACCEPTED)
 def process_payment(
     payment: PaymentRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
     db: Session = Depends(get_db), # <-- FIX: Added 'db' dependency here
     current_user: User = Depends(get_current_user)
 ):
     """
-    Process a payment for a booking (simulated).
+    Queue a payment for a booking; the card is charged in the background.
+    Poll GET /payments/{payment_id} for the outcome: once the payment has
+    SUCCEEDED the booking is confirmed.
+    Send an Idempotency-Key header to make retries safe: a retry with the
+    same key returns the original response instead of paying again.
     """
-    # In a real implementation, you would integrate with a payment gateway like Stripe or PayPal
-    # Here we're just simulating a payment process
-    
+    return run_idempotent(
+        current_user.id,
+        "payments.process",
+        idempotency_key,
+        payment,
+        PaymentResponse,
+        lambda: _process_payment(payment, db, current_user),
+        success_status=status.HTTP_202_ACCEPTED,
+    )
+
+def _process_payment(payment: PaymentRequest, db: Session, current_user: User) -> dict:
     # Validate card number (simple validation for demo purposes)
     if len(payment.card_number.replace(" ", "")) < 13 or len(payment.card_number.replace(" ", "")) > 19:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid card number"
         )
-    
+
     # Validate CVV
     if len(payment.cvv) < 3 or len(payment.cvv) > 4:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid CVV"
         )
-    
+
     # Get the booking from the database
     booking = get_booking_by_id(db, booking_id=payment.booking_id)
-    
+
     if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Booking not found"
         )
-    
+
     if booking.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to pay for this booking"
         )
-    
-    if booking.status != "pending":
+
+    # Rejects bookings that aren't pending or already have a payment going
+    try:
+        card = CardDetails(payment.card_number, payment.expiry_date, payment.cvv, payment.cardholder_name)
+        queued = enqueue_payment(db, payment_gateway, booking, card)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This booking cannot be paid for"
+            detail=str(e)
         )
-    
-    # Simulate payment processing
-    # In a real implementation, you would call the payment gateway API here
-    payment_id = str(uuid.uuid4())
-    
-    # Update booking status in the database
-    update_booking_status(db, booking_id=payment.booking_id, status="confirmed")
-    
-    return {
-        "success": True,
-        "payment_id": payment_id,
-        "message": "Payment processed successfully"
-    }
\ No newline at end of file
+    payment_workers.notify()
+
+    return _payment_response(queued)
+
+@router.get("/{payment_id}", response_model=PaymentResponse)
+def get_payment(
+    payment_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the status of a payment queued with POST /payments/process.
+    """
+    payment = get_payment_by_reference(db, payment_id)
+    if not payment or (payment.user_id != current_user.id and not current_user.is_admin):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Payment not found"
+        )
+
+    return _payment_response(payment)
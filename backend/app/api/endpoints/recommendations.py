@@ -1,22 +1,46 @@
 # app/api/endpoints/recommendations.py
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_async_db, get_current_user
+from app.crud.destination import get_destinations_by_ids_async
 from app.models.user import User
+from app.schemas.destination import DestinationRecommendationsResponse
+from app.services.recommendations import get_user_interactions, recommender
+from app.services.trending import trending_counters
 
 router = APIRouter()
 
-@router.get("/destinations")
+@router.get("/destinations", response_model=DestinationRecommendationsResponse)
 async def get_recommended_destinations(
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Retrieve personalized destination recommendations for the current user.
+    Destinations similar to the ones the user booked or reviewed come first
+    (item-item collaborative filtering); users without history get the most
+    popular destinations.
     """
-    # TODO: Implement actual recommendation logic here
-    # For now, we'll return a placeholder message.
+    await recommender.ensure_model()
+    user_items = await get_user_interactions(db, current_user.id)
+    popular_ids = None
+    if not recommender.has_model:
+        # The first model is still being built in the background
+        await trending_counters.ensure_loaded(db)
+        trending = trending_counters.trending(limit=limit + len(user_items) + 5)
+        popular_ids = [destination_id for destination_id, _ in trending]
+    # Ask for a few extra ids in case some were deactivated since the model was built
+    destination_ids, strategy = recommender.recommend(user_items, limit=limit + 5, popular_ids=popular_ids)
+    destinations = [
+        destination
+        for destination in await get_destinations_by_ids_async(db, destination_ids)
+        if destination.is_active
+    ][:limit]
     return {
         "message": f"Recommendations for user {current_user.email}",
-        "destinations": [] # Placeholder for a list of destinations
-    }
\ No newline at end of file
+        "strategy": strategy,
+        "destinations": destinations,
+    }
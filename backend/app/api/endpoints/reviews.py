@@ -1,27 +1,46 @@
 # app/api/endpoints/reviews.py
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_async_db, get_current_user
+from app.api.etag import cached_json_response, render_payload
+from app.api.pagination import decode_cursor, next_cursor
 # FIX: Added get_review_by_id to the import statement
-from app.crud.review import get_reviews_by_destination, create_review, update_review, delete_review, get_review_by_id
+from app.crud.review import get_reviews_by_destination_async, create_review, update_review, delete_review, get_review_by_id
 from app.crud.booking import get_bookings_by_user_and_destination
 from app.schemas.review import Review, ReviewCreate, ReviewUpdate
 from app.models.user import User
+from app.services.catalog_cache import review_listings
 
 router = APIRouter()
 
 @router.get("/destination/{destination_id}", response_model=List[Review])
-def read_destination_reviews(
+async def read_destination_reviews(
     destination_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all reviews for a specific destination.
+    Pass `limit` to page through them with the X-Next-Cursor header.
+    Supports If-None-Match: unchanged listings are answered with 304 Not Modified.
     """
-    return get_reviews_by_destination(db, destination_id=destination_id)
+    after_id = decode_cursor(cursor)
+
+    async def load():
+        rows = await get_reviews_by_destination_async(
+            db, destination_id=destination_id, limit=limit, after_id=after_id
+        )
+        reviews = [Review.model_validate(row) for row in rows]
+        return render_payload(reviews, next_cursor=next_cursor(rows, limit))
+
+    payload = await review_listings.get_or_load((limit, after_id), load, scope=destination_id)
+    return cached_json_response(request, payload)
 
 @router.post("/", response_model=Review)
 def create_review_for_destination(
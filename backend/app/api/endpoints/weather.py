@@ -1,131 +1,64 @@
 # app/api/endpoints/weather.py
 
-import httpx # <-- FIX: Added the missing import
-from fastapi import APIRouter, Depends, HTTPException
-from decouple import config
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
-# The 'db' dependency is not used in this function, so it's removed for clarity.
-# from app.api.deps import get_db 
+from app.api.deps import get_async_db
+from app.crud.destination import get_destinations_by_ids_async
+from app.schemas.weather import WeatherBatchItem, WeatherBatchRequest, WeatherBatchResponse
+from app.services.weather import mock_weather, weather_service
 
 router = APIRouter()
-WEATHER_API_KEY = config("WEATHER_API_KEY", default="your-weather-api-key")
-WEATHER_API_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+@router.post("/batch", response_model=WeatherBatchResponse)
+async def get_weather_batch(
+    batch: WeatherBatchRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get current weather for several destinations and/or coordinates at once.
+    Cached answers are returned straight away and the rest are fetched
+    concurrently; items whose weather is unavailable get mock data with
+    `fallback` set. Unknown destination ids are left out.
+    """
+    destinations = await get_destinations_by_ids_async(db, list(dict.fromkeys(batch.destination_ids)))
+
+    items, queries, fallback_locations = [], [], []
+    for destination in destinations:
+        items.append({"destination_id": destination.id, "lat": destination.latitude, "lon": destination.longitude})
+        if destination.latitude is not None and destination.longitude is not None:
+            queries.append(weather_service.coordinates_query(destination.latitude, destination.longitude))
+        else:
+            queries.append(weather_service.city_query(destination.location or destination.title))
+        fallback_locations.append(destination.location or destination.title)
+    for point in batch.coordinates:
+        items.append({"lat": point.lat, "lon": point.lon})
+        queries.append(weather_service.coordinates_query(point.lat, point.lon))
+        fallback_locations.append("Your location")
+
+    results = await weather_service.lookup_many(queries)
+    return WeatherBatchResponse(results=[
+        WeatherBatchItem(
+            **item,
+            weather=mock_weather(fallback_location) if weather is None else weather,
+            fallback=weather is None,
+        )
+        for item, weather, fallback_location in zip(items, results, fallback_locations)
+    ])
 
 @router.get("/{location}")
 async def get_weather(location: str):  # existing: by city name
     """
     Get current weather for a location.
+    Falls back to mock data when no API key is configured or the weather API fails.
     """
-    if not WEATHER_API_KEY or WEATHER_API_KEY == "your-weather-api-key":
-        # Return mock data if no API key is provided
-        return {
-            "location": location,
-            "temperature": 22.5,
-            "description": "Partly cloudy",
-            "humidity": 65,
-            "wind_speed": 5.2,
-            "icon": "02d"
-        }
+    return await weather_service.by_city(location)
 
 @router.get("/")
 async def get_weather_by_coordinates(lat: float, lon: float):
     """
     Get current weather for given coordinates.
+    Answers are cached per ~1 km cell; falls back to mock data when no API
+    key is configured or the weather API fails.
     """
-    if not WEATHER_API_KEY or WEATHER_API_KEY == "your-weather-api-key":
-        # Mock data when no API key is configured
-        return {
-            "location": "Your location",
-            "temperature": 22.5,
-            "description": "Partly cloudy",
-            "humidity": 65,
-            "wind_speed": 5.2,
-            "icon": "02d"
-        }
-
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                WEATHER_API_URL,
-                params={
-                    "lat": lat,
-                    "lon": lon,
-                    "appid": WEATHER_API_KEY,
-                    "units": "metric"
-                }
-            )
-
-            if response.status_code != 200:
-                return {
-                    "location": "Your location",
-                    "temperature": 22.5,
-                    "description": "Partly cloudy",
-                    "humidity": 65,
-                    "wind_speed": 5.2,
-                    "icon": "02d"
-                }
-
-            data = response.json()
-
-            return {
-                "location": data.get("name") or "Your location",
-                "temperature": data["main"]["temp"],
-                "description": data["weather"][0]["description"],
-                "humidity": data["main"]["humidity"],
-                "wind_speed": data["wind"]["speed"],
-                "icon": data["weather"][0]["icon"]
-            }
-
-    except httpx.RequestError:
-        return {
-            "location": "Your location",
-            "temperature": 22.5,
-            "description": "Partly cloudy",
-            "humidity": 65,
-            "wind_speed": 5.2,
-            "icon": "02d"
-        }
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                WEATHER_API_URL,
-                params={
-                    "q": location,
-                    "appid": WEATHER_API_KEY,
-                    "units": "metric"
-                }
-            )
-
-            # If external API fails, fall back to mock data instead of raising an error
-            if response.status_code != 200:
-                return {
-                    "location": location,
-                    "temperature": 22.5,
-                    "description": "Partly cloudy",
-                    "humidity": 65,
-                    "wind_speed": 5.2,
-                    "icon": "02d"
-                }
-
-            data = response.json()
-
-            return {
-                "location": location,
-                "temperature": data["main"]["temp"],
-                "description": data["weather"][0]["description"],
-                "humidity": data["main"]["humidity"],
-                "wind_speed": data["wind"]["speed"],
-                "icon": data["weather"][0]["icon"]
-            }
-
-    except httpx.RequestError:
-        # Also fall back to mock data if there is a network error
-        return {
-            "location": location,
-            "temperature": 22.5,
-            "description": "Partly cloudy",
-            "humidity": 65,
-            "wind_speed": 5.2,
-            "icon": "02d"
-        }
\ No newline at end of file
+    return await weather_service.by_coordinates(lat, lon)
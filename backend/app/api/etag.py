@@ -0,0 +1,68 @@
+# app/api/etag.py
+
+import hashlib
+import json
+from typing import Any, NamedTuple, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+
+
+class CachedPayload(NamedTuple):
+    """
+    A JSON response rendered once and kept in a cache, together with its
+    strong ETag, so cache hits need neither a query nor serialization.
+    """
+    body: bytes
+    etag: str
+    next_cursor: Optional[str] = None
+
+
+def render_payload(payload: Any, next_cursor: Optional[str] = None) -> CachedPayload:
+    """
+    Serialize a payload to JSON and derive its ETag from the content hash.
+    Hashing the content (rather than using a local version number) keeps
+    ETags identical across worker processes.
+    """
+    body = json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return CachedPayload(body=body, etag=etag, next_cursor=next_cursor)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check the request's If-None-Match header against an ETag.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored
+    for value in header.split(","):
+        value = value.strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        if value == etag:
+            return True
+    return False
+
+
+def cached_json_response(request: Request, payload: CachedPayload) -> Response:
+    """
+    Build the response for a cached payload: 304 Not Modified when the
+    client already has this version, the pre-rendered JSON otherwise.
+    """
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if payload.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = payload.next_cursor
+
+    if etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=payload.body, media_type="application/json", headers=headers)
@@ -0,0 +1,281 @@
+# app/api/idempotency.py
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Type
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.api.etag import render_payload
+from app.core.cache import MISSING, create_cache
+from app.core.config import (
+    IDEMPOTENCY_CACHE_MAX_SIZE,
+    IDEMPOTENCY_CLAIM_LEASE_SECONDS,
+    IDEMPOTENCY_KEY_TTL_HOURS,
+    IDEMPOTENCY_WAIT_SECONDS,
+)
+from app.core.database import SessionLocal
+from app.models.idempotency import IdempotencyRecord
+
+# Clients send a unique key per logical request in this header and reuse it
+# when retrying; the retry then gets the original response, marked with
+# IDEMPOTENT_REPLAYED_HEADER, instead of running the request again.
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# How often a retry checks whether another process finished the request
+_POLL_SECONDS = 0.1
+
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    status_code: int
+    body: bytes
+
+
+# In-memory front for the idempotency_keys table: recent responses are
+# replayed without a query
+_responses = create_cache(
+    "idempotency", max_size=IDEMPOTENCY_CACHE_MAX_SIZE, ttl=IDEMPOTENCY_KEY_TTL_HOURS * 3600
+)
+
+# Requests running in this process, so concurrent retries wait for them
+_inflight: Dict[Tuple, threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+
+def request_hash(payload: BaseModel) -> str:
+    raw = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def run_idempotent(
+    user_id: int,
+    scope: str,
+    key: Optional[str],
+    payload: BaseModel,
+    response_model: Type[BaseModel],
+    handler: Callable[[], Any],
+    success_status: int = status.HTTP_200_OK,
+) -> Any:
+    """
+    Run `handler` at most once per (user, scope, Idempotency-Key).
+
+    Without a key the handler simply runs. With a key, the first request
+    runs it and stores the response (successes and 4xx errors); retries
+    get that response back, and retries arriving while it is still running
+    wait for it. Reusing a key for a different payload is a 422 error.
+    `success_status` is the status code of the endpoint's own responses.
+    """
+    if key is None:
+        return handler()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters"
+        )
+
+    cache_key = (user_id, scope, key)
+    payload_hash = request_hash(payload)
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        stored = _responses.get(cache_key)
+        if stored is not MISSING:
+            return _replay(stored, payload_hash)
+
+        with _inflight_lock:
+            running = _inflight.get(cache_key)
+            if running is None:
+                _inflight[cache_key] = threading.Event()
+        if running is None:
+            break
+        if not running.wait(max(0.0, deadline - time.monotonic())):
+            raise _still_running()
+
+    try:
+        stored, claim_token = _claim(cache_key, payload_hash, deadline)
+        if stored is not None:
+            return _replay(stored, payload_hash)
+        return _execute(cache_key, claim_token, payload_hash, response_model, handler, success_status)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cache_key).set()
+
+
+def _claim(cache_key: Tuple, payload_hash: str, deadline: float) -> Tuple[Optional[StoredResponse], Optional[str]]:
+    """
+    Insert the in-progress row for a key. Returns the stored response when
+    the key was already used (waiting for another process to finish), or
+    else the token of this request's claim: it may run.
+    """
+    user_id, scope, key = cache_key
+    expired_before = datetime.utcnow() - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+    claim_token = uuid.uuid4().hex
+    db = SessionLocal()
+    try:
+        while True:
+            try:
+                db.add(IdempotencyRecord(
+                    user_id=user_id,
+                    scope=scope,
+                    key=key,
+                    request_hash=payload_hash,
+                    claimed_at=datetime.utcnow(),
+                    claim_token=claim_token,
+                ))
+                db.commit()
+                return None, claim_token
+            except IntegrityError:
+                db.rollback()
+
+            record = db.execute(
+                select(IdempotencyRecord).where(
+                    IdempotencyRecord.user_id == user_id,
+                    IdempotencyRecord.scope == scope,
+                    IdempotencyRecord.key == key,
+                )
+            ).scalars().first()
+            if record is None:
+                continue
+            if record.created_at is not None and record.created_at < expired_before:
+                # Too old to replay: the key can be used again
+                db.delete(record)
+                db.commit()
+                continue
+            if record.status_code is not None:
+                stored = StoredResponse(record.request_hash, record.status_code, record.response_body.encode())
+                _responses.set(cache_key, stored)
+                return stored, None
+
+            now = datetime.utcnow()
+            lease_expired_before = now - timedelta(seconds=IDEMPOTENCY_CLAIM_LEASE_SECONDS)
+            if record.claimed_at is None or record.claimed_at < lease_expired_before:
+                # The process running it died: take the claim over, unless
+                # another retry just did
+                taken = db.execute(
+                    update(IdempotencyRecord)
+                    .where(
+                        IdempotencyRecord.id == record.id,
+                        IdempotencyRecord.status_code.is_(None),
+                        or_(
+                            IdempotencyRecord.claimed_at.is_(None),
+                            IdempotencyRecord.claimed_at < lease_expired_before,
+                        ),
+                    )
+                    .values(request_hash=payload_hash, claimed_at=now, claim_token=claim_token)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                if taken == 1:
+                    return None, claim_token
+                continue
+
+            # Another process is running this request
+            if time.monotonic() >= deadline:
+                raise _still_running()
+            db.rollback()
+            time.sleep(_POLL_SECONDS)
+    finally:
+        db.close()
+
+
+def _execute(
+    cache_key: Tuple,
+    claim_token: str,
+    payload_hash: str,
+    response_model: Type[BaseModel],
+    handler: Callable[[], Any],
+    success_status: int,
+) -> Response:
+    try:
+        result = handler()
+    except HTTPException as e:
+        if e.status_code >= 500:
+            _release(cache_key, claim_token)
+            raise
+        # Client errors are final too: a retry would get the same answer
+        body = json.dumps({"detail": jsonable_encoder(e.detail)}, separators=(",", ":")).encode()
+        _store(cache_key, claim_token, StoredResponse(payload_hash, e.status_code, body))
+        raise
+    except BaseException:
+        _release(cache_key, claim_token)
+        raise
+
+    body = render_payload(response_model.model_validate(result)).body
+    _store(cache_key, claim_token, StoredResponse(payload_hash, success_status, body))
+    return Response(content=body, status_code=success_status, media_type="application/json")
+
+
+def _store(cache_key: Tuple, claim_token: str, stored: StoredResponse) -> None:
+    """
+    Save the response, unless the claim was taken over after its lease ran out.
+    """
+    user_id, scope, key = cache_key
+    db = SessionLocal()
+    try:
+        saved = db.execute(
+            update(IdempotencyRecord)
+            .where(
+                IdempotencyRecord.user_id == user_id,
+                IdempotencyRecord.scope == scope,
+                IdempotencyRecord.key == key,
+                IdempotencyRecord.claim_token == claim_token,
+            )
+            .values(status_code=stored.status_code, response_body=stored.body.decode())
+        ).rowcount
+        db.commit()
+    finally:
+        db.close()
+    if saved == 1:
+        _responses.set(cache_key, stored)
+
+
+def _release(cache_key: Tuple, claim_token: str) -> None:
+    """
+    Drop the claim of a request that failed unexpectedly, so it can be retried.
+    """
+    user_id, scope, key = cache_key
+    db = SessionLocal()
+    try:
+        db.execute(
+            delete(IdempotencyRecord).where(
+                IdempotencyRecord.user_id == user_id,
+                IdempotencyRecord.scope == scope,
+                IdempotencyRecord.key == key,
+                IdempotencyRecord.status_code.is_(None),
+                IdempotencyRecord.claim_token == claim_token,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _replay(stored: StoredResponse, payload_hash: str) -> Response:
+    if stored.request_hash != payload_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} was already used for a different request"
+        )
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={IDEMPOTENT_REPLAYED_HEADER: "true"},
+    )
+
+
+def _still_running() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"A request with this {IDEMPOTENCY_KEY_HEADER} is still being processed"
+    )
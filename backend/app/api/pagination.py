@@ -0,0 +1,62 @@
+# app/api/pagination.py
+
+import base64
+import json
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+
+# Listings are paginated by keyset (cursor) instead of offset: the cursor
+# records the id of the last row on the page and the next page starts
+# right after it, so deep pages cost the same as the first one.
+# The cursor for the next page is returned in this response header
+# (it is absent on the last page).
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Build an opaque cursor pointing just after the row with the given id.
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Return the id stored in a cursor, or None when no cursor was given.
+    Raises a 400 error for malformed cursors.
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = data["id"]
+        if not isinstance(last_id, int):
+            raise ValueError("Cursor id must be an integer")
+        return last_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def next_cursor(items: Sequence, limit: Optional[int]) -> Optional[str]:
+    """
+    Return the cursor of the next page, or None when this page is the last one.
+    """
+    if limit is not None and items and len(items) >= limit:
+        return encode_cursor(items[-1].id)
+    return None
+
+
+def set_next_cursor(response: Response, items: Sequence, limit: int) -> None:
+    """
+    Add the next-page cursor header when the page is full.
+    """
+    cursor = next_cursor(items, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
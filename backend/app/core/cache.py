@@ -0,0 +1,147 @@
+# app/core/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Sentinel returned by TTLCache.get() when a key is missing or expired,
+# so that None can be cached as a legitimate value.
+MISSING = object()
+
+
+class TTLCache:
+    """
+    A small thread-safe in-process cache with a maximum size (least recently
+    used entries are evicted first) and a per-entry time to live.
+
+    Keeps hit/miss counters so the cache can be monitored from the admin API.
+    """
+
+    def __init__(self, name: str, max_size: int = 1024, ttl: float = 60.0):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value. `ttl` overrides the cache-wide time to live for this entry.
+        """
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Every cache created through create_cache() is registered here so the
+# admin API can report on all of them in one place.
+_registry: Dict[str, TTLCache] = {}
+
+
+def create_cache(name: str, max_size: int = 1024, ttl: float = 60.0) -> TTLCache:
+    cache = TTLCache(name, max_size=max_size, ttl=ttl)
+    _registry[name] = cache
+    return cache
+
+
+def all_cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+class VersionedCache:
+    """
+    A read-through cache whose entries are keyed by a version counter.
+
+    Invalidating bumps the version instead of deleting entries, so anything
+    loaded under an older version is never served again and simply ages out
+    of the underlying LRU. Versions can be bumped for the whole cache or for
+    a single scope (e.g. one destination).
+    """
+
+    def __init__(self, name: str, max_size: int = 1024, ttl: float = 60.0):
+        self._cache = create_cache(name, max_size=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+        self._version = 0
+        self._scope_versions: Dict[Hashable, int] = {}
+
+    def version(self, scope: Hashable = None) -> tuple:
+        return (self._version, self._scope_versions.get(scope, 0))
+
+    def invalidate(self, scope: Hashable = None) -> None:
+        """
+        Invalidate a single scope, or everything when no scope is given.
+        """
+        with self._lock:
+            if scope is None:
+                self._version += 1
+            else:
+                self._scope_versions[scope] = self._scope_versions.get(scope, 0) + 1
+
+    async def get_or_load(self, key: Hashable, loader, scope: Hashable = None) -> Any:
+        """
+        Return the cached value for `key`, awaiting `loader()` on a miss.
+        """
+        # Capture the version before loading: if a write lands while we are
+        # querying, the result is stored under the old version and never served.
+        cache_key = (self.version(scope), scope, key)
+        value = self._cache.get(cache_key)
+        if value is not MISSING:
+            return value
+
+        value = await loader()
+        self._cache.set(cache_key, value)
+        return value
@@ -0,0 +1,61 @@
+# app/core/circuit_breaker.py
+
+import threading
+import time
+from typing import Optional
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream for a while.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    allow() refuses calls for `reset_seconds`. Then a single trial call is
+    let through (half-open): a success closes the circuit again, a failure
+    re-opens it for another `reset_seconds`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go ahead now. Every allowed call must be followed
+        by record_success() or record_failure().
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
@@ -12,4 +12,126 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 DATABASE_URL = config("DATABASE_URL")
 
-WEATHER_API_KEY = config("WEATHER_API_KEY", default="")
\ No newline at end of file
+# Optional URL for the asyncio engine. When it is not set the async URL is
+# derived from DATABASE_URL by swapping in an async driver (see database.py).
+ASYNC_DATABASE_URL = config("ASYNC_DATABASE_URL", default="")
+
+WEATHER_API_KEY = config("WEATHER_API_KEY", default="")
+
+# Weather proxy (OpenWeatherMap). WEATHER_API_URL can point at a local stub
+# server in tests. Responses are cached per city name or per coordinates
+# rounded to WEATHER_COORDINATE_DECIMALS places (2 places is about 1 km).
+WEATHER_API_URL = config("WEATHER_API_URL", default="https://api.openweathermap.org/data/2.5/weather")
+WEATHER_CACHE_TTL_SECONDS = config("WEATHER_CACHE_TTL_SECONDS", default=600.0, cast=float)
+WEATHER_CACHE_MAX_SIZE = config("WEATHER_CACHE_MAX_SIZE", default=2048, cast=int)
+WEATHER_COORDINATE_DECIMALS = config("WEATHER_COORDINATE_DECIMALS", default=2, cast=int)
+WEATHER_TIMEOUT_SECONDS = config("WEATHER_TIMEOUT_SECONDS", default=5.0, cast=float)
+WEATHER_MAX_CONNECTIONS = config("WEATHER_MAX_CONNECTIONS", default=20, cast=int)
+# POST /api/weather/batch fetches its cache misses at most
+# WEATHER_BATCH_CONCURRENCY at a time, giving each WEATHER_BATCH_TIMEOUT_SECONDS
+# before answering that item with mock data.
+WEATHER_BATCH_CONCURRENCY = config("WEATHER_BATCH_CONCURRENCY", default=8, cast=int)
+WEATHER_BATCH_TIMEOUT_SECONDS = config("WEATHER_BATCH_TIMEOUT_SECONDS", default=2.0, cast=float)
+# Cached answers older than WEATHER_CACHE_TTL_SECONDS are still served, up to
+# WEATHER_STALE_TTL_SECONDS, while they are refreshed in the background.
+# A background task re-fetches the weather of every active destination every
+# WEATHER_PREFETCH_INTERVAL_SECONDS, WEATHER_PREFETCH_CONCURRENCY at a time.
+WEATHER_STALE_TTL_SECONDS = config("WEATHER_STALE_TTL_SECONDS", default=21600.0, cast=float)
+WEATHER_PREFETCH_INTERVAL_SECONDS = config("WEATHER_PREFETCH_INTERVAL_SECONDS", default=300.0, cast=float)
+WEATHER_PREFETCH_CONCURRENCY = config("WEATHER_PREFETCH_CONCURRENCY", default=4, cast=int)
+# After WEATHER_CIRCUIT_FAILURE_THRESHOLD failures in a row the upstream is
+# left alone for WEATHER_CIRCUIT_RESET_SECONDS (cached or mock data is served).
+WEATHER_CIRCUIT_FAILURE_THRESHOLD = config("WEATHER_CIRCUIT_FAILURE_THRESHOLD", default=5, cast=int)
+WEATHER_CIRCUIT_RESET_SECONDS = config("WEATHER_CIRCUIT_RESET_SECONDS", default=60.0, cast=float)
+
+# Database connection pool settings.
+# The defaults match SQLAlchemy's QueuePool defaults, except that stale
+# connections are pinged before use and recycled before MySQL's idle
+# wait_timeout can close them underneath us.
+DB_POOL_SIZE = config("DB_POOL_SIZE", default=5, cast=int)
+DB_MAX_OVERFLOW = config("DB_MAX_OVERFLOW", default=10, cast=int)
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=30.0, cast=float)
+DB_POOL_RECYCLE = config("DB_POOL_RECYCLE", default=1800, cast=int)
+DB_POOL_PRE_PING = config("DB_POOL_PRE_PING", default=True, cast=bool)
+
+# Authenticated user cache used by get_current_user.
+# Entries are dropped as soon as the user row changes; the TTL only bounds
+# how stale a user can be when it was changed by another worker process.
+USER_CACHE_TTL_SECONDS = config("USER_CACHE_TTL_SECONDS", default=60.0, cast=float)
+USER_CACHE_MAX_SIZE = config("USER_CACHE_MAX_SIZE", default=1024, cast=int)
+
+# Password hashing (bcrypt) worker pool.
+# bcrypt is deliberately slow, so hashing runs on a small dedicated pool and
+# requests are rejected with a 503 once PASSWORD_HASH_QUEUE_SIZE jobs are waiting.
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+PASSWORD_HASH_QUEUE_SIZE = config("PASSWORD_HASH_QUEUE_SIZE", default=16, cast=int)
+
+# Maximum number of decoded JWTs kept in memory. Entries expire together
+# with the token itself (its "exp" claim).
+JWT_CACHE_MAX_SIZE = config("JWT_CACHE_MAX_SIZE", default=4096, cast=int)
+
+# In-process cache for the public destination catalog. It is invalidated on
+# every destination write; the TTL is only a safety net for writes made by
+# other processes (e.g. another worker or a maintenance script).
+CATALOG_CACHE_TTL_SECONDS = config("CATALOG_CACHE_TTL_SECONDS", default=300.0, cast=float)
+CATALOG_CACHE_MAX_SIZE = config("CATALOG_CACHE_MAX_SIZE", default=512, cast=int)
+
+# How often the in-memory destination indexes (search, ...) are rebuilt from
+# the database. Writes made by this process are applied immediately; the
+# rebuild picks up writes made by other processes.
+DESTINATION_INDEX_REFRESH_SECONDS = config("DESTINATION_INDEX_REFRESH_SECONDS", default=600.0, cast=float)
+
+# Item-item collaborative filtering behind /api/recommendations/destinations.
+# The full model is built offline with `python rebuild_recommendations.py`
+# (or in a background thread when no saved model exists) and saved to
+# RECOMMENDATION_MODEL_PATH; workers reload the file when it changes.
+# New bookings and reviews are folded in incrementally by a background
+# updater every RECOMMENDATION_UPDATE_INTERVAL_SECONDS at most, and the
+# accumulated changes are compacted into a new saved model every
+# RECOMMENDATION_COMPACTION_SECONDS. Cancelled bookings and edited or
+# deleted reviews need a full rebuild: it replaces the next compaction after
+# this process made such a change, and runs at least every
+# RECOMMENDATION_REBUILD_SECONDS for the other processes' changes.
+RECOMMENDATION_MODEL_PATH = config("RECOMMENDATION_MODEL_PATH", default="recommendation_model.npz")
+RECOMMENDATION_UPDATE_INTERVAL_SECONDS = config("RECOMMENDATION_UPDATE_INTERVAL_SECONDS", default=5.0, cast=float)
+RECOMMENDATION_COMPACTION_SECONDS = config("RECOMMENDATION_COMPACTION_SECONDS", default=900.0, cast=float)
+RECOMMENDATION_REBUILD_SECONDS = config("RECOMMENDATION_REBUILD_SECONDS", default=21600.0, cast=float)
+RECOMMENDATION_NEIGHBOURS = config("RECOMMENDATION_NEIGHBOURS", default=20, cast=int)
+
+# Precomputed "similar destinations" lists (top-k per destination), saved to
+# SIMILAR_DESTINATIONS_PATH so a restart only recomputes what changed.
+SIMILAR_DESTINATIONS_PATH = config("SIMILAR_DESTINATIONS_PATH", default="similar_destinations.npz")
+SIMILAR_DESTINATIONS_NEIGHBOURS = config("SIMILAR_DESTINATIONS_NEIGHBOURS", default=20, cast=int)
+
+# /api/destinations/trending ranks destinations by bookings, reviews and
+# detail views, each counting half as much every TRENDING_HALF_LIFE_HOURS.
+# The TRENDING_TOP_SIZE most popular destinations are kept ready to serve.
+TRENDING_HALF_LIFE_HOURS = config("TRENDING_HALF_LIFE_HOURS", default=48.0, cast=float)
+TRENDING_TOP_SIZE = config("TRENDING_TOP_SIZE", default=100, cast=int)
+
+# Idempotency-Key support for booking creation and payments. Stored responses
+# are replayed for IDEMPOTENCY_KEY_TTL_HOURS; the most recent ones are also
+# kept in memory. A retry that arrives while the original request is still
+# running waits up to IDEMPOTENCY_WAIT_SECONDS for its response. A request
+# still unfinished after IDEMPOTENCY_CLAIM_LEASE_SECONDS is assumed to have
+# died with its process, and a retry runs it again.
+IDEMPOTENCY_KEY_TTL_HOURS = config("IDEMPOTENCY_KEY_TTL_HOURS", default=24.0, cast=float)
+IDEMPOTENCY_CACHE_MAX_SIZE = config("IDEMPOTENCY_CACHE_MAX_SIZE", default=4096, cast=int)
+IDEMPOTENCY_WAIT_SECONDS = config("IDEMPOTENCY_WAIT_SECONDS", default=30.0, cast=float)
+IDEMPOTENCY_CLAIM_LEASE_SECONDS = config("IDEMPOTENCY_CLAIM_LEASE_SECONDS", default=120.0, cast=float)
+
+# Payments are queued in the payments table and charged in the background by
+# PAYMENT_WORKERS threads per process (0 only queues them, for API processes
+# when run_payment_workers.py runs elsewhere) through PAYMENT_GATEWAY. Idle
+# workers look for due jobs every PAYMENT_POLL_SECONDS. Gateway errors are
+# retried PAYMENT_MAX_ATTEMPTS times in all, PAYMENT_RETRY_SECONDS apart at
+# first and twice as long each time; a job whose worker died is picked up
+# again after PAYMENT_LEASE_SECONDS. The "simulated" gateway takes
+# PAYMENT_SIMULATED_LATENCY_SECONDS per charge.
+PAYMENT_GATEWAY = config("PAYMENT_GATEWAY", default="simulated")
+PAYMENT_WORKERS = config("PAYMENT_WORKERS", default=4, cast=int)
+PAYMENT_POLL_SECONDS = config("PAYMENT_POLL_SECONDS", default=1.0, cast=float)
+PAYMENT_MAX_ATTEMPTS = config("PAYMENT_MAX_ATTEMPTS", default=5, cast=int)
+PAYMENT_RETRY_SECONDS = config("PAYMENT_RETRY_SECONDS", default=5.0, cast=float)
+PAYMENT_LEASE_SECONDS = config("PAYMENT_LEASE_SECONDS", default=60.0, cast=float)
+PAYMENT_SIMULATED_LATENCY_SECONDS = config("PAYMENT_SIMULATED_LATENCY_SECONDS", default=0.5, cast=float)
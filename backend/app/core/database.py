@@ -1,21 +1,85 @@
 # app/core/database.py
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from decouple import config
 
-# Get the database URL from the .env file
-DATABASE_URL = config("DATABASE_URL")
+from app.core.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+)
+from app.core.pool_monitor import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+# Async drivers to use for each backend when ASYNC_DATABASE_URL is not set.
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def _async_url(url: str) -> str:
+    """
+    Derive the asyncio database URL from the regular (sync) one,
+    e.g. mysql+pymysql://... becomes mysql+aiomysql://...
+    """
+    sync_url = make_url(url)
+    backend = sync_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}', set ASYNC_DATABASE_URL")
+    return sync_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def _engine_options(url: str, poolclass=InstrumentedQueuePool) -> dict:
+    """
+    Build the connection pool arguments for the given database URL.
+    SQLite manages its own (file based) connections, so the QueuePool
+    sizing options only apply to server databases such as MySQL.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
 
 # Create the SQLAlchemy engine
 # The engine is the starting point for any SQLAlchemy application.
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
 
 # Create a configured "Session" class
 # All future sessions will be created from this class.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The asyncio engine and session factory, used by the hot read routes so that
+# they don't need a threadpool worker for every in-flight request.
+# expire_on_commit=False keeps loaded objects usable after the session closes,
+# since lazy loading is not available in async code.
+async_database_url = ASYNC_DATABASE_URL or _async_url(DATABASE_URL)
+async_engine = create_async_engine(
+    async_database_url,
+    **_engine_options(async_database_url, poolclass=InstrumentedAsyncQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Create a Base class for our declarative models
 # All of our models will inherit from this Base class.
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
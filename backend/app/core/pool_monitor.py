@@ -0,0 +1,128 @@
+# app/core/pool_monitor.py
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (in seconds) of the checkout wait-time histogram buckets.
+# Anything slower than the last bound lands in the overflow "+Inf" bucket.
+WAIT_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0]
+
+
+class PoolMonitor:
+    """
+    Collects connection pool statistics: how long requests wait for a
+    connection, how often the pool times out and how many connections
+    are currently in use.
+    """
+
+    def __init__(self, buckets: List[float] = WAIT_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets = list(buckets)
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._bucket_counts = [0] * (len(self._buckets) + 1)
+            self._wait_count = 0
+            self._wait_sum = 0.0
+            self._wait_max = 0.0
+            self._timeouts = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        """
+        Record how long a single checkout waited for a connection.
+        """
+        index = bisect_left(self._buckets, seconds)
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._wait_count += 1
+            self._wait_sum += seconds
+            if seconds > self._wait_max:
+                self._wait_max = seconds
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self, pool) -> Dict:
+        """
+        Return the live pool state together with the wait-time histogram.
+        """
+        with self._lock:
+            histogram = {}
+            for bound, count in zip(self._buckets, self._bucket_counts):
+                histogram[f"le_{bound}"] = count
+            histogram["le_inf"] = self._bucket_counts[-1]
+            wait_count = self._wait_count
+            wait_sum = self._wait_sum
+            wait_max = self._wait_max
+            timeouts = self._timeouts
+
+        stats = {
+            "pool_class": type(pool).__name__,
+            "wait": {
+                "count": wait_count,
+                "avg_seconds": wait_sum / wait_count if wait_count else 0.0,
+                "max_seconds": wait_max,
+                "histogram": histogram,
+            },
+            "timeouts": timeouts,
+        }
+
+        # Only QueuePool (and its subclasses) can report size/overflow figures.
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            })
+
+        return stats
+
+
+# One monitor per engine: the sync engine used by most endpoints and the
+# async engine used by the hot read routes.
+pool_monitor = PoolMonitor()
+async_pool_monitor = PoolMonitor()
+
+
+class _InstrumentedPoolMixin:
+    """
+    Reports checkout wait times and timeouts to the pool's monitor.
+    """
+
+    monitor: PoolMonitor
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.monitor.observe_timeout()
+            raise
+        finally:
+            self.monitor.observe_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """
+    A QueuePool that reports to the shared pool_monitor.
+    """
+
+    monitor = pool_monitor
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    The asyncio flavour of InstrumentedQueuePool, reporting to async_pool_monitor.
+    """
+
+    monitor = async_pool_monitor
@@ -1,3 +1,8 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -5,6 +10,9 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from decouple import config
 
+from app.core.cache import MISSING, create_cache
+from app.core.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE, JWT_CACHE_MAX_SIZE
+
 # Config
 SECRET_KEY = config("SECRET_KEY", default="your-secret-key-here")
 ALGORITHM = "HS256"
@@ -24,6 +32,43 @@ def get_password_hash(password: str) -> str:
     truncated_password = password[:BCRYPT_MAX_LENGTH]
     return pwd_context.hash(truncated_password)
 
+# Bounded worker pool for bcrypt.
+# bcrypt releases the GIL, so a thread pool is enough to keep hashing off the
+# event loop. The semaphore caps running + queued jobs so a login storm is
+# turned away quickly instead of piling up behind the workers.
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE)
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when the password hashing pool is full.
+    """
+
+def _submit_hash_job(fn, *args) -> Future:
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy("Too many password hashing requests in progress")
+    try:
+        future = _hash_executor.submit(fn, *args)
+    except Exception:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return future
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Run verify_password on the bcrypt worker pool.
+    Raises PasswordHasherBusy if the pool's queue is full.
+    """
+    return await asyncio.wrap_future(_submit_hash_job(verify_password, plain_password, hashed_password))
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Run get_password_hash on the bcrypt worker pool.
+    Raises PasswordHasherBusy if the pool's queue is full.
+    """
+    return await asyncio.wrap_future(_submit_hash_job(get_password_hash, password))
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta if expires_delta else timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -31,9 +76,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Verified JWT claims keyed by a digest of the token, so a client re-sending
+# the same bearer token skips the signature check and JSON parsing.
+# Each entry lives exactly as long as the token is valid.
+claims_cache = create_cache("jwt_claims", max_size=JWT_CACHE_MAX_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+def decode_token(token: str) -> dict:
+    """
+    Decode and verify a JWT, using the claims cache.
+    Raises JWTError if the token is invalid or expired.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = claims_cache.get(key)
+    if payload is not MISSING:
+        return dict(payload)
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    # Tokens without an expiry fall back to the cache-wide TTL.
+    exp = payload.get("exp")
+    ttl = exp - time.time() if isinstance(exp, (int, float)) else None
+    if ttl is None or ttl > 0:
+        claims_cache.set(key, payload, ttl=ttl)
+    return dict(payload)
+
 def verify_token(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        return decode_token(token)
     except JWTError:
         return None
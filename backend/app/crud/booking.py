@@ -1,7 +1,8 @@
 # app/crud/booking.py
 from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
 from datetime import datetime
 from app.models.booking import Booking
 from app.models.destination import Destination
@@ -31,6 +32,35 @@ def get_booking_by_id(db: Session, booking_id: int) -> Optional[Booking]:
         .first()
     )
 
+async def get_user_bookings_async(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None
+) -> List[Booking]:
+    """
+    Async version of BookingService.get_user_bookings, used by the
+    read-only bookings endpoints.
+    """
+    query = (
+        select(Booking)
+        .options(joinedload(Booking.destination))
+        .where(Booking.user_id == user_id)
+    )
+    if after_id is not None:
+        query = query.where(Booking.id > after_id)
+
+    result = await db.execute(query.order_by(Booking.id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_booking_by_id_async(db: AsyncSession, booking_id: int) -> Optional[Booking]:
+    """
+    Async version of BookingService.get_booking.
+    """
+    result = await db.execute(select(Booking).where(Booking.id == booking_id))
+    return result.scalars().first()
+
 def get_bookings_by_user_and_destination(db: Session, user_id: int, destination_id: int) -> bool:
     """
     Check if a user has a confirmed booking for a specific destination.
@@ -1,38 +1,159 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, case, func, literal_column, or_, select
 
+from app.crud.inventory import sync_inventory
 from app.models.destination import Destination
 from app.schemas.destination import DestinationCreate, DestinationUpdate
 
-def get_destinations(
-    db: Session, 
-    skip: int = 0, 
-    limit: int = 100,
+# Bucket boundaries for the price and rating facets.
+# Each bucket is [lower, next lower); the last one is open ended.
+PRICE_FACET_BOUNDS = [0, 500, 1000, 2000, 5000]
+RATING_FACET_BOUNDS = [0, 1, 2, 3, 4]
+
+def apply_destination_filters(
+    query,
     location: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     min_rating: Optional[float] = None
-) -> List[Destination]:
-    query = db.query(Destination)
-    
+):
+    """
+    Apply the catalog filters to a Query or a select().
+    """
     if location:
         query = query.filter(Destination.location.ilike(f"%{location}%"))
-    
+
     if min_price is not None:
         query = query.filter(Destination.price >= min_price)
-    
+
     if max_price is not None:
         query = query.filter(Destination.price <= max_price)
-    
+
     if min_rating is not None:
         query = query.filter(Destination.rating >= min_rating)
-    
-    return query.offset(skip).limit(limit).all()
+
+    return query
+
+def get_destinations(
+    db: Session, 
+    skip: int = 0, 
+    limit: int = 100,
+    location: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_rating: Optional[float] = None,
+    after_id: Optional[int] = None
+) -> List[Destination]:
+    query = db.query(Destination)
+
+    # Keyset pagination: continue right after the last id of the previous page
+    if after_id is not None:
+        query = query.filter(Destination.id > after_id)
+
+    query = apply_destination_filters(query, location, min_price, max_price, min_rating)
+
+    return query.order_by(Destination.id).offset(skip).limit(limit).all()
 
 def get_destination_by_id(db: Session, destination_id: int) -> Optional[Destination]:
     return db.query(Destination).filter(Destination.id == destination_id).first()
 
+async def get_active_destinations_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None
+) -> List[Destination]:
+    query = select(Destination).where(Destination.is_active == True)
+    if after_id is not None:
+        query = query.where(Destination.id > after_id)
+
+    result = await db.execute(query.order_by(Destination.id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_destination_by_id_async(db: AsyncSession, destination_id: int) -> Optional[Destination]:
+    result = await db.execute(select(Destination).where(Destination.id == destination_id))
+    return result.scalars().first()
+
+async def get_destinations_by_ids_async(db: AsyncSession, destination_ids: List[int]) -> List[Destination]:
+    """
+    Fetch destinations by id, returned in the order of `destination_ids`.
+    """
+    if not destination_ids:
+        return []
+    result = await db.execute(select(Destination).where(Destination.id.in_(destination_ids)))
+    by_id = {destination.id: destination for destination in result.scalars()}
+    return [by_id[destination_id] for destination_id in destination_ids if destination_id in by_id]
+
+def _bucket_expression(column, bounds: List[float]):
+    """
+    SQL expression mapping a column value to the index of its facet bucket.
+    The bounds are rendered inline rather than as bound parameters, so the
+    SELECT and GROUP BY expressions are textually identical (which MySQL's
+    ONLY_FULL_GROUP_BY mode requires).
+    """
+    return case(
+        *[
+            (column >= literal_column(repr(lower)), literal_column(str(index)))
+            for index, lower in reversed(list(enumerate(bounds)))
+        ],
+        else_=literal_column("0"),
+    )
+
+def _range_facet(counts: Dict[int, int], bounds: List[float]) -> List[dict]:
+    return [
+        {
+            "min": lower,
+            "max": bounds[index + 1] if index + 1 < len(bounds) else None,
+            "count": counts.get(index, 0),
+        }
+        for index, lower in enumerate(bounds)
+    ]
+
+async def get_destination_facets_async(
+    db: AsyncSession,
+    location: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_rating: Optional[float] = None
+) -> dict:
+    """
+    Count active destinations per location, price bucket and rating bucket,
+    within the given filters.
+
+    Uses a single query grouped by all three facets at once; the per-facet
+    counts are then summed up from the grouped rows.
+    """
+    price_bucket = _bucket_expression(func.coalesce(Destination.price, 0), PRICE_FACET_BOUNDS)
+    rating_bucket = _bucket_expression(func.coalesce(Destination.rating, 0), RATING_FACET_BOUNDS)
+    query = (
+        select(Destination.location, price_bucket, rating_bucket, func.count(Destination.id))
+        .where(Destination.is_active == True)
+        .group_by(Destination.location, price_bucket, rating_bucket)
+    )
+    query = apply_destination_filters(query, location, min_price, max_price, min_rating)
+
+    total = 0
+    locations: Dict[str, int] = {}
+    prices: Dict[int, int] = {}
+    ratings: Dict[int, int] = {}
+    for location_value, price_index, rating_index, count in await db.execute(query):
+        total += count
+        locations[location_value] = locations.get(location_value, 0) + count
+        prices[price_index] = prices.get(price_index, 0) + count
+        ratings[rating_index] = ratings.get(rating_index, 0) + count
+
+    return {
+        "total": total,
+        "location": [
+            {"value": value, "count": count}
+            for value, count in sorted(locations.items(), key=lambda item: (-item[1], item[0] or ""))
+        ],
+        "price": _range_facet(prices, PRICE_FACET_BOUNDS),
+        "rating": _range_facet(ratings, RATING_FACET_BOUNDS),
+    }
+
 def create_destination(db: Session, destination: DestinationCreate, operator_id: int) -> Destination:
     db_destination = Destination(
         **destination.dict(),
@@ -49,10 +170,15 @@ def update_destination(
     destination: DestinationUpdate
 ) -> Destination:
     db_destination = get_destination_by_id(db, destination_id=destination_id)
+    was_limited = db_destination.daily_capacity is not None
     
     update_data = destination.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_destination, key, value)
+
+    # Seats are only counted while the destination has a capacity limit
+    if (db_destination.daily_capacity is not None) != was_limited:
+        sync_inventory(db, destination_id, db_destination.daily_capacity)
     
     db.commit()
     db.refresh(db_destination)
@@ -0,0 +1,185 @@
+# app/crud/inventory.py
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Optional, Union
+
+from sqlalchemy import Integer, case, delete, func, insert, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking
+from app.models.inventory import DestinationInventory
+
+# Bookings in these states have given their seats back
+RELEASED_BOOKING_STATUSES = ("CANCELLED", "DELETED")
+
+
+def holds_capacity(status: Optional[str]) -> bool:
+    """
+    Whether a booking in this status counts against the day's capacity.
+    """
+    return (status or "").upper() not in RELEASED_BOOKING_STATUSES
+
+
+def travel_day(travel_date: Union[date, datetime]) -> date:
+    return travel_date.date() if isinstance(travel_date, datetime) else travel_date
+
+
+def reserve_capacity(
+    db: Session,
+    destination_id: int,
+    travel_date: Union[date, datetime],
+    travelers: int,
+    daily_capacity: Optional[int]
+) -> None:
+    """
+    Reserve seats for `travelers` on a destination's travel day, or raise
+    ValueError when the day is full. Days without a capacity limit are not
+    counted, so bookings for them don't queue up on a locked row.
+
+    The check and the increment are one conditional UPDATE, so concurrent
+    bookings can't oversell: the row stays locked until the caller commits
+    (together with the booking) or rolls back. Does not commit.
+    """
+    _check_travelers(travelers)
+    day = travel_day(travel_date)
+    if daily_capacity is None and _day_capacity(db, destination_id, day) is None:
+        return
+    limit = func.coalesce(DestinationInventory.capacity, literal(daily_capacity, Integer))
+    reserve = (
+        update(DestinationInventory)
+        .where(
+            DestinationInventory.destination_id == destination_id,
+            DestinationInventory.travel_day == day,
+            or_(limit.is_(None), DestinationInventory.reserved + travelers <= limit),
+        )
+        .values(reserved=DestinationInventory.reserved + travelers)
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(reserve).rowcount == 1:
+        return
+
+    exists = db.execute(
+        select(DestinationInventory.id).where(
+            DestinationInventory.destination_id == destination_id,
+            DestinationInventory.travel_day == day,
+        )
+    ).first()
+    if exists is None:
+        # First booking for that day: create its row, unless a concurrent
+        # booking just did (then reserve against that row instead)
+        if daily_capacity is not None and travelers > daily_capacity:
+            raise ValueError(_full_message(day))
+        try:
+            with db.begin_nested():
+                db.execute(
+                    insert(DestinationInventory).values(
+                        destination_id=destination_id, travel_day=day, reserved=travelers
+                    )
+                )
+            return
+        except IntegrityError:
+            if db.execute(reserve).rowcount == 1:
+                return
+    raise ValueError(_full_message(day))
+
+
+def release_capacity(
+    db: Session,
+    destination_id: int,
+    travel_date: Union[date, datetime],
+    travelers: int
+) -> None:
+    """
+    Give a booking's seats back. Days without a capacity limit have no row,
+    so this changes nothing for them. Does not commit.
+    """
+    _check_travelers(travelers)
+    db.execute(
+        update(DestinationInventory)
+        .where(
+            DestinationInventory.destination_id == destination_id,
+            DestinationInventory.travel_day == travel_day(travel_date),
+        )
+        .values(
+            reserved=case(
+                (DestinationInventory.reserved >= travelers, DestinationInventory.reserved - travelers),
+                else_=0,
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def sync_inventory(db: Session, destination_id: int, daily_capacity: Optional[int]) -> None:
+    """
+    Bring a destination's inventory in line with a new daily_capacity when
+    it switches between limited and unlimited: the seats of the upcoming
+    days are counted from the bookings when a limit is set, and the rows
+    without a per-day override are dropped when it is removed. Does not commit.
+    """
+    if daily_capacity is None:
+        db.execute(
+            delete(DestinationInventory).where(
+                DestinationInventory.destination_id == destination_id,
+                DestinationInventory.capacity.is_(None),
+            )
+        )
+        return
+
+    today = date.today()
+    reserved = defaultdict(int)
+    bookings = db.execute(
+        select(Booking.travel_date, Booking.number_of_travelers, Booking.status).where(
+            Booking.destination_id == destination_id,
+            Booking.travel_date >= datetime.combine(today, datetime.min.time()),
+            Booking.number_of_travelers > 0,
+        )
+    )
+    for booked_date, travelers, status in bookings:
+        if holds_capacity(status):
+            reserved[travel_day(booked_date)] += travelers
+
+    rows = db.execute(
+        select(DestinationInventory.id, DestinationInventory.travel_day).where(
+            DestinationInventory.destination_id == destination_id,
+            DestinationInventory.travel_day >= today,
+        )
+    )
+    for row_id, day in rows.all():
+        db.execute(
+            update(DestinationInventory)
+            .where(DestinationInventory.id == row_id)
+            .values(reserved=reserved.pop(day, 0))
+            .execution_options(synchronize_session=False)
+        )
+    if reserved:
+        db.execute(
+            insert(DestinationInventory),
+            [
+                {"destination_id": destination_id, "travel_day": day, "reserved": travelers}
+                for day, travelers in sorted(reserved.items())
+            ],
+        )
+
+
+def _day_capacity(db: Session, destination_id: int, day: date) -> Optional[int]:
+    """
+    The per-day capacity override of a destination's travel day, if any.
+    """
+    return db.execute(
+        select(DestinationInventory.capacity).where(
+            DestinationInventory.destination_id == destination_id,
+            DestinationInventory.travel_day == day,
+        )
+    ).scalar()
+
+
+def _check_travelers(travelers: int) -> None:
+    if travelers <= 0:
+        raise ValueError("Number of travelers must be positive")
+
+
+def _full_message(day: date) -> str:
+    return f"Not enough places left on {day.isoformat()} for this destination"
@@ -1,14 +1,41 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func, insert, select
 
 from app.models.review import Review
 from app.models.destination import Destination
-from app.schemas.review import ReviewCreate, ReviewUpdate
+from app.models.user import User
+from app.schemas.review import ReviewCreate, ReviewImport, ReviewUpdate
+from app.services.catalog_cache import mark_catalog_changed, mark_reviews_changed
+from app.services.trending import trending_counters
+
+# Number of reviews inserted per INSERT statement by bulk_create_reviews
+REVIEW_IMPORT_BATCH_SIZE = 500
 
 def get_reviews_by_destination(db: Session, destination_id: int) -> List[Review]:
     return db.query(Review).filter(Review.destination_id == destination_id).all()
 
+async def get_reviews_by_destination_async(
+    db: AsyncSession,
+    destination_id: int,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None
+) -> List[Review]:
+    query = select(Review).where(Review.destination_id == destination_id)
+    if after_id is not None:
+        query = query.where(Review.id > after_id)
+
+    query = query.order_by(Review.id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    result = await db.execute(query)
+    return result.scalars().all()
+
 def get_review_by_id(db: Session, review_id: int) -> Optional[Review]:
     return db.query(Review).filter(Review.id == review_id).first()
 
@@ -18,52 +45,218 @@ def create_review(db: Session, review: ReviewCreate, user_id: int) -> Review:
         user_id=user_id
     )
     db.add(db_review)
+
+    # Update the destination's rating in the same transaction
+    apply_rating_delta(db, review.destination_id, count_delta=1, sum_delta=review.rating)
+
     db.commit()
     db.refresh(db_review)
-    
-    # Update destination rating
-    update_destination_rating(db, destination_id=review.destination_id)
-    
+
+    trending_counters.record_review(db_review.destination_id)
+
     return db_review
 
 def update_review(db: Session, review_id: int, review_update: ReviewUpdate) -> Review:
     db_review = get_review_by_id(db, review_id=review_id)
-    
+    old_rating = db_review.rating
+
     update_data = review_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_review, key, value)
-    
+
+    if db_review.rating != old_rating:
+        apply_rating_delta(
+            db, db_review.destination_id, count_delta=0, sum_delta=db_review.rating - old_rating
+        )
+
     db.commit()
     db.refresh(db_review)
-    
-    # Update destination rating
-    update_destination_rating(db, destination_id=db_review.destination_id)
-    
+
     return db_review
 
 def delete_review(db: Session, review_id: int) -> bool:
     db_review = get_review_by_id(db, review_id=review_id)
     if not db_review:
         return False
-    
-    destination_id = db_review.destination_id
-    
+
+    apply_rating_delta(db, db_review.destination_id, count_delta=-1, sum_delta=-db_review.rating)
     db.delete(db_review)
     db.commit()
-    
-    # Update destination rating
-    update_destination_rating(db, destination_id=destination_id)
-    
+
     return True
 
+def bulk_create_reviews(
+    db: Session,
+    items: List[Tuple[int, Any]],
+    default_user_id: int
+) -> Dict[str, Any]:
+    """
+    Insert many reviews at once, e.g. when importing from a partner platform.
+
+    `items` are (row index, raw row) pairs. Invalid rows are reported in the
+    result instead of aborting the import. Rows are inserted in batches, each
+    inside a savepoint; when a batch fails its rows are retried one at a
+    time, so only the bad ones are reported. Every affected destination's
+    rating is updated once at the end.
+    Commits the whole import in one transaction.
+    """
+    errors = []
+    valid: List[Tuple[int, ReviewImport]] = []
+    for index, raw in items:
+        try:
+            valid.append((index, ReviewImport.model_validate(raw)))
+        except ValidationError as e:
+            errors.append({"index": index, "error": e.errors(include_url=False)[0]["msg"]})
+
+    # Check all referenced destinations with a single query
+    destination_ids = {review.destination_id for _, review in valid}
+    existing = {
+        destination_id
+        for (destination_id,) in db.query(Destination.id).filter(Destination.id.in_(destination_ids))
+    } if destination_ids else set()
+
+    # ...and likewise all referenced users
+    user_ids = {review.user_id for _, review in valid if review.user_id is not None}
+    existing_users = {
+        user_id for (user_id,) in db.query(User.id).filter(User.id.in_(user_ids))
+    } if user_ids else set()
+
+    rows = []
+    for index, review in valid:
+        if review.destination_id not in existing:
+            errors.append({"index": index, "error": f"Destination {review.destination_id} not found"})
+            continue
+        if review.user_id is not None and review.user_id not in existing_users:
+            errors.append({"index": index, "error": f"User {review.user_id} not found"})
+            continue
+        row = review.model_dump(exclude_none=True)
+        row.setdefault("user_id", default_user_id)
+        rows.append((index, row))
+
+    inserted = 0
+    deltas: Dict[int, List[float]] = defaultdict(lambda: [0, 0.0])
+    for start in range(0, len(rows), REVIEW_IMPORT_BATCH_SIZE):
+        batch = rows[start:start + REVIEW_IMPORT_BATCH_SIZE]
+        try:
+            with db.begin_nested():
+                db.execute(insert(Review), [row for _, row in batch])
+        except SQLAlchemyError:
+            # Find the bad rows by inserting the batch one row at a time
+            batch = _insert_one_by_one(db, batch, errors)
+
+        inserted += len(batch)
+        for _, row in batch:
+            delta = deltas[row["destination_id"]]
+            delta[0] += 1
+            delta[1] += row["rating"]
+
+    for destination_id, (count_delta, sum_delta) in deltas.items():
+        apply_rating_delta(db, destination_id, count_delta=count_delta, sum_delta=sum_delta)
+        # Core inserts don't fire ORM events, so invalidate the listing by hand
+        mark_reviews_changed(db, destination_id)
+
+    db.commit()
+
+    errors.sort(key=lambda error: error["index"])
+    return {
+        "received": len(items),
+        "inserted": inserted,
+        "failed": len(errors),
+        "errors": errors,
+        "destinations_updated": sorted(deltas),
+    }
+
+def _insert_one_by_one(
+    db: Session,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    errors: List[Dict[str, Any]]
+) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Insert rows separately, each in its own savepoint. Failing rows are added
+    to `errors`; returns the inserted ones.
+    """
+    inserted = []
+    for index, row in rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(Review), [row])
+        except SQLAlchemyError as e:
+            message = str(e.orig) if getattr(e, "orig", None) else str(e)
+            errors.append({"index": index, "error": message})
+            continue
+        inserted.append((index, row))
+    return inserted
+
+def _rating_expression():
+    return case(
+        (Destination.review_count > 0, func.round(Destination.rating_sum / Destination.review_count, 1)),
+        else_=0.0,
+    )
+
+def apply_rating_delta(db: Session, destination_id: int, count_delta: int, sum_delta: float) -> None:
+    """
+    Adjust a destination's review aggregates and derived rating in place.
+    Does not commit: the caller commits together with the review write.
+    """
+    # The increments are done in SQL so concurrent reviews can't lose updates.
+    # The rating is derived in a second statement because databases disagree
+    # on whether SET expressions see the old or the new column values.
+    db.query(Destination).filter(Destination.id == destination_id).update(
+        {
+            Destination.review_count: Destination.review_count + count_delta,
+            Destination.rating_sum: Destination.rating_sum + sum_delta,
+        },
+        synchronize_session=False,
+    )
+    db.query(Destination).filter(Destination.id == destination_id).update(
+        {Destination.rating: _rating_expression()},
+        synchronize_session=False,
+    )
+    mark_catalog_changed(db)
+
 def update_destination_rating(db: Session, destination_id: int) -> None:
-    # Calculate new average rating
-    avg_rating = db.query(func.avg(Review.rating)).filter(
-        Review.destination_id == destination_id
-    ).scalar()
-    
-    # Update destination
+    """
+    Recompute a destination's review aggregates from scratch.
+    Does not commit.
+    """
+    review_count, rating_sum = db.query(
+        func.count(Review.id), func.coalesce(func.sum(Review.rating), 0.0)
+    ).filter(Review.destination_id == destination_id).one()
+
     db.query(Destination).filter(Destination.id == destination_id).update(
-        {"rating": round(avg_rating, 1) if avg_rating else 0.0}
+        {
+            Destination.review_count: review_count,
+            Destination.rating_sum: rating_sum,
+            Destination.rating: round(rating_sum / review_count, 1) if review_count else 0.0,
+        },
+        synchronize_session=False,
     )
-    db.commit()
\ No newline at end of file
+    mark_catalog_changed(db)
+
+def reconcile_destination_ratings(db: Session) -> List[int]:
+    """
+    Repair destinations whose review aggregates have drifted from the
+    reviews table. Returns the ids of the destinations that were fixed.
+    Does not commit.
+    """
+    actual = {
+        destination_id: (count, total)
+        for destination_id, count, total in db.query(
+            Review.destination_id, func.count(Review.id), func.sum(Review.rating)
+        ).group_by(Review.destination_id)
+    }
+
+    repaired = []
+    rows = db.query(Destination.id, Destination.review_count, Destination.rating_sum, Destination.rating)
+    for destination_id, review_count, rating_sum, rating in rows:
+        count, total = actual.get(destination_id, (0, 0.0))
+        expected_rating = round(total / count, 1) if count else 0.0
+        if (
+            review_count != count
+            or abs((rating_sum or 0.0) - total) > 1e-6
+            or (count and rating != expected_rating)
+        ):
+            update_destination_rating(db, destination_id=destination_id)
+            repaired.append(destination_id)
+
+    return repaired
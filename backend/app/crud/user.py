@@ -1,9 +1,24 @@
 # app/crud/user.py
 
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash
+from app.core.cache import MISSING, create_cache
+from app.core.config import USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE
+from app.core.security import get_password_hash, get_password_hash_async
+
+# Resolved users keyed by email (the JWT subject).
+# Cached instances are detached from their session, so only column
+# attributes (id, email, is_admin, ...) can be used on them, not relationships.
+# Every request for the same user shares one instance: treat it as read-only,
+# and load the user in the request's own session to change it.
+user_cache = create_cache("users", max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+# Session.info key holding the emails of the users a session changed, so they
+# can be invalidated once more after the commit
+_USERS_CHANGED = "users_changed"
 
 def get_user_by_email(db: Session, email: str):
     """
@@ -11,6 +26,29 @@ def get_user_by_email(db: Session, email: str):
     """
     return db.query(User).filter(User.email == email).first()
 
+async def get_user_by_email_async(db: AsyncSession, email: str):
+    """
+    Async version of get_user_by_email.
+    """
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def get_user_by_email_cached_async(db: AsyncSession, email: str):
+    """
+    Get a user by email, serving repeated lookups from the user cache.
+    """
+    user = user_cache.get(email)
+    if user is not MISSING:
+        return user
+
+    user = await get_user_by_email_async(db, email=email)
+    if user is not None:
+        # Detach the instance so it stays usable after this request's
+        # session commits or closes.
+        db.expunge(user)
+        user_cache.set(email, user)
+    return user
+
 def get_user_by_id(db: Session, user_id: int):
     """
     Get a single user by their ID.
@@ -37,4 +75,51 @@ def create_user(db: Session, user: UserCreate):
     db.commit()
     db.refresh(db_user)
     
-    return db_user
\ No newline at end of file
+    return db_user
+
+async def create_user_async(db: AsyncSession, user: UserCreate):
+    """
+    Create a new user, hashing the password on the bcrypt worker pool.
+    """
+    hashed_password = await get_password_hash_async(user.password)
+
+    db_user = User(
+        email=user.email,
+        username=user.username,
+        hashed_password=hashed_password,
+        full_name=user.full_name
+    )
+
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+
+    return db_user
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    """
+    Drop a user from the cache whenever its row changes, including under
+    its previous email when the email itself was changed.
+    """
+    emails = {target.email, *inspect(target).attrs.email.history.deleted}
+    for email in emails:
+        user_cache.invalidate(email)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_USERS_CHANGED, set()).update(emails)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_users_after_commit(session):
+    # Invalidate once more after the commit, so a lookup that read the old
+    # row between the flush and the commit can't keep serving it.
+    for email in session.info.pop(_USERS_CHANGED, ()):
+        user_cache.invalidate(email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_users_after_rollback(session):
+    session.info.pop(_USERS_CHANGED, None)
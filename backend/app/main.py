@@ -1,10 +1,34 @@
 # app/main.py
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import all your API routers
+from app.api.idempotency import IDEMPOTENT_REPLAYED_HEADER
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.endpoints import auth, destinations, bookings, reviews, admin, recommendations, weather, payments
+from app.services.payments import payment_workers
+from app.services.recommendations import recommendation_updater
+from app.services.similar_index import similar_index
+from app.services.weather import weather_prefetcher, weather_service
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start and stop the background workers together with the application.
+    """
+    recommendation_updater.start()
+    weather_prefetcher.start()
+    payment_workers.start()
+    # Computing the similar destinations lists from scratch takes a while
+    similar_index.warm_up()
+    yield
+    payment_workers.stop(timeout=5)
+    await weather_prefetcher.stop()
+    recommendation_updater.stop(timeout=5)
+    await weather_service.aclose()
 
 # Create the main FastAPI application instance
 # This is the 'app' variable that uvicorn is looking for
@@ -12,6 +36,7 @@ app = FastAPI(
     title="TourFlow API",
     description="API for the TourFlow Tourism Management System",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS (Cross-Origin Resource Sharing)
@@ -22,6 +47,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend read the keyset pagination cursor, ETags and whether
+    # a response was replayed for an Idempotency-Key
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", IDEMPOTENT_REPLAYED_HEADER],
 )
 
 # Include the API routers from the endpoints folder
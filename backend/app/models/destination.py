@@ -16,7 +16,14 @@ class Destination(Base):
     price = Column(Float)
     image_url = Column(String(500))  # Added length
     rating = Column(Float, default=0.0)
+    # Running review aggregates, kept up to date by crud.review in the same
+    # transaction as each review write. rating == round(rating_sum / review_count, 1)
+    review_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Float, default=0.0, nullable=False)
     is_active = Column(Boolean, default=True, index=True)
+    # Travelers that can be booked per travel day (NULL: unlimited), enforced
+    # through the destination_inventory table
+    daily_capacity = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     operator_id = Column(Integer, ForeignKey("users.id"))
     
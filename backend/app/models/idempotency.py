@@ -0,0 +1,30 @@
+# app/models/idempotency.py
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from datetime import datetime
+
+from app.core.database import Base
+
+class IdempotencyRecord(Base):
+    """
+    The stored response of a request made with an Idempotency-Key header.
+
+    A row is claimed (status_code NULL) before the request runs and filled
+    in once it finishes, so retries replay the response instead of running
+    the request again. request_hash detects a key reused for another request.
+    A claim older than the lease (claimed_at) was left behind by a process
+    that died and is taken over; claim_token tells the current claim apart.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "scope", "key", name="uq_idempotency_user_scope_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    scope = Column(String(50), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(32), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    claimed_at = Column(DateTime, default=datetime.utcnow)
+    claim_token = Column(String(32), nullable=True)
@@ -0,0 +1,24 @@
+# app/models/inventory.py
+
+from sqlalchemy import Column, Date, ForeignKey, Integer, UniqueConstraint
+
+from app.core.database import Base
+
+class DestinationInventory(Base):
+    """
+    Seats booked on one destination for one travel day.
+
+    `reserved` counts the travelers of every booking on that day that still
+    holds its seats (anything not cancelled or deleted). `capacity`
+    overrides the destination's daily_capacity for that day; when both are
+    NULL the day is unlimited. Unlimited days have no row: seats are only
+    counted where there is a limit (see crud.inventory.sync_inventory).
+    """
+    __tablename__ = "destination_inventory"
+    __table_args__ = (UniqueConstraint("destination_id", "travel_day", name="uq_inventory_destination_day"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    destination_id = Column(Integer, ForeignKey("destinations.id"), nullable=False)
+    travel_day = Column(Date, nullable=False)
+    capacity = Column(Integer, nullable=True)
+    reserved = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,34 @@
+# app/models/payment.py
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
+from datetime import datetime
+
+from app.core.database import Base
+
+class Payment(Base):
+    """
+    A payment for a booking, queued by the API and charged by the payment
+    workers (see app/services/payments.py).
+
+    status goes PENDING -> PROCESSING -> SUCCEEDED or FAILED. A job is due
+    when next_attempt_at has passed: while PROCESSING that is the worker's
+    lease, after a gateway error the time of the retry. Only a gateway
+    token is stored for the card, never the card number or CVV.
+    """
+    __tablename__ = "payments"
+    __table_args__ = (Index("ix_payments_status_next_attempt_at", "status", "next_attempt_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    payment_reference = Column(String(36), unique=True, index=True, nullable=False)
+    booking_id = Column(Integer, ForeignKey("bookings.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    amount = Column(Float, nullable=False)
+    status = Column(String(20), default="PENDING", nullable=False)
+    card_token = Column(String(100), nullable=False)
+    card_last4 = Column(String(4), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    gateway_reference = Column(String(100), nullable=True)
+    error = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
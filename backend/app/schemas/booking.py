@@ -1,8 +1,8 @@
 # app/schemas/booking.py
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 # This is a base schema with common fields for creating or updating a booking
 class BookingBase(BaseModel):
@@ -16,13 +16,13 @@ class BookingBase(BaseModel):
 # Schema for creating a new booking.
 # It inherits from BookingBase. The user will provide this data.
 class BookingCreate(BookingBase):
-    pass
+    number_of_travelers: int = Field(..., gt=0)
 
 # Schema for updating an existing booking.
 # All fields are optional to allow for partial updates.
 class BookingUpdate(BaseModel):
     travel_date: Optional[datetime] = None
-    number_of_travelers: Optional[int] = None
+    number_of_travelers: Optional[int] = Field(None, gt=0)
     special_requests: Optional[str] = None
     contact_email: Optional[EmailStr] = None
     contact_phone: Optional[str] = None
@@ -41,4 +41,37 @@ class BookingResponse(BookingBase):
     # This special configuration tells Pydantic to read data from ORM objects,
     # which allows you to pass a SQLAlchemy model instance directly.
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Schemas for the admin bulk status transition endpoint.
+# Bookings are selected either by booking_ids or by filter (at most `limit` of them).
+class BookingBulkFilter(BaseModel):
+    status: Optional[str] = None
+    destination_id: Optional[int] = None
+    travel_date_before: Optional[datetime] = None
+    travel_date_from: Optional[datetime] = None
+
+class BookingBulkTransition(BaseModel):
+    booking_ids: Optional[List[int]] = Field(None, max_length=10000)
+    filter: Optional[BookingBulkFilter] = None
+    limit: int = Field(10000, ge=1, le=10000)
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.booking_ids is None) == (self.filter is None):
+            raise ValueError("Give either booking_ids or filter")
+        return self
+
+# Outcome for one booking; detail says why a booking was rejected
+class BookingBulkOutcome(BaseModel):
+    booking_id: int
+    outcome: Literal["updated", "rejected", "not_found"]
+    status: Optional[str] = None
+    detail: Optional[str] = None
+
+class BookingBulkResult(BaseModel):
+    action: str
+    updated: int
+    rejected: int
+    not_found: int
+    results: List[BookingBulkOutcome]
@@ -1,7 +1,7 @@
 # app/schemas/destination.py
 
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
 
 # --- Base Schema ---
 # Contains fields common to all destination schemas
@@ -12,6 +12,8 @@ class DestinationBase(BaseModel):
     price: float
     image_url: Optional[str] = None
     rating: float
+    # Travelers bookable per travel day; None means unlimited
+    daily_capacity: Optional[int] = Field(None, ge=0)
 
 # --- Request Schemas ---
 
@@ -27,6 +29,7 @@ class DestinationUpdate(BaseModel):
     price: Optional[float] = None
     image_url: Optional[str] = None
     rating: Optional[float] = None
+    daily_capacity: Optional[int] = Field(None, ge=0)
     is_active: Optional[bool] = None
 
 # --- Response Schema ---
@@ -36,6 +39,7 @@ class DestinationUpdate(BaseModel):
 class DestinationResponse(DestinationBase):
     id: int
     is_active: bool
+    review_count: int = 0
 
     # This configuration allows Pydantic to read data from ORM objects (like SQLAlchemy models)
     # Use this for Pydantic v2
@@ -43,4 +47,54 @@ class DestinationResponse(DestinationBase):
 
     # Use this for Pydantic v1 instead
     # class Config:
-    #     orm_mode = True
\ No newline at end of file
+    #     orm_mode = True
+
+# Schema for /destinations/nearby results: a destination plus its distance
+# from the requested point
+class NearbyDestinationResponse(DestinationResponse):
+    distance_km: float
+
+# Schema for /destinations/{id}/similar results; similarity is in [0, 1]
+class SimilarDestinationResponse(DestinationResponse):
+    similarity: float
+
+# Schema for /destinations/trending results; trending_score is the
+# time-decayed sum of the destination's booking, review and view weights
+class TrendingDestinationResponse(DestinationResponse):
+    trending_score: float
+
+# Schema for /destinations/suggest results.
+# destination_id is only set for title suggestions.
+class DestinationSuggestion(BaseModel):
+    text: str
+    type: str
+    destination_id: Optional[int] = None
+    count: int
+
+# --- Facet Schemas ---
+
+# Number of destinations sharing one value (e.g. one location)
+class FacetValueCount(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+# Number of destinations in a [min, max) range; max is None for the last bucket
+class FacetRangeCount(BaseModel):
+    min: float
+    max: Optional[float] = None
+    count: int
+
+# Facet counts for the destination browse filters
+class DestinationFacetsResponse(BaseModel):
+    total: int
+    location: List[FacetValueCount]
+    price: List[FacetRangeCount]
+    rating: List[FacetRangeCount]
+
+# --- Recommendation Schemas ---
+
+# strategy is "collaborative", "popular" (cold start) or "collaborative+popular"
+class DestinationRecommendationsResponse(BaseModel):
+    message: str
+    strategy: str
+    destinations: List[DestinationResponse]
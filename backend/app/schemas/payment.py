@@ -0,0 +1,32 @@
+# app/schemas/payment.py
+
+from pydantic import BaseModel, computed_field
+from datetime import datetime
+from typing import Optional
+
+# Schema for POST /payments/process
+class PaymentRequest(BaseModel):
+    booking_id: int
+    card_number: str
+    expiry_date: str
+    cvv: str
+    cardholder_name: str
+
+# A queued payment. Poll GET /payments/{payment_id} until status is
+# SUCCEEDED or FAILED (PENDING and PROCESSING mean it is still queued);
+# message says why a payment failed.
+class PaymentResponse(BaseModel):
+    payment_id: str
+    booking_id: int
+    amount: float
+    status: str
+    message: str
+    card_last4: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    # Kept for clients written before payments were queued
+    @computed_field
+    @property
+    def success(self) -> bool:
+        return self.status == "SUCCEEDED"
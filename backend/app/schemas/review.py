@@ -18,6 +18,12 @@ class ReviewUpdate(BaseModel):
     rating: Optional[float] = Field(None, ge=1, le=5)
     comment: Optional[str] = Field(None, min_length=1, max_length=1000)
 
+# Schema for one row of a bulk review import (admin only).
+# Imported reviews skip the booking check; user_id defaults to the importing admin.
+class ReviewImport(ReviewCreate):
+    user_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
 # Schema for returning review data in API responses
 # Includes all fields from the database model
 class Review(ReviewBase):
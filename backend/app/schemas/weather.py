@@ -0,0 +1,37 @@
+# app/schemas/weather.py
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+# Maximum number of items in one /weather/batch request (per list)
+MAX_BATCH_ITEMS = 100
+
+class Coordinates(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+
+# Schema for POST /weather/batch: destinations and/or raw coordinates
+class WeatherBatchRequest(BaseModel):
+    destination_ids: List[int] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+    coordinates: List[Coordinates] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+
+class Weather(BaseModel):
+    location: str
+    temperature: float
+    description: str
+    humidity: float
+    wind_speed: float
+    icon: str
+
+# One result of a batch request. destination_id is set for destination
+# items; fallback is True when the weather is mock data because the real
+# weather was unavailable (no API key, upstream error or timeout).
+class WeatherBatchItem(BaseModel):
+    destination_id: Optional[int] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    weather: Weather
+    fallback: bool = False
+
+class WeatherBatchResponse(BaseModel):
+    results: List[WeatherBatchItem]
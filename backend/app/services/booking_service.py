@@ -1,15 +1,35 @@
 # app/services/booking_service.py
 
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from app.crud.inventory import holds_capacity, release_capacity, reserve_capacity, travel_day
 from app.models.booking import Booking
 from app.models.destination import Destination
 from app.models.user import User
 from app.schemas.booking import BookingCreate, BookingUpdate
+from app.services.recommendations import IGNORED_BOOKING_STATUSES, mark_interactions_removed
+from app.services.trending import trending_counters
 from datetime import datetime
 from sqlalchemy.orm import joinedload
 import uuid
 
+# Bulk status transitions: action -> (new status, allowed from, error), the
+# same rules as confirm_booking, cancel_booking and complete_booking
+BULK_TRANSITIONS = {
+    "confirm": ("CONFIRMED", lambda status: status == "PENDING", "Only pending bookings can be confirmed"),
+    "cancel": (
+        "CANCELLED",
+        lambda status: status not in ["COMPLETED", "CANCELLED"],
+        "Cannot cancel completed or already cancelled bookings",
+    ),
+    "complete": ("COMPLETED", lambda status: status == "CONFIRMED", "Only confirmed bookings can be marked as completed"),
+}
+
+# Bookings locked and updated per statement by bulk_transition
+BULK_CHUNK_SIZE = 1000
+
 class BookingService:
     def __init__(self, db: Session):
         self.db = db
@@ -32,7 +52,20 @@ class BookingService:
         # 2. Calculate the total price based on the destination's price and number of travelers
         calculated_total_price = destination.price * booking.number_of_travelers
 
-        # 3. Create new booking with the calculated price
+        # 3. Reserve the seats; committed together with the booking below
+        try:
+            reserve_capacity(
+                self.db,
+                destination.id,
+                booking.travel_date,
+                booking.number_of_travelers,
+                destination.daily_capacity,
+            )
+        except ValueError:
+            self.db.rollback()
+            raise
+
+        # 4. Create new booking with the calculated price
         db_booking = Booking(
             booking_reference=booking_reference,
             user_id=user_id,
@@ -50,21 +83,46 @@ class BookingService:
         self.db.add(db_booking)
         self.db.commit()
         self.db.refresh(db_booking)
+
+        trending_counters.record_booking(db_booking.destination_id)
         
         return db_booking
     
-    def get_user_bookings(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Booking]:
+    @staticmethod
+    def _held_seats(db_booking: Booking) -> Optional[tuple]:
+        """
+        The (destination id, travel day, travelers) a booking holds seats for,
+        or None once it has given them back (or never held any).
+        """
+        if not holds_capacity(db_booking.status) or (db_booking.number_of_travelers or 0) <= 0:
+            return None
+        return (db_booking.destination_id, travel_day(db_booking.travel_date), db_booking.number_of_travelers)
+
+    def _release_seats(self, db_booking: Booking) -> None:
+        held = self._held_seats(db_booking)
+        if held:
+            release_capacity(self.db, *held)
+
+    def get_user_bookings(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Booking]:
         """
         Get all bookings for a specific user, pre-loading the destination data.
+        Pass the last id of the previous page as `after_id` for keyset pagination.
         """
-        return (
+        query = (
             self.db.query(Booking)
             .options(joinedload(Booking.destination)) # Good for performance
             .filter(Booking.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        if after_id is not None:
+            query = query.filter(Booking.id > after_id)
+
+        return query.order_by(Booking.id).offset(skip).limit(limit).all()
     
     def get_booking(self, booking_id: int) -> Optional[Booking]:
         """
@@ -86,10 +144,24 @@ class BookingService:
         if not db_booking:
             raise ValueError("Booking not found")
         
+        held = self._held_seats(db_booking)
+
         # Update only the fields that were provided in the request
         update_data = booking_update.model_dump(exclude_unset=True) # Use model_dump for Pydantic v2
         for field, value in update_data.items():
             setattr(db_booking, field, value)
+
+        # Move the reserved seats if the date, party size or status changed
+        needed = self._held_seats(db_booking)
+        if needed != held:
+            try:
+                if held:
+                    release_capacity(self.db, *held)
+                if needed:
+                    reserve_capacity(self.db, *needed, db_booking.destination.daily_capacity)
+            except ValueError:
+                self.db.rollback()
+                raise
         
         self.db.commit()
         self.db.refresh(db_booking)
@@ -124,6 +196,7 @@ class BookingService:
         if db_booking.status in ["COMPLETED", "CANCELLED"]:
             raise ValueError("Cannot cancel completed or already cancelled bookings")
         
+        self._release_seats(db_booking)
         db_booking.status = "CANCELLED"
         self.db.commit()
         self.db.refresh(db_booking)
@@ -155,20 +228,102 @@ class BookingService:
         if not db_booking:
             raise ValueError("Booking not found")
         
+        self._release_seats(db_booking)
         db_booking.status = "DELETED"
         self.db.commit()
     
-    def get_all_bookings(self, skip: int = 0, limit: int = 100) -> List[Booking]:
+    def bulk_transition(
+        self,
+        action: str,
+        booking_ids: Optional[List[int]] = None,
+        status: Optional[str] = None,
+        destination_id: Optional[int] = None,
+        travel_date_before: Optional[datetime] = None,
+        travel_date_from: Optional[datetime] = None,
+        limit: int = 10000
+    ) -> List[Dict]:
         """
-        Get all non-deleted bookings (admin function).
+        Confirm, cancel or complete many bookings in one transaction (admin function).
+
+        Bookings are selected by id, or else by the given filters (at most
+        `limit` of them), and locked; the allowed ones are then updated with
+        one UPDATE per chunk. Cancelling gives the seats back with one
+        inventory update per destination and travel day. Returns one outcome
+        per booking: "updated", "rejected" (with the reason) or "not_found".
         """
-        return (
-            self.db.query(Booking)
-            .filter(Booking.status != "DELETED")
-            .offset(skip)
-            .limit(limit)
-            .all()
+        new_status, allowed, error = BULK_TRANSITIONS[action]
+        columns = (
+            Booking.id, Booking.status, Booking.destination_id, Booking.travel_date, Booking.number_of_travelers
         )
+
+        if booking_ids is not None:
+            booking_ids = list(dict.fromkeys(booking_ids))
+            found = {}
+            for start in range(0, len(booking_ids), BULK_CHUNK_SIZE):
+                chunk = booking_ids[start:start + BULK_CHUNK_SIZE]
+                rows = self.db.execute(select(*columns).where(Booking.id.in_(chunk)).with_for_update())
+                found.update((row.id, row) for row in rows)
+            rows = [found[booking_id] for booking_id in booking_ids if booking_id in found]
+        else:
+            query = select(*columns)
+            if status is not None:
+                query = query.where(Booking.status == status)
+            if destination_id is not None:
+                query = query.where(Booking.destination_id == destination_id)
+            if travel_date_before is not None:
+                query = query.where(Booking.travel_date < travel_date_before)
+            if travel_date_from is not None:
+                query = query.where(Booking.travel_date >= travel_date_from)
+            rows = self.db.execute(query.order_by(Booking.id).limit(limit).with_for_update()).all()
+            booking_ids = [row.id for row in rows]
+            found = {row.id: row for row in rows}
+
+        eligible = [row for row in rows if allowed(row.status)]
+        eligible_ids = [row.id for row in eligible]
+        from_statuses = list({row.status for row in eligible})
+        for start in range(0, len(eligible_ids), BULK_CHUNK_SIZE):
+            self.db.execute(
+                update(Booking)
+                .where(Booking.id.in_(eligible_ids[start:start + BULK_CHUNK_SIZE]), Booking.status.in_(from_statuses))
+                .values(status=new_status)
+                .execution_options(synchronize_session=False)
+            )
+        if eligible_ids and new_status.lower() in IGNORED_BOOKING_STATUSES:
+            # The bulk UPDATE bypasses the listeners that keep recommendations current
+            mark_interactions_removed(self.db)
+
+        if not holds_capacity(new_status):
+            released = defaultdict(int)
+            for row in eligible:
+                if holds_capacity(row.status) and (row.number_of_travelers or 0) > 0:
+                    released[(row.destination_id, travel_day(row.travel_date))] += row.number_of_travelers
+            for (seats_destination_id, day), travelers in released.items():
+                release_capacity(self.db, seats_destination_id, day, travelers)
+
+        self.db.commit()
+
+        updated = set(eligible_ids)
+        results = []
+        for booking_id in booking_ids:
+            row = found.get(booking_id)
+            if row is None:
+                results.append({"booking_id": booking_id, "outcome": "not_found"})
+            elif booking_id in updated:
+                results.append({"booking_id": booking_id, "outcome": "updated", "status": new_status})
+            else:
+                results.append({"booking_id": booking_id, "outcome": "rejected", "status": row.status, "detail": error})
+        return results
+    
+    def get_all_bookings(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Booking]:
+        """
+        Get all non-deleted bookings (admin function).
+        Pass the last id of the previous page as `after_id` for keyset pagination.
+        """
+        query = self.db.query(Booking).filter(Booking.status != "DELETED")
+        if after_id is not None:
+            query = query.filter(Booking.id > after_id)
+
+        return query.order_by(Booking.id).offset(skip).limit(limit).all()
     
     def get_bookings_by_status(self, status: str, skip: int = 0, limit: int = 100) -> List[Booking]:
         """
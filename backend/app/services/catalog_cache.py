@@ -0,0 +1,77 @@
+# app/services/catalog_cache.py
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import VersionedCache
+from app.core.config import CATALOG_CACHE_TTL_SECONDS, CATALOG_CACHE_MAX_SIZE
+from app.models.destination import Destination
+from app.models.review import Review
+
+# Read-through caches for the public catalog pages.
+# destination_catalog is invalidated as a whole on any destination write;
+# review_listings is scoped per destination id.
+destination_catalog = VersionedCache(
+    "destination_catalog", max_size=CATALOG_CACHE_MAX_SIZE, ttl=CATALOG_CACHE_TTL_SECONDS
+)
+review_listings = VersionedCache(
+    "destination_reviews", max_size=CATALOG_CACHE_MAX_SIZE, ttl=CATALOG_CACHE_TTL_SECONDS
+)
+
+# Session.info keys recording what a session changed, so the caches can be
+# invalidated once more after the commit
+_CATALOG_CHANGED = "destination_catalog_changed"
+_REVIEWS_CHANGED = "destination_reviews_changed"
+
+
+def mark_catalog_changed(db: Session) -> None:
+    """
+    Invalidate the catalog for writes that bypass the ORM unit of work
+    (e.g. query.update()). The catalog is invalidated again on commit.
+    """
+    destination_catalog.invalidate()
+    db.info[_CATALOG_CHANGED] = True
+
+
+def mark_reviews_changed(db: Session, destination_id: int) -> None:
+    """
+    Invalidate a destination's review listing, e.g. after a bulk insert.
+    """
+    review_listings.invalidate(destination_id)
+    db.info.setdefault(_REVIEWS_CHANGED, set()).add(destination_id)
+
+
+@event.listens_for(Destination, "after_insert")
+@event.listens_for(Destination, "after_update")
+@event.listens_for(Destination, "after_delete")
+def _destination_changed(mapper, connection, target):
+    destination_catalog.invalidate()
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_CATALOG_CHANGED] = True
+
+
+@event.listens_for(Review, "after_insert")
+@event.listens_for(Review, "after_update")
+@event.listens_for(Review, "after_delete")
+def _review_changed(mapper, connection, target):
+    review_listings.invalidate(target.destination_id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_REVIEWS_CHANGED, set()).add(target.destination_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Invalidate once more after the commit, so a read that ran between the
+    # flush and the commit can't keep serving pre-commit data.
+    if session.info.pop(_CATALOG_CHANGED, False):
+        destination_catalog.invalidate()
+    for destination_id in session.info.pop(_REVIEWS_CHANGED, ()):
+        review_listings.invalidate(destination_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session):
+    session.info.pop(_CATALOG_CHANGED, None)
+    session.info.pop(_REVIEWS_CHANGED, None)
@@ -0,0 +1,278 @@
+# app/services/destination_index.py
+
+import asyncio
+import copy
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.destination import Destination
+
+logger = logging.getLogger(__name__)
+
+
+class DestinationDoc(NamedTuple):
+    """
+    The destination fields the in-memory indexes work from.
+    """
+    id: int
+    title: str
+    location: str
+    description: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+    price: Optional[float]
+    rating: Optional[float]
+    review_count: int
+
+    @classmethod
+    def load_active(cls, db: Session) -> List["DestinationDoc"]:
+        """
+        Read every active destination, as plain rows rather than ORM objects.
+        """
+        columns = [getattr(Destination, field) for field in cls._fields]
+        rows = db.execute(select(*columns).where(Destination.is_active == True))
+        return [
+            cls._make(row)._replace(
+                title=row.title or "",
+                location=row.location or "",
+                description=row.description or "",
+                review_count=row.review_count or 0,
+            )
+            for row in rows
+        ]
+
+    @classmethod
+    def from_destination(cls, destination: Destination) -> "DestinationDoc":
+        return cls(
+            id=destination.id,
+            title=destination.title or "",
+            location=destination.location or "",
+            description=destination.description or "",
+            latitude=destination.latitude,
+            longitude=destination.longitude,
+            price=destination.price,
+            rating=destination.rating,
+            review_count=destination.review_count or 0,
+        )
+
+
+class DestinationIndex(ABC):
+    """
+    Base class for in-process indexes over the active destinations
+    (search, geo, ...).
+
+    The index is built from the database on first use and rebuilt in the
+    background after `refresh_seconds`, which picks up writes made by other
+    processes; the previous index keeps serving meanwhile. Writes made
+    through this process's ORM sessions are applied incrementally as soon
+    as they are committed.
+    Subclasses implement _reset(), _upsert() and _remove(); these are always
+    called with the index lock held, except that indexes setting
+    `rebuild_off_loop` have _reset() run on a shallow copy of the index in
+    a worker thread, without the lock, so it must assign fresh structures
+    rather than modify the live ones. The copy is then swapped in.
+    """
+
+    rebuild_off_loop = False
+
+    def __init__(self, name: str, refresh_seconds: float = 600.0):
+        self.name = name
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._built_at: Optional[float] = None
+        # Changes committed while a rebuild was loading, replayed after it
+        self._building = False
+        self._pending: Dict[int, Optional[DestinationDoc]] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        _indexes.append(self)
+
+    # --- hooks for subclasses -------------------------------------------
+
+    @abstractmethod
+    def _reset(self, docs: List[DestinationDoc]) -> None:
+        ...
+
+    @abstractmethod
+    def _upsert(self, doc: DestinationDoc) -> None:
+        ...
+
+    @abstractmethod
+    def _remove(self, destination_id: int) -> None:
+        ...
+
+    # --- loading ----------------------------------------------------------
+
+    @property
+    def is_stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > self.refresh_seconds
+
+    async def ensure_loaded(self, db: Optional[AsyncSession] = None) -> None:
+        """
+        Build the index from the database on first use. Once built, a stale
+        index keeps serving while it is rebuilt in the background.
+
+        Reading the destinations (and, with `rebuild_off_loop`, building the
+        index) happens in a worker thread with its own session, so `db` is
+        only used by subclasses that load more data.
+        """
+        if not self.is_stale:
+            return
+        if self._built_at is None:
+            await self._rebuild()
+        else:
+            self.warm_up()
+
+    def warm_up(self) -> None:
+        """
+        Start building the index in the background, e.g. at startup, so the
+        first request doesn't wait for it.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._rebuild_in_background(), name=f"{self.name}-refresh")
+
+    async def _rebuild_in_background(self) -> None:
+        try:
+            await self._rebuild()
+        except Exception:
+            # Keep serving the current index; the next request tries again
+            logger.exception("Rebuilding the %s index failed", self.name)
+
+    async def _rebuild(self) -> None:
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if not self.is_stale:
+                return
+
+            with self._lock:
+                self._building = True
+                self._pending.clear()
+                snapshot = self._snapshot() if self.rebuild_off_loop else None
+            try:
+                docs, built = await asyncio.get_running_loop().run_in_executor(None, self._read_and_build, snapshot)
+            except Exception:
+                with self._lock:
+                    self._building = False
+                raise
+
+            with self._lock:
+                if built is None:
+                    self._reset(docs)
+                else:
+                    self._install(built)
+                for destination_id, doc in self._pending.items():
+                    self._apply(destination_id, doc)
+                self._pending.clear()
+                self._building = False
+                self._built_at = time.monotonic()
+
+    @staticmethod
+    def _read_and_build(snapshot: Optional["DestinationIndex"]) -> Tuple[List[DestinationDoc], Optional["DestinationIndex"]]:
+        """
+        Read the destinations and build them into `snapshot` if given. Runs
+        in a worker thread.
+        """
+        db = SessionLocal()
+        try:
+            docs = DestinationDoc.load_active(db)
+        finally:
+            db.close()
+        if snapshot is not None:
+            snapshot._reset(docs)
+        return docs, snapshot
+
+    def _snapshot(self) -> "DestinationIndex":
+        """
+        Shallow copy for an off-loop rebuild, taken with the lock held.
+        """
+        return copy.copy(self)
+
+    def _install(self, built: "DestinationIndex") -> None:
+        vars(self).update(
+            (name, value) for name, value in vars(built).items() if name not in _INDEX_ATTRIBUTES
+        )
+
+    def invalidate(self) -> None:
+        """
+        Force a rebuild on next use.
+        """
+        self._built_at = None
+
+    # --- incremental updates ----------------------------------------------
+
+    def _apply(self, destination_id: int, doc: Optional[DestinationDoc]) -> None:
+        if doc is None:
+            self._remove(destination_id)
+        else:
+            self._upsert(doc)
+
+    def apply_changes(self, changes: Dict[int, Optional[DestinationDoc]]) -> None:
+        """
+        Apply committed destination changes (None means removed or inactive).
+        """
+        with self._lock:
+            if self._building:
+                # Replayed on the rebuilt index, which may have read the rows before
+                self._pending.update(changes)
+            if self._built_at is None:
+                # Not built yet: the first load will read these rows anyway
+                return
+            for destination_id, doc in changes.items():
+                self._apply(destination_id, doc)
+
+
+_indexes: List[DestinationIndex] = []
+
+# Attributes of the base class itself, which _install() must not overwrite
+_INDEX_ATTRIBUTES = frozenset((
+    "name", "refresh_seconds", "_lock", "_load_lock", "_built_at", "_building", "_pending", "_refresh_task",
+))
+
+# Session.info key holding the destination changes of the current transaction
+_CHANGED_DESTINATIONS = "changed_destinations"
+
+
+def _changed(session: Optional[Session]) -> Optional[Dict[int, Optional[DestinationDoc]]]:
+    if session is None:
+        return None
+    return session.info.setdefault(_CHANGED_DESTINATIONS, {})
+
+
+@event.listens_for(Destination, "after_insert")
+@event.listens_for(Destination, "after_update")
+def _destination_saved(mapper, connection, target):
+    changes = _changed(Session.object_session(target))
+    if changes is not None:
+        changes[target.id] = DestinationDoc.from_destination(target) if target.is_active else None
+
+
+@event.listens_for(Destination, "after_delete")
+def _destination_deleted(mapper, connection, target):
+    changes = _changed(Session.object_session(target))
+    if changes is not None:
+        changes[target.id] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session):
+    # Only apply changes once they are committed, so a rollback can't
+    # leave the indexes ahead of the database.
+    changes = session.info.pop(_CHANGED_DESTINATIONS, None)
+    if changes:
+        for index in _indexes:
+            index.apply_changes(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_CHANGED_DESTINATIONS, None)
+
@@ -0,0 +1,119 @@
+# app/services/geo_index.py
+
+import math
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from app.core.config import DESTINATION_INDEX_REFRESH_SECONDS
+from app.services.destination_index import DestinationDoc, DestinationIndex
+
+EARTH_RADIUS_KM = 6371.0088
+# Roughly how many kilometres one degree of latitude spans
+KM_PER_DEGREE = 111.195
+
+# Size of the grid cells (in degrees) destinations are bucketed into
+GRID_DEGREES = 1.0
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Vectorized great-circle distance (in km) from one point to many.
+    """
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _cell(lat: float, lon: float) -> Tuple[int, int]:
+    return (math.floor(lat / GRID_DEGREES), math.floor(lon / GRID_DEGREES))
+
+
+class GeoIndex(DestinationIndex):
+    """
+    Grid-bucketed spatial index over destination coordinates.
+
+    A radius query only looks at the grid cells overlapping the query's
+    bounding box, then computes exact distances for those candidates.
+    """
+
+    rebuild_off_loop = True
+
+    def __init__(self, refresh_seconds: float):
+        super().__init__("destination_geo", refresh_seconds=refresh_seconds)
+        self._reset([])
+
+    def _reset(self, docs: List[DestinationDoc]) -> None:
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._coords: Dict[int, Tuple[float, float]] = {}
+        for doc in docs:
+            self._upsert(doc)
+
+    def _upsert(self, doc: DestinationDoc) -> None:
+        self._remove(doc.id)
+        if doc.latitude is None or doc.longitude is None:
+            return
+
+        self._coords[doc.id] = (doc.latitude, doc.longitude)
+        self._cells.setdefault(_cell(doc.latitude, doc.longitude), set()).add(doc.id)
+
+    def _remove(self, destination_id: int) -> None:
+        coords = self._coords.pop(destination_id, None)
+        if coords is None:
+            return
+
+        cell = _cell(*coords)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(destination_id)
+            if not members:
+                del self._cells[cell]
+
+    def _candidate_cells(self, lat: float, lon: float, radius_km: float) -> List[Tuple[int, int]]:
+        lat_delta = radius_km / KM_PER_DEGREE
+        min_lat, max_lat = lat - lat_delta, lat + lat_delta
+        lat_cells = range(math.floor(max(min_lat, -90) / GRID_DEGREES), math.floor(min(max_lat, 90) / GRID_DEGREES) + 1)
+
+        # Longitude degrees shrink towards the poles; near a pole (or for huge
+        # radii) every longitude is a candidate.
+        widest_lat = min(90.0, max(abs(min_lat), abs(max_lat)))
+        cos_lat = math.cos(math.radians(widest_lat))
+        lon_delta = radius_km / (KM_PER_DEGREE * cos_lat) if cos_lat > 1e-6 else 360.0
+        if lon_delta >= 180:
+            lon_cells = range(math.floor(-180 / GRID_DEGREES), math.floor(180 / GRID_DEGREES) + 1)
+        else:
+            first = math.floor((lon - lon_delta) / GRID_DEGREES)
+            last = math.floor((lon + lon_delta) / GRID_DEGREES)
+            cells_around = int(round(360 / GRID_DEGREES))
+            half = cells_around // 2
+            # Wrap cell numbers across the antimeridian into [-180, 180)
+            lon_cells = sorted({(cell + half) % cells_around - half for cell in range(first, last + 1)})
+
+        return [(lat_cell, lon_cell) for lat_cell in lat_cells for lon_cell in lon_cells]
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: int = 20) -> List[Tuple[int, float]]:
+        """
+        Return (destination id, distance in km) pairs within `radius_km`, nearest first.
+        """
+        with self._lock:
+            candidates = []
+            for cell in self._candidate_cells(lat, lon, radius_km):
+                members = self._cells.get(cell)
+                if members:
+                    candidates.extend(members)
+            if not candidates:
+                return []
+
+            ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            coords = np.array([self._coords[destination_id] for destination_id in candidates], dtype=np.float64)
+
+        distances = haversine_km(lat, lon, coords[:, 0], coords[:, 1])
+        within = np.flatnonzero(distances <= radius_km)
+        if len(within) > limit:
+            within = within[np.argpartition(distances[within], limit - 1)[:limit]]
+        nearest = within[np.argsort(distances[within], kind="stable")]
+        return [(int(ids[i]), float(distances[i])) for i in nearest]
+
+
+geo_index = GeoIndex(refresh_seconds=DESTINATION_INDEX_REFRESH_SECONDS)
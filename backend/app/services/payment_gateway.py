@@ -0,0 +1,108 @@
+# app/services/payment_gateway.py
+
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, NamedTuple, Optional
+
+from app.core.config import PAYMENT_SIMULATED_LATENCY_SECONDS
+
+
+class CardDetails(NamedTuple):
+    number: str
+    expiry_date: str
+    cvv: str
+    cardholder_name: str
+
+
+class ChargeResult(NamedTuple):
+    approved: bool
+    reference: Optional[str]
+    message: str
+
+
+class GatewayError(Exception):
+    """
+    The gateway could not be reached or failed to answer; the charge may be
+    retried (with the same payment reference).
+    """
+
+
+class PaymentGateway(ABC):
+    """
+    Interface of the payment providers the payment workers charge through.
+
+    tokenize() runs in the API request, so the card number and CVV never
+    reach the payments table; charge() runs in a worker and may be slow.
+    charge() is called again with the same `reference` when a previous call
+    raised GatewayError or its worker died, so it must not charge twice.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def tokenize(self, card: CardDetails) -> str:
+        ...
+
+    @abstractmethod
+    def charge(self, token: str, amount: float, reference: str) -> ChargeResult:
+        ...
+
+
+class SimulatedGateway(PaymentGateway):
+    """
+    Local stand-in for a real provider, for development and tests.
+
+    Every charge takes `latency_seconds`. Like the common test cards, card
+    numbers ending in 0002 are declined and ones ending in 0119 fail with a
+    GatewayError; everything else is approved.
+    """
+
+    name = "simulated"
+
+    DECLINED_SUFFIX = "0002"
+    ERROR_SUFFIX = "0119"
+
+    def __init__(self, latency_seconds: float = PAYMENT_SIMULATED_LATENCY_SECONDS):
+        self.latency_seconds = latency_seconds
+        self._lock = threading.Lock()
+        self._charges: Dict[str, ChargeResult] = {}
+
+    def tokenize(self, card: CardDetails) -> str:
+        return f"sim_{card.number.replace(' ', '')[-4:]}_{uuid.uuid4().hex}"
+
+    def charge(self, token: str, amount: float, reference: str) -> ChargeResult:
+        time.sleep(self.latency_seconds)
+        with self._lock:
+            if reference in self._charges:
+                return self._charges[reference]
+
+        last4 = token.split("_")[1]
+        if last4 == self.ERROR_SUFFIX:
+            raise GatewayError("Simulated gateway error")
+        if last4 == self.DECLINED_SUFFIX:
+            result = ChargeResult(False, None, "Card declined")
+        else:
+            result = ChargeResult(True, f"sim_ch_{uuid.uuid4().hex}", "Payment processed successfully")
+        with self._lock:
+            return self._charges.setdefault(reference, result)
+
+
+# Gateways selectable with PAYMENT_GATEWAY; real providers add theirs here
+# (or through register_gateway) together with their client code.
+_gateways: Dict[str, Callable[[], PaymentGateway]] = {
+    SimulatedGateway.name: SimulatedGateway,
+}
+
+
+def register_gateway(name: str, factory: Callable[[], PaymentGateway]) -> None:
+    _gateways[name] = factory
+
+
+def create_gateway(name: str) -> PaymentGateway:
+    try:
+        factory = _gateways[name]
+    except KeyError:
+        raise ValueError(f"Unknown payment gateway '{name}', expected one of {sorted(_gateways)}")
+    return factory()
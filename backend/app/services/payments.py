@@ -0,0 +1,248 @@
+# app/services/payments.py
+
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    PAYMENT_GATEWAY,
+    PAYMENT_LEASE_SECONDS,
+    PAYMENT_MAX_ATTEMPTS,
+    PAYMENT_POLL_SECONDS,
+    PAYMENT_RETRY_SECONDS,
+    PAYMENT_WORKERS,
+)
+from app.core.database import SessionLocal
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.services.payment_gateway import CardDetails, GatewayError, PaymentGateway, create_gateway
+
+logger = logging.getLogger(__name__)
+
+# Payments still waiting for a worker or being charged
+QUEUED_PAYMENT_STATUSES = ("PENDING", "PROCESSING")
+
+# Due jobs looked at per claim attempt, so workers racing for the oldest
+# job fall through to the next ones
+_CLAIM_CANDIDATES = 10
+
+
+def enqueue_payment(db: Session, gateway: PaymentGateway, booking: Booking, card: CardDetails) -> Payment:
+    """
+    Queue a payment for a pending booking and commit it. Raises ValueError
+    when the booking is not pending (any more) or already has a payment
+    that is queued or went through; a failed payment may be retried.
+    """
+    reference = str(uuid.uuid4())
+    # Claiming the booking for this payment is one conditional UPDATE, so
+    # concurrent payment requests can't both charge it
+    blocking_payments = select(Payment.payment_reference).where(Payment.status != "FAILED")
+    claimed = db.execute(
+        update(Booking)
+        .where(
+            Booking.id == booking.id,
+            func.upper(Booking.status) == "PENDING",
+            or_(Booking.payment_id.is_(None), Booking.payment_id.not_in(blocking_payments)),
+        )
+        .values(payment_id=reference)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if claimed != 1:
+        db.rollback()
+        raise ValueError("This booking cannot be paid for")
+
+    payment = Payment(
+        payment_reference=reference,
+        booking_id=booking.id,
+        user_id=booking.user_id,
+        amount=booking.total_price,
+        status="PENDING",
+        card_token=gateway.tokenize(card),
+        card_last4=card.number.replace(" ", "")[-4:],
+    )
+    db.add(payment)
+    db.commit()
+    db.refresh(payment)
+    return payment
+
+
+def get_payment_by_reference(db: Session, payment_reference: str) -> Optional[Payment]:
+    return db.execute(
+        select(Payment).where(Payment.payment_reference == payment_reference)
+    ).scalars().first()
+
+
+class PaymentWorkers:
+    """
+    Pool of background threads charging queued payments.
+
+    Jobs live in the payments table, so they survive restarts and any
+    process's workers can take them: a worker claims a due job with a
+    conditional UPDATE that also sets its lease, calls the gateway outside
+    of any transaction, and then records the outcome, unless its lease ran
+    out and another worker claimed the job in the meantime. A successful
+    charge confirms the booking. notify() wakes idle workers right away
+    after a payment was queued in this process.
+    """
+
+    def __init__(
+        self,
+        gateway: PaymentGateway,
+        workers: int,
+        poll_seconds: float,
+        max_attempts: int,
+        retry_seconds: float,
+        lease_seconds: float,
+    ):
+        self.gateway = gateway
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.retry_seconds = retry_seconds
+        self.lease_seconds = lease_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"payment-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_once(self) -> bool:
+        """
+        Claim and process one due payment. Returns False when none was due.
+        """
+        db = SessionLocal()
+        try:
+            payment = self._claim(db)
+            if payment is None:
+                return False
+            self._process(db, payment)
+            return True
+        finally:
+            db.close()
+
+    def _claim(self, db: Session) -> Optional[Payment]:
+        now = datetime.utcnow()
+        candidates = db.execute(
+            select(Payment.id)
+            .where(Payment.status.in_(QUEUED_PAYMENT_STATUSES), Payment.next_attempt_at <= now)
+            .order_by(Payment.next_attempt_at)
+            .limit(_CLAIM_CANDIDATES)
+        ).scalars().all()
+        for payment_id in candidates:
+            claimed = db.execute(
+                update(Payment)
+                .where(
+                    Payment.id == payment_id,
+                    Payment.status.in_(QUEUED_PAYMENT_STATUSES),
+                    Payment.next_attempt_at <= now,
+                )
+                .values(
+                    status="PROCESSING",
+                    attempts=Payment.attempts + 1,
+                    next_attempt_at=now + timedelta(seconds=self.lease_seconds),
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            if claimed == 1:
+                return db.get(Payment, payment_id)
+        return None
+
+    def _process(self, db: Session, payment: Payment) -> None:
+        payment_id, attempt, booking_id = payment.id, payment.attempts, payment.booking_id
+        token, amount, reference = payment.card_token, payment.amount, payment.payment_reference
+        # Don't hold a transaction open while the gateway works
+        db.rollback()
+
+        try:
+            result = self.gateway.charge(token, amount, reference)
+        except Exception as e:
+            if not isinstance(e, GatewayError):
+                logger.exception("Payment %s failed unexpectedly", reference)
+            if attempt >= self.max_attempts:
+                values = {"status": "FAILED", "error": str(e)[:255]}
+            else:
+                delay = self.retry_seconds * 2 ** (attempt - 1)
+                values = {
+                    "status": "PENDING",
+                    "error": str(e)[:255],
+                    "next_attempt_at": datetime.utcnow() + timedelta(seconds=delay),
+                }
+            self._finish(db, payment_id, attempt, values)
+            db.commit()
+            return
+
+        if result.approved:
+            values = {"status": "SUCCEEDED", "gateway_reference": result.reference, "error": None}
+        else:
+            values = {"status": "FAILED", "error": result.message[:255]}
+        if self._finish(db, payment_id, attempt, values) and result.approved:
+            # A booking cancelled while its payment was being charged stays
+            # cancelled; the payment still shows as SUCCEEDED
+            db.execute(
+                update(Booking)
+                .where(Booking.id == booking_id, func.upper(Booking.status) == "PENDING")
+                .values(status="CONFIRMED")
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+
+    def _finish(self, db: Session, payment_id: int, attempt: int, values: dict) -> bool:
+        """
+        Record the outcome of a claimed attempt. Returns False when the lease
+        ran out and another worker has claimed the payment since. Does not commit.
+        """
+        finished = db.execute(
+            update(Payment)
+            .where(Payment.id == payment_id, Payment.status == "PROCESSING", Payment.attempts == attempt)
+            .values(updated_at=datetime.utcnow(), **values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        return finished == 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception:
+                logger.exception("Payment worker failed")
+                processed = False
+            if not processed:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+
+payment_gateway = create_gateway(PAYMENT_GATEWAY)
+payment_workers = PaymentWorkers(
+    payment_gateway,
+    workers=PAYMENT_WORKERS,
+    poll_seconds=PAYMENT_POLL_SECONDS,
+    max_attempts=PAYMENT_MAX_ATTEMPTS,
+    retry_seconds=PAYMENT_RETRY_SECONDS,
+    lease_seconds=PAYMENT_LEASE_SECONDS,
+)
@@ -0,0 +1,852 @@
+# app/services/recommendations.py
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    RECOMMENDATION_COMPACTION_SECONDS,
+    RECOMMENDATION_MODEL_PATH,
+    RECOMMENDATION_NEIGHBOURS,
+    RECOMMENDATION_REBUILD_SECONDS,
+    RECOMMENDATION_UPDATE_INTERVAL_SECONDS,
+)
+from app.core.database import SessionLocal
+from app.models.booking import Booking
+from app.models.destination import Destination
+from app.models.review import Review
+
+logger = logging.getLogger(__name__)
+
+# How strongly an interaction ties a user to a destination: a booking counts
+# fully, a review counts in proportion to its rating. When a user both
+# booked and reviewed a destination the stronger signal wins.
+BOOKING_WEIGHT = 1.0
+MAX_RATING = 5.0
+
+# Bookings in these states say nothing about the user's taste
+IGNORED_BOOKING_STATUSES = ("cancelled", "deleted")
+
+# Length of the precomputed popular list used for cold-start users
+POPULAR_SIZE = 100
+
+
+class RecommendationModel(NamedTuple):
+    """
+    Precomputed item-item neighbours, plus the statistics they derive from.
+
+    `cooccurrence` is the item x item matrix of summed weight products
+    (its diagonal holds each item's squared norm), so the cosine
+    similarities can be recomputed without scanning the tables again.
+    Row i of `neighbour_ids` / `neighbour_scores` holds the top-k most
+    similar active destinations of `item_ids[i]`, best first, padded
+    with -1 / 0. The model covers bookings and reviews up to
+    `last_booking_id` / `last_review_id`; `rebuilt_at` is when the
+    statistics were last read in full from the tables.
+    """
+    item_ids: np.ndarray
+    neighbour_ids: np.ndarray
+    neighbour_scores: np.ndarray
+    popular_ids: np.ndarray
+    cooccurrence: sparse.csr_matrix
+    user_counts: np.ndarray
+    weight_sums: np.ndarray
+    last_booking_id: int
+    last_review_id: int
+    built_at: float
+    rebuilt_at: float
+
+    def save(self, path: str) -> None:
+        arrays = self._asdict()
+        cooccurrence = arrays.pop("cooccurrence")
+        arrays.update(
+            cooccurrence_data=cooccurrence.data,
+            cooccurrence_indices=cooccurrence.indices,
+            cooccurrence_indptr=cooccurrence.indptr,
+        )
+        # Write to a temporary file first so readers never see a partial model
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RecommendationModel":
+        with np.load(path) as data:
+            size = len(data["item_ids"])
+            cooccurrence = sparse.csr_matrix(
+                (data["cooccurrence_data"], data["cooccurrence_indices"], data["cooccurrence_indptr"]),
+                shape=(size, size),
+            )
+            return cls(
+                item_ids=data["item_ids"],
+                neighbour_ids=data["neighbour_ids"],
+                neighbour_scores=data["neighbour_scores"],
+                popular_ids=data["popular_ids"],
+                cooccurrence=cooccurrence,
+                user_counts=data["user_counts"],
+                weight_sums=data["weight_sums"],
+                last_booking_id=int(data["last_booking_id"]),
+                last_review_id=int(data["last_review_id"]),
+                built_at=float(data["built_at"]),
+                # Models saved before rebuilt_at existed count as rebuilt when built
+                rebuilt_at=float(data["rebuilt_at" if "rebuilt_at" in data.files else "built_at"]),
+            )
+
+
+def _interaction_weight(booked: bool, rating: Optional[float]) -> float:
+    weight = BOOKING_WEIGHT if booked else 0.0
+    if rating is not None:
+        weight = max(weight, rating / MAX_RATING)
+    return weight
+
+
+def _is_ignored(status: Optional[str]) -> bool:
+    return (status or "").lower() in IGNORED_BOOKING_STATUSES
+
+
+def _counted_bookings():
+    return func.lower(Booking.status).not_in(IGNORED_BOOKING_STATUSES)
+
+
+def _booking_interactions_query():
+    return (
+        select(Booking.user_id, Booking.destination_id)
+        .where(_counted_bookings())
+        .group_by(Booking.user_id, Booking.destination_id)
+    )
+
+
+def _review_interactions_query():
+    return (
+        select(Review.user_id, Review.destination_id, func.max(Review.rating))
+        .group_by(Review.user_id, Review.destination_id)
+    )
+
+
+def _merge_interactions(booked_rows, review_rows) -> Dict[Tuple[int, int], float]:
+    """
+    Combine booking and review rows into (user id, destination id) -> weight.
+    """
+    ratings: Dict[Tuple[int, int], Optional[float]] = {}
+    for user_id, destination_id, rating in review_rows:
+        key = (user_id, destination_id)
+        if rating is not None and (ratings.get(key) is None or rating > ratings[key]):
+            ratings[key] = rating
+        else:
+            ratings.setdefault(key, None)
+    interactions = {}
+    for user_id, destination_id in booked_rows:
+        key = (user_id, destination_id)
+        interactions[key] = _interaction_weight(True, ratings.pop(key, None))
+    for key, rating in ratings.items():
+        interactions[key] = _interaction_weight(False, rating)
+    return {key: weight for key, weight in interactions.items() if weight > 0 and None not in key}
+
+
+def _top_k(indexes: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The k best (index, score) pairs, best first.
+    """
+    if len(scores) > k:
+        best = np.argpartition(-scores, k - 1)[:k]
+        indexes, scores = indexes[best], scores[best]
+    order = np.argsort(-scores, kind="stable")
+    return indexes[order], scores[order]
+
+
+def _active_destination_ids(db: Session) -> Set[int]:
+    return set(db.execute(select(Destination.id).where(Destination.is_active == True)).scalars())
+
+
+def _model_from_statistics(
+    item_ids: np.ndarray,
+    cooccurrence: sparse.csr_matrix,
+    user_counts: np.ndarray,
+    weight_sums: np.ndarray,
+    active_ids: Set[int],
+    last_booking_id: int,
+    last_review_id: int,
+    neighbours: int,
+    rebuilt_at: Optional[float] = None,
+) -> RecommendationModel:
+    """
+    Derive the neighbour lists and the popular list from the co-occurrence
+    statistics. Only active destinations are kept as neighbours, but
+    inactive ones still link the destinations their users went to.
+    `rebuilt_at` defaults to now, i.e. statistics read from the tables.
+    """
+    norms = np.sqrt(np.maximum(cooccurrence.diagonal(), 0.0))
+    inverse_norms = sparse.diags(1.0 / np.where(norms > 0, norms, 1.0))
+    is_active = np.fromiter((item_id in active_ids for item_id in item_ids.tolist()), dtype=bool, count=len(item_ids))
+    similarity = (inverse_norms @ cooccurrence @ inverse_norms @ sparse.diags(is_active.astype(np.float64))).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    n_items = len(item_ids)
+    neighbour_ids = np.full((n_items, neighbours), -1, dtype=np.int64)
+    neighbour_scores = np.zeros((n_items, neighbours), dtype=np.float32)
+    indptr, indices, data = similarity.indptr, similarity.indices, similarity.data
+    for row in range(n_items):
+        start, end = indptr[row], indptr[row + 1]
+        if start == end:
+            continue
+        top_indexes, top_scores = _top_k(indices[start:end], data[start:end], neighbours)
+        neighbour_ids[row, :len(top_indexes)] = item_ids[top_indexes]
+        neighbour_scores[row, :len(top_scores)] = top_scores
+
+    # Popularity: number of users who interacted, ties broken by total weight
+    order = np.lexsort((-weight_sums, -user_counts))
+    popular_ids = item_ids[order][is_active[order]][:POPULAR_SIZE]
+    if len(popular_ids) < POPULAR_SIZE:
+        # Destinations nobody booked yet still make a cold-start list
+        seen = set(popular_ids.tolist())
+        filler = sorted(active_ids - seen)[:POPULAR_SIZE - len(popular_ids)]
+        popular_ids = np.concatenate([popular_ids, np.array(filler, dtype=np.int64)])
+
+    built_at = time.time()
+    return RecommendationModel(
+        item_ids=item_ids,
+        neighbour_ids=neighbour_ids,
+        neighbour_scores=neighbour_scores,
+        popular_ids=popular_ids.astype(np.int64),
+        cooccurrence=cooccurrence,
+        user_counts=user_counts,
+        weight_sums=weight_sums,
+        last_booking_id=last_booking_id,
+        last_review_id=last_review_id,
+        built_at=built_at,
+        rebuilt_at=built_at if rebuilt_at is None else rebuilt_at,
+    )
+
+
+def build_model(db: Session, neighbours: int = RECOMMENDATION_NEIGHBOURS) -> RecommendationModel:
+    """
+    Build the item-item model from all bookings and reviews.
+
+    Users x destinations form a sparse matrix X; the co-occurrence matrix
+    is the sparse product X^T X, and normalizing it by the item norms gives
+    the cosine similarity of every pair of destinations.
+    """
+    # Fix the high-water marks first, so the background updater picks up
+    # exactly the rows written after them
+    last_booking_id = db.execute(select(func.coalesce(func.max(Booking.id), 0))).scalar_one()
+    last_review_id = db.execute(select(func.coalesce(func.max(Review.id), 0))).scalar_one()
+    interactions = _merge_interactions(
+        db.execute(_booking_interactions_query().where(Booking.id <= last_booking_id)).all(),
+        db.execute(_review_interactions_query().where(Review.id <= last_review_id)).all(),
+    )
+
+    pairs = np.array(list(interactions.keys()), dtype=np.int64).reshape(-1, 2)
+    weights = np.fromiter(interactions.values(), dtype=np.float64, count=len(interactions))
+    user_ids, user_index = np.unique(pairs[:, 0], return_inverse=True)
+    item_ids, item_index = np.unique(pairs[:, 1], return_inverse=True)
+    matrix = sparse.csc_matrix((weights, (user_index, item_index)), shape=(len(user_ids), len(item_ids)))
+
+    return _model_from_statistics(
+        item_ids=item_ids,
+        cooccurrence=(matrix.T @ matrix).tocsr(),
+        user_counts=np.bincount(item_index, minlength=len(item_ids)).astype(np.int64),
+        weight_sums=np.bincount(item_index, weights=weights, minlength=len(item_ids)),
+        active_ids=_active_destination_ids(db),
+        last_booking_id=last_booking_id,
+        last_review_id=last_review_id,
+        neighbours=neighbours,
+    )
+
+
+class _ServingState(NamedTuple):
+    """
+    What recommend() reads: replaced as a whole, never changed in place.
+    """
+    model: Optional[RecommendationModel]
+    positions: Dict[int, int]
+    fresh: Dict[int, Tuple[np.ndarray, np.ndarray]]
+
+
+class Recommender:
+    """
+    Serves recommendations from the latest model.
+
+    A request only looks up the neighbours of the destinations the user
+    booked or reviewed and merges their scores. It reads an immutable
+    snapshot of the serving state, so it never waits for the lock held by
+    the background updates.
+
+    Bookings and reviews written after the model was built are applied
+    incrementally (see apply_new_interactions): their effect on the
+    co-occurrence statistics is kept as a sparse delta, and the neighbour
+    lists of the affected destinations are recomputed right away.
+    compact() folds the delta back into a new model without touching the
+    bookings and reviews tables. Cancelled bookings and edited or deleted
+    reviews can't be applied that way; rebuild() reads everything again.
+    """
+
+    def __init__(self, model_path: str, neighbours: int = RECOMMENDATION_NEIGHBOURS):
+        self.model_path = model_path
+        self.neighbours = neighbours
+        self._model: Optional[RecommendationModel] = None
+        self._model_mtime: Optional[float] = None
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._first_build: Optional[asyncio.Future] = None
+        self._generation = 0
+        self._reset_delta(None)
+
+    # --- model loading ------------------------------------------------------
+
+    def _reset_delta(self, model: Optional[RecommendationModel]) -> None:
+        self._positions: Dict[int, int] = (
+            {int(item_id): position for position, item_id in enumerate(model.item_ids)} if model else {}
+        )
+        self._base_norms = model.cooccurrence.diagonal() if model else np.zeros(0)
+        # item id -> {item id: co-occurrence change}, kept symmetric
+        self._delta: Dict[int, Dict[int, float]] = defaultdict(dict)
+        self._count_delta: Dict[int, int] = defaultdict(int)
+        self._weight_delta: Dict[int, float] = defaultdict(float)
+        # Recomputed neighbour lists of the destinations the delta touched
+        self._fresh: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._last_booking_id = model.last_booking_id if model else 0
+        self._last_review_id = model.last_review_id if model else 0
+        # Bumped on every model swap, so an update computed against an older
+        # model is dropped instead of applied twice
+        self._generation += 1
+        self._serving = _ServingState(model, self._positions, self._fresh)
+
+    def set_model(self, model: RecommendationModel, mtime: Optional[float] = None) -> None:
+        with self._lock:
+            self._model = model
+            self._model_mtime = mtime
+            self._reset_delta(model)
+
+    def _install(self, model: RecommendationModel) -> None:
+        """
+        Save a model built by this process and serve it.
+        """
+        with self._lock:
+            mtime = None
+            if self.model_path:
+                model.save(self.model_path)
+                mtime = self._file_mtime()
+            self.set_model(model, mtime)
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.model_path)
+        except OSError:
+            return None
+
+    def reload_if_changed(self) -> bool:
+        """
+        Load the saved model when the file changed (e.g. after an offline
+        rebuild or another worker's compaction).
+        """
+        mtime = self._file_mtime()
+        if mtime is None or mtime == self._model_mtime:
+            return False
+        model = RecommendationModel.load(self.model_path)
+        self.set_model(model, mtime)
+        return True
+
+    @property
+    def has_model(self) -> bool:
+        return self._model is not None
+
+    async def ensure_model(self) -> None:
+        """
+        Load the saved model when it changed on disk. When there is no model
+        at all, start building one in a worker thread and return right away;
+        until it is ready recommend() only serves the popular list it is given.
+        """
+        loop = asyncio.get_running_loop()
+        if self._file_mtime() not in (None, self._model_mtime):
+            await loop.run_in_executor(None, self.reload_if_changed)
+            return
+        if self._model is None and (self._first_build is None or self._first_build.done()):
+            self._first_build = loop.run_in_executor(None, self._build_first_model_in_background)
+
+    def build_first_model(self, db: Session) -> bool:
+        """
+        Build (and save) a model in process when none was saved yet. Returns
+        False when there already was one, e.g. saved by another worker.
+        """
+        with self._build_lock:
+            self.reload_if_changed()
+            if self._model is not None:
+                return False
+            self._install(build_model(db, self.neighbours))
+            return True
+
+    def _build_first_model_in_background(self) -> None:
+        db = SessionLocal()
+        try:
+            self.build_first_model(db)
+        except Exception:
+            logger.exception("Building the recommendation model failed")
+        finally:
+            db.close()
+
+    # --- incremental updates ------------------------------------------------
+
+    def apply_new_interactions(self, db: Session) -> int:
+        """
+        Fold bookings and reviews created since the last update into the
+        statistics. Returns the number of users whose history changed.
+        """
+        with self._lock:
+            if self._model is None:
+                # Nothing to update yet: the first build reads everything
+                return 0
+            generation = self._generation
+            old_booking_id, old_review_id = self._last_booking_id, self._last_review_id
+
+        new_booking_id = db.execute(select(func.coalesce(func.max(Booking.id), 0))).scalar_one()
+        new_review_id = db.execute(select(func.coalesce(func.max(Review.id), 0))).scalar_one()
+        if new_booking_id <= old_booking_id and new_review_id <= old_review_id:
+            return 0
+
+        new_booking_id = max(new_booking_id, old_booking_id)
+        new_review_id = max(new_review_id, old_review_id)
+        user_ids = set(db.execute(
+            select(Booking.user_id).where(Booking.id > old_booking_id, Booking.id <= new_booking_id)
+        ).scalars())
+        user_ids.update(db.execute(
+            select(Review.user_id).where(Review.id > old_review_id, Review.id <= new_review_id)
+        ).scalars())
+        user_ids.discard(None)
+        if not user_ids:
+            with self._lock:
+                if generation == self._generation:
+                    self._last_booking_id, self._last_review_id = new_booking_id, new_review_id
+            return 0
+
+        # The full history of the affected users, split into what the
+        # statistics already contain and what they should contain now
+        bookings = db.execute(
+            select(Booking.id, Booking.user_id, Booking.destination_id)
+            .where(Booking.user_id.in_(user_ids), Booking.id <= new_booking_id, _counted_bookings())
+        ).all()
+        reviews = db.execute(
+            select(Review.id, Review.user_id, Review.destination_id, Review.rating)
+            .where(Review.user_id.in_(user_ids), Review.id <= new_review_id)
+        ).all()
+        inactive_ids = set(db.execute(select(Destination.id).where(Destination.is_active == False)).scalars())
+        before = _merge_interactions(
+            [(user_id, destination_id) for row_id, user_id, destination_id in bookings if row_id <= old_booking_id],
+            [(user_id, destination_id, rating) for row_id, user_id, destination_id, rating in reviews if row_id <= old_review_id],
+        )
+        after = _merge_interactions(
+            [(user_id, destination_id) for _, user_id, destination_id in bookings],
+            [(user_id, destination_id, rating) for _, user_id, destination_id, rating in reviews],
+        )
+
+        with self._lock:
+            if generation != self._generation:
+                # A new model was swapped in meanwhile; the next run starts from it
+                return 0
+            self._apply_user_changes(_by_user(before), _by_user(after), inactive_ids)
+            self._last_booking_id, self._last_review_id = new_booking_id, new_review_id
+        return len(user_ids)
+
+    def _apply_user_changes(
+        self,
+        before: Dict[int, Dict[int, float]],
+        after: Dict[int, Dict[int, float]],
+        inactive_ids: Set[int],
+    ) -> None:
+        dirty: Set[int] = set()
+        for user_id, new_items in after.items():
+            old_items = before.get(user_id, {})
+            changed = [item for item, weight in new_items.items() if old_items.get(item, 0.0) != weight]
+            if not changed:
+                continue
+            # Only pairs involving a changed item move: w_i * w_j before vs. after
+            for item in changed:
+                old_weight, new_weight = old_items.get(item, 0.0), new_items[item]
+                if old_weight == 0.0:
+                    self._count_delta[item] += 1
+                self._weight_delta[item] += new_weight - old_weight
+                for other, other_weight in new_items.items():
+                    if other in changed and other < item:
+                        # A pair of two changed items is handled from its smaller id only
+                        continue
+                    change = new_weight * other_weight - old_weight * old_items.get(other, 0.0)
+                    self._delta[item][other] = self._delta[item].get(other, 0.0) + change
+                    if other != item:
+                        self._delta[other][item] = self._delta[other].get(item, 0.0) + change
+                    dirty.add(other)
+                dirty.add(item)
+
+        if not dirty:
+            return
+        # Copied rather than updated in place: recommend() may be reading it
+        fresh = dict(self._fresh)
+        for item in dirty:
+            fresh[item] = self._recompute_neighbours(item, inactive_ids)
+        self._fresh = fresh
+        self._serving = self._serving._replace(fresh=fresh)
+
+    def _norm(self, item: int) -> float:
+        position = self._positions.get(item)
+        squared = self._base_norms[position] if position is not None else 0.0
+        return float(np.sqrt(max(squared + self._delta.get(item, {}).get(item, 0.0), 0.0)))
+
+    def _recompute_neighbours(self, item: int, inactive_ids: Set[int]) -> Tuple[np.ndarray, np.ndarray]:
+        row: Dict[int, float] = {}
+        position = self._positions.get(item)
+        if position is not None:
+            cooccurrence = self._model.cooccurrence
+            start, end = cooccurrence.indptr[position], cooccurrence.indptr[position + 1]
+            row = dict(zip(
+                self._model.item_ids[cooccurrence.indices[start:end]].tolist(),
+                cooccurrence.data[start:end].tolist(),
+            ))
+        for other, change in self._delta.get(item, {}).items():
+            row[other] = row.get(other, 0.0) + change
+        row.pop(item, None)
+        for other in inactive_ids.intersection(row):
+            del row[other]
+
+        norm = self._norm(item)
+        if not row or norm == 0.0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        ids = np.fromiter(row.keys(), dtype=np.int64, count=len(row))
+        dots = np.fromiter(row.values(), dtype=np.float64, count=len(row))
+        norms = np.array([self._norm(other) for other in row], dtype=np.float64)
+        scores = np.where(norms > 0, dots / (norm * np.where(norms > 0, norms, 1.0)), 0.0)
+        keep = scores > 1e-12
+        top_ids, top_scores = _top_k(ids[keep], scores[keep], self.neighbours)
+        return top_ids, top_scores.astype(np.float32)
+
+    @property
+    def pending_changes(self) -> int:
+        """
+        Number of destinations whose statistics changed since the model was built.
+        """
+        return len(self._fresh)
+
+    def compact(self, db: Session) -> bool:
+        """
+        Fold the incremental changes into a new model (and save it).
+        Only the active destination ids are read from the database.
+        """
+        # Only copy the delta under the lock; the new matrix is built outside it
+        with self._lock:
+            model = self._model
+            if model is None or not self._delta:
+                return False
+            generation = self._generation
+            delta = {item: dict(changes) for item, changes in self._delta.items()}
+            count_delta, weight_delta = dict(self._count_delta), dict(self._weight_delta)
+            positions = dict(self._positions)
+            last_booking_id, last_review_id = self._last_booking_id, self._last_review_id
+
+        new_items = sorted(set(delta) - set(positions))
+        item_ids = np.concatenate([model.item_ids, np.array(new_items, dtype=np.int64)])
+        positions.update({item: len(model.item_ids) + offset for offset, item in enumerate(new_items)})
+
+        rows, cols, values = [], [], []
+        for item, changes in delta.items():
+            for other, change in changes.items():
+                rows.append(positions[item])
+                cols.append(positions[other])
+                values.append(change)
+        size = len(item_ids)
+        base = model.cooccurrence.tocoo()
+        cooccurrence = sparse.csr_matrix(
+            (
+                np.concatenate([base.data, np.array(values, dtype=np.float64)]),
+                (np.concatenate([base.row, rows]).astype(np.int64), np.concatenate([base.col, cols]).astype(np.int64)),
+            ),
+            shape=(size, size),
+        )
+        cooccurrence.sum_duplicates()
+        user_counts = np.concatenate([model.user_counts, np.zeros(len(new_items), dtype=np.int64)])
+        weight_sums = np.concatenate([model.weight_sums, np.zeros(len(new_items))])
+        for item, change in count_delta.items():
+            user_counts[positions[item]] += change
+        for item, change in weight_delta.items():
+            weight_sums[positions[item]] += change
+
+        compacted = _model_from_statistics(
+            item_ids=item_ids,
+            cooccurrence=cooccurrence,
+            user_counts=user_counts,
+            weight_sums=weight_sums,
+            active_ids=_active_destination_ids(db),
+            last_booking_id=last_booking_id,
+            last_review_id=last_review_id,
+            neighbours=self.neighbours,
+            rebuilt_at=model.rebuilt_at,
+        )
+        with self._lock:
+            if generation != self._generation:
+                return False
+            # Changes applied while compacting are replayed from the new marks
+            self._install(compacted)
+        return True
+
+    def rebuild(self, db: Session) -> None:
+        """
+        Build a new model from all bookings and reviews (and save it). This
+        also drops what incremental updates can't undo: cancelled bookings
+        and edited or deleted reviews.
+        """
+        self._install(build_model(db, self.neighbours))
+
+    def rebuild_due(self, max_age_seconds: float) -> bool:
+        """
+        Whether the statistics were last read in full more than `max_age_seconds` ago.
+        """
+        model = self._model
+        return model is not None and time.time() - model.rebuilt_at >= max_age_seconds
+
+    # --- serving --------------------------------------------------------------
+
+    @staticmethod
+    def _neighbours(serving: _ServingState, item: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        fresh = serving.fresh.get(item)
+        if fresh is not None:
+            return fresh
+        position = serving.positions.get(item)
+        if position is None:
+            return None
+        return serving.model.neighbour_ids[position], serving.model.neighbour_scores[position]
+
+    def recommend(
+        self, user_items: Dict[int, float], limit: int, popular_ids: Optional[List[int]] = None
+    ) -> Tuple[List[int], str]:
+        """
+        Return (destination ids, strategy) for a user's interactions.
+        The strategy is "collaborative", "popular" (cold start) or a mix of
+        both when there are too few neighbours to fill the list.
+        `popular_ids` is the popular list to serve while no model exists yet.
+        """
+        serving = self._serving
+        model = serving.model
+        candidates, contributions = [], []
+        if model is not None:
+            popular_ids = model.popular_ids.tolist()
+            for item, weight in user_items.items():
+                neighbours = self._neighbours(serving, item)
+                if neighbours is not None:
+                    candidates.append(neighbours[0])
+                    contributions.append(neighbours[1] * weight)
+
+        recommended: List[int] = []
+        if candidates:
+            candidate_ids = np.concatenate(candidates)
+            scores = np.concatenate(contributions).astype(np.float64)
+            valid = candidate_ids >= 0
+            candidate_ids, scores = candidate_ids[valid], scores[valid]
+            if len(candidate_ids):
+                ids, inverse = np.unique(candidate_ids, return_inverse=True)
+                merged = np.bincount(inverse, weights=scores)
+                for index in np.argsort(-merged, kind="stable"):
+                    destination_id = int(ids[index])
+                    if destination_id not in user_items:
+                        recommended.append(destination_id)
+                        if len(recommended) == limit:
+                            return recommended, "collaborative"
+
+        strategy = "collaborative+popular" if recommended else "popular"
+        seen = set(recommended)
+        for destination_id in popular_ids or []:
+            if len(recommended) == limit:
+                break
+            if destination_id not in user_items and destination_id not in seen:
+                recommended.append(destination_id)
+        return recommended, strategy
+
+
+def _by_user(interactions: Dict[Tuple[int, int], float]) -> Dict[int, Dict[int, float]]:
+    users: Dict[int, Dict[int, float]] = defaultdict(dict)
+    for (user_id, destination_id), weight in interactions.items():
+        users[user_id][destination_id] = weight
+    return users
+
+
+async def get_user_interactions(db: AsyncSession, user_id: int) -> Dict[int, float]:
+    """
+    Destination id -> interaction weight for one user.
+    """
+    booked = await db.execute(_booking_interactions_query().where(Booking.user_id == user_id))
+    reviewed = await db.execute(_review_interactions_query().where(Review.user_id == user_id))
+    interactions = _merge_interactions(booked.all(), reviewed.all())
+    return {destination_id: weight for (_, destination_id), weight in interactions.items()}
+
+
+class RecommendationUpdater:
+    """
+    Background thread keeping the recommender fresh.
+
+    It wakes up when a booking or review is committed (see notify()), waits
+    so that commits arriving close together are handled as one batch, and
+    applies everything written since the previous batch, by any process.
+    Every `compaction_seconds` the accumulated changes are compacted into a
+    new saved model. That compaction becomes a full rebuild when this
+    process cancelled bookings or edited or deleted reviews since the last
+    one (notify(rebuild=True)), and at the latest `rebuild_seconds` after
+    the previous rebuild, by any process, to catch the other processes'.
+    """
+
+    def __init__(
+        self,
+        recommender: Recommender,
+        interval_seconds: float,
+        compaction_seconds: float,
+        rebuild_seconds: float,
+    ):
+        self.recommender = recommender
+        self.interval_seconds = interval_seconds
+        self.compaction_seconds = compaction_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._wake = threading.Event()
+        self._rebuild = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self, rebuild: bool = False) -> None:
+        if rebuild:
+            self._rebuild.set()
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="recommendation-updater", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self, compact: bool = False) -> None:
+        db = SessionLocal()
+        try:
+            self.recommender.reload_if_changed()
+            if not self.recommender.has_model:
+                self.recommender.build_first_model(db)
+                return
+            if compact and (self._rebuild.is_set() or self.recommender.rebuild_due(self.rebuild_seconds)):
+                # Cleared first, so changes committed during the build ask for another one
+                self._rebuild.clear()
+                self.recommender.rebuild(db)
+                return
+            self.recommender.apply_new_interactions(db)
+            if compact:
+                self.recommender.compact(db)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        last_compaction = time.monotonic()
+        # Right away at startup, so a missing model is built before requests need it
+        self._run_safely(compact=False)
+        while not self._stop.is_set():
+            # Also wake up periodically to pick up other processes' writes
+            self._wake.wait(self.compaction_seconds / 10)
+            if self._stop.wait(self.interval_seconds):
+                return
+            self._wake.clear()
+            compact = time.monotonic() - last_compaction >= self.compaction_seconds
+            self._run_safely(compact)
+            if compact:
+                last_compaction = time.monotonic()
+
+    def _run_safely(self, compact: bool) -> None:
+        try:
+            self.run_once(compact=compact)
+        except Exception:
+            logger.exception("Recommendation update failed")
+
+
+recommender = Recommender(RECOMMENDATION_MODEL_PATH)
+recommendation_updater = RecommendationUpdater(
+    recommender,
+    interval_seconds=RECOMMENDATION_UPDATE_INTERVAL_SECONDS,
+    compaction_seconds=RECOMMENDATION_COMPACTION_SECONDS,
+    rebuild_seconds=RECOMMENDATION_REBUILD_SECONDS,
+)
+
+# Session.info key set when a session inserted bookings or reviews
+_INTERACTIONS_CHANGED = "recommendation_interactions_changed"
+# Session.info key set when a session changed or deleted bookings or reviews
+# in a way only a rebuild takes into account
+_INTERACTIONS_REMOVED = "recommendation_interactions_removed"
+
+# The columns an interaction's weight depends on
+_INTERACTION_COLUMNS = {
+    Booking: ("user_id", "destination_id", "status"),
+    Review: ("user_id", "destination_id", "rating"),
+}
+
+
+def mark_interactions_removed(session: Session) -> None:
+    """
+    Ask for a rebuild once the session commits. For bulk UPDATE/DELETE
+    statements, which the mapper events below don't see.
+    """
+    session.info[_INTERACTIONS_REMOVED] = True
+
+
+@event.listens_for(Booking, "after_insert")
+@event.listens_for(Review, "after_insert")
+def _interaction_created(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_INTERACTIONS_CHANGED] = True
+
+
+@event.listens_for(Booking, "after_update")
+@event.listens_for(Review, "after_update")
+def _interaction_updated(mapper, connection, target):
+    state = inspect(target)
+    for column in _INTERACTION_COLUMNS[mapper.class_]:
+        history = state.attrs[column].history
+        if not history.has_changes():
+            continue
+        if column == "status":
+            was_ignored = {_is_ignored(value) for value in history.deleted}
+            if was_ignored == {_is_ignored(value) for value in history.added}:
+                # E.g. confirmed -> completed: still the same interaction
+                continue
+        session = Session.object_session(target)
+        if session is not None:
+            mark_interactions_removed(session)
+        return
+
+
+@event.listens_for(Booking, "after_delete")
+@event.listens_for(Review, "after_delete")
+def _interaction_deleted(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        mark_interactions_removed(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session):
+    rebuild = session.info.pop(_INTERACTIONS_REMOVED, False)
+    if session.info.pop(_INTERACTIONS_CHANGED, False) or rebuild:
+        recommendation_updater.notify(rebuild=rebuild)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session):
+    session.info.pop(_INTERACTIONS_CHANGED, None)
+    session.info.pop(_INTERACTIONS_REMOVED, None)
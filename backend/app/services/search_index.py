@@ -0,0 +1,151 @@
+# app/services/search_index.py
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.core.config import DESTINATION_INDEX_REFRESH_SECONDS
+from app.services.destination_index import DestinationDoc, DestinationIndex
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Simple field boosting: a term in the title counts three times,
+# a term in the location twice and a term in the description once.
+FIELD_WEIGHTS = (("title", 3), ("location", 2), ("description", 1))
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase, strip accents and split into word tokens ("Zürich" -> ["zurich"]).
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN_RE.findall(text)
+
+
+class SearchIndex(DestinationIndex):
+    """
+    In-memory inverted index over destination title, location and
+    description, ranked with BM25.
+
+    Each destination gets a slot number. Postings are kept as dicts
+    (slot -> term frequency) so single documents can be added or removed
+    cheaply, and are compiled into NumPy arrays on first use after a change,
+    so scoring a query is a handful of vectorized operations.
+    """
+
+    rebuild_off_loop = True
+
+    def __init__(self, refresh_seconds: float):
+        super().__init__("destination_search", refresh_seconds=refresh_seconds)
+        self._reset([])
+
+    def _reset(self, docs: List[DestinationDoc]) -> None:
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._doc_terms: Dict[int, Counter] = {}
+        self._slots: Dict[int, int] = {}
+        self._free_slots: List[int] = []
+        self._slot_ids = np.full(max(len(docs), 64), -1, dtype=np.int64)
+        self._lengths = np.zeros(len(self._slot_ids), dtype=np.float64)
+        self._total_length = 0
+        for doc in docs:
+            self._upsert(doc)
+
+    def _allocate_slot(self, destination_id: int) -> int:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slots)
+            if slot >= len(self._slot_ids):
+                # Grow the per-slot arrays by doubling
+                self._slot_ids = np.concatenate([self._slot_ids, np.full(len(self._slot_ids), -1, dtype=np.int64)])
+                self._lengths = np.concatenate([self._lengths, np.zeros(len(self._lengths))])
+        self._slots[destination_id] = slot
+        self._slot_ids[slot] = destination_id
+        return slot
+
+    def _upsert(self, doc: DestinationDoc) -> None:
+        self._remove(doc.id)
+
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(getattr(doc, field)):
+                terms[token] += weight
+
+        slot = self._allocate_slot(doc.id)
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[slot] = frequency
+            self._compiled.pop(term, None)
+        self._doc_terms[doc.id] = terms
+        length = sum(terms.values())
+        self._lengths[slot] = length
+        self._total_length += length
+
+    def _remove(self, destination_id: int) -> None:
+        terms = self._doc_terms.pop(destination_id, None)
+        if terms is None:
+            return
+
+        slot = self._slots.pop(destination_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+                if not postings:
+                    del self._postings[term]
+            self._compiled.pop(term, None)
+
+        self._total_length -= self._lengths[slot]
+        self._lengths[slot] = 0
+        self._slot_ids[slot] = -1
+        self._free_slots.append(slot)
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        compiled = self._compiled.get(term)
+        if compiled is None:
+            postings = self._postings[term]
+            compiled = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings)),
+            )
+            self._compiled[term] = compiled
+        return compiled
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[int, float]]:
+        """
+        Return (destination id, score) pairs for the best matches, best first.
+        """
+        query_terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if not doc_count or not query_terms:
+                return []
+
+            average_length = self._total_length / doc_count or 1.0
+            scores = np.zeros(len(self._slot_ids), dtype=np.float64)
+            for term in query_terms:
+                if term not in self._postings:
+                    continue
+
+                slots, frequencies = self._term_arrays(term)
+                idf = math.log(1 + (doc_count - len(slots) + 0.5) / (len(slots) + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[slots] / average_length)
+                scores[slots] += idf * frequencies * (BM25_K1 + 1) / (frequencies + norm)
+
+            matched = np.flatnonzero(scores)
+            if len(matched) > limit:
+                matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+            best = matched[np.argsort(-scores[matched], kind="stable")]
+            return [(int(self._slot_ids[slot]), float(scores[slot])) for slot in best]
+
+
+search_index = SearchIndex(refresh_seconds=DESTINATION_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,377 @@
+# app/services/similar_index.py
+
+import hashlib
+import math
+import os
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.config import (
+    DESTINATION_INDEX_REFRESH_SECONDS,
+    SIMILAR_DESTINATIONS_NEIGHBOURS,
+    SIMILAR_DESTINATIONS_PATH,
+)
+from app.services.destination_index import DestinationDoc, DestinationIndex
+from app.services.geo_index import haversine_km
+from app.services.search_index import FIELD_WEIGHTS, tokenize
+
+# How the similarity of two destinations is put together: cosine of their
+# TF-IDF vectors, closeness in price (ratio of the cheaper to the dearer)
+# and geographic proximity (decaying with distance over GEO_SCALE_KM).
+TEXT_WEIGHT = 0.6
+PRICE_WEIGHT = 0.2
+GEO_WEIGHT = 0.2
+GEO_SCALE_KM = 500.0
+
+# Pairs scoring below this are not worth listing
+MIN_SIMILARITY = 0.05
+
+
+def fingerprint(doc: DestinationDoc) -> int:
+    """
+    Stable hash of the fields similarity depends on, used to tell which
+    destinations changed since the neighbour lists were saved.
+    """
+    raw = repr((doc.title, doc.location, doc.description, doc.price, doc.latitude, doc.longitude))
+    return int.from_bytes(hashlib.blake2b(raw.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class SimilarIndex(DestinationIndex):
+    """
+    Precomputed "similar destinations" lists.
+
+    Each destination keeps its top-k most similar destinations, so a lookup
+    is a dict access. When destinations change only their own lists, the
+    lists that referenced them and the lists they now enter are recomputed,
+    each with one vectorized pass over the catalog. The lists are saved to
+    disk, so a restart only recomputes the destinations that changed since.
+
+    IDF weights are frozen when the lists are first computed from scratch
+    (see rebuild()); terms seen later get the weight of a term found in a
+    single document.
+
+    Rebuilds (and the save that follows them) run off the event loop; see
+    DestinationIndex. The lists are built at startup (see warm_up()).
+    """
+
+    rebuild_off_loop = True
+
+    def __init__(self, path: str, neighbours: int, refresh_seconds: float):
+        super().__init__("destination_similar", refresh_seconds=refresh_seconds)
+        self.path = path
+        self.neighbours = neighbours
+        self._idf: Optional[Dict[str, float]] = None
+        self._default_idf = 1.0
+        self._lists: Dict[int, List[Tuple[int, float]]] = {}
+        self._fingerprints: Dict[int, int] = {}
+        self._clear_vectors(0)
+
+    # --- document vectors -------------------------------------------------
+
+    def _clear_vectors(self, capacity: int) -> None:
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._vectors: Dict[int, Dict[str, float]] = {}
+        self._slots: Dict[int, int] = {}
+        self._free_slots: List[int] = []
+        capacity = max(capacity, 64)
+        self._slot_ids = np.full(capacity, -1, dtype=np.int64)
+        self._prices = np.full(capacity, np.nan)
+        self._lats = np.full(capacity, np.nan)
+        self._lons = np.full(capacity, np.nan)
+        # Score of the k-th entry of each slot's list (0 while it has room)
+        self._floors = np.zeros(capacity)
+        self._referenced_by: Dict[int, Set[int]] = {}
+
+    @staticmethod
+    def _term_counts(doc: DestinationDoc) -> Counter:
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(getattr(doc, field)):
+                terms[token] += weight
+        return terms
+
+    def _fit_idf(self, docs: List[DestinationDoc]) -> None:
+        document_frequency = Counter()
+        for doc in docs:
+            document_frequency.update(self._term_counts(doc).keys())
+        count = len(docs)
+        self._idf = {
+            term: math.log((1 + count) / (1 + frequency)) + 1
+            for term, frequency in document_frequency.items()
+        }
+        self._default_idf = math.log((1 + count) / 2) + 1
+
+    def _vector(self, doc: DestinationDoc) -> Dict[str, float]:
+        weights = {
+            term: (1 + math.log(count)) * self._idf.get(term, self._default_idf)
+            for term, count in self._term_counts(doc).items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        return {term: weight / norm for term, weight in weights.items()}
+
+    def _grow(self) -> None:
+        size = len(self._slot_ids)
+        self._slot_ids = np.concatenate([self._slot_ids, np.full(size, -1, dtype=np.int64)])
+        self._prices = np.concatenate([self._prices, np.full(size, np.nan)])
+        self._lats = np.concatenate([self._lats, np.full(size, np.nan)])
+        self._lons = np.concatenate([self._lons, np.full(size, np.nan)])
+        self._floors = np.concatenate([self._floors, np.zeros(size)])
+
+    def _add_vector(self, doc: DestinationDoc) -> None:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slots)
+            if slot >= len(self._slot_ids):
+                self._grow()
+        self._slots[doc.id] = slot
+        self._slot_ids[slot] = doc.id
+        self._prices[slot] = doc.price if doc.price and doc.price > 0 else np.nan
+        has_coords = doc.latitude is not None and doc.longitude is not None
+        self._lats[slot] = doc.latitude if has_coords else np.nan
+        self._lons[slot] = doc.longitude if has_coords else np.nan
+        self._floors[slot] = 0.0
+
+        vector = self._vector(doc)
+        self._vectors[doc.id] = vector
+        for term, weight in vector.items():
+            self._postings.setdefault(term, {})[slot] = weight
+            self._compiled.pop(term, None)
+
+    def _drop_vector(self, destination_id: int) -> None:
+        vector = self._vectors.pop(destination_id, None)
+        if vector is None:
+            return
+        slot = self._slots.pop(destination_id)
+        for term in vector:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+                if not postings:
+                    del self._postings[term]
+            self._compiled.pop(term, None)
+        self._slot_ids[slot] = -1
+        self._prices[slot] = self._lats[slot] = self._lons[slot] = np.nan
+        self._floors[slot] = 0.0
+        self._free_slots.append(slot)
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        compiled = self._compiled.get(term)
+        if compiled is None:
+            postings = self._postings[term]
+            compiled = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings)),
+            )
+            self._compiled[term] = compiled
+        return compiled
+
+    # --- scoring ----------------------------------------------------------
+
+    def _scores(self, destination_id: int) -> np.ndarray:
+        """
+        Similarity of one destination to every slot (0 for itself and free slots).
+        """
+        slot = self._slots[destination_id]
+        text = np.zeros(len(self._slot_ids))
+        for term, weight in self._vectors[destination_id].items():
+            slots, weights = self._term_arrays(term)
+            text[slots] += weight * weights
+
+        scores = TEXT_WEIGHT * text
+        price = self._prices[slot]
+        if not np.isnan(price):
+            with np.errstate(invalid="ignore"):
+                ratio = np.minimum(self._prices, price) / np.maximum(self._prices, price)
+            scores += PRICE_WEIGHT * np.nan_to_num(ratio)
+        lat, lon = self._lats[slot], self._lons[slot]
+        if not np.isnan(lat):
+            distances = haversine_km(lat, lon, self._lats, self._lons)
+            scores += GEO_WEIGHT * np.nan_to_num(np.exp(-distances / GEO_SCALE_KM))
+
+        scores[slot] = 0.0
+        scores[self._slot_ids < 0] = 0.0
+        return scores
+
+    def _set_list(self, destination_id: int, entries: List[Tuple[int, float]]) -> None:
+        for other_id, _ in self._lists.get(destination_id, ()):
+            referencing = self._referenced_by.get(other_id)
+            if referencing is not None:
+                referencing.discard(destination_id)
+        self._lists[destination_id] = entries
+        for other_id, _ in entries:
+            self._referenced_by.setdefault(other_id, set()).add(destination_id)
+        slot = self._slots.get(destination_id)
+        if slot is not None:
+            self._floors[slot] = entries[-1][1] if len(entries) >= self.neighbours else 0.0
+
+    def _recompute(self, destination_id: int) -> np.ndarray:
+        scores = self._scores(destination_id)
+        candidates = np.flatnonzero(scores >= MIN_SIMILARITY)
+        if len(candidates) > self.neighbours:
+            candidates = candidates[np.argpartition(-scores[candidates], self.neighbours - 1)[:self.neighbours]]
+        best = candidates[np.argsort(-scores[candidates], kind="stable")]
+        self._set_list(destination_id, [(int(self._slot_ids[slot]), float(scores[slot])) for slot in best])
+        return scores
+
+    def _offer(self, destination_id: int, scores: np.ndarray, skip: Set[int]) -> None:
+        """
+        Insert a (re)computed destination into the lists it now belongs to.
+        Similarity is symmetric, so its own score row says where it enters.
+        """
+        entering = np.flatnonzero((scores > self._floors) & (scores >= MIN_SIMILARITY))
+        for slot in entering:
+            other_id = int(self._slot_ids[slot])
+            if other_id in skip:
+                continue
+            entries = [entry for entry in self._lists.get(other_id, []) if entry[0] != destination_id]
+            entries.append((destination_id, float(scores[slot])))
+            entries.sort(key=lambda entry: -entry[1])
+            self._set_list(other_id, entries[:self.neighbours])
+
+    def _refresh(self, changed: Iterable[int], removed: Iterable[int]) -> None:
+        """
+        Recompute the lists affected by changed (already re-vectorized) and
+        removed destinations.
+        """
+        changed, removed = set(changed), set(removed)
+        for destination_id in removed:
+            self._lists.pop(destination_id, None)
+            self._fingerprints.pop(destination_id, None)
+        # Lists that mention a changed or removed destination may shrink
+        stale = set()
+        for destination_id in changed | removed:
+            stale.update(self._referenced_by.pop(destination_id, ()))
+        for destination_id in (stale - removed - changed) & self._slots.keys():
+            self._recompute(destination_id)
+
+        # ...and a changed destination may now belong in other lists
+        for destination_id in changed:
+            scores = self._recompute(destination_id)
+            self._offer(destination_id, scores, skip=changed)
+
+    # --- DestinationIndex hooks -----------------------------------------
+
+    def _snapshot(self) -> "SimilarIndex":
+        # _reset() starts from the current lists, which live updates modify in place
+        snapshot = super()._snapshot()
+        snapshot._lists = dict(self._lists)
+        snapshot._fingerprints = dict(self._fingerprints)
+        return snapshot
+
+    def _reset(self, docs: List[DestinationDoc]) -> None:
+        if not self._lists:
+            self._load()
+        if self._idf is None:
+            self._fit_idf(docs)
+
+        previous = self._fingerprints
+        current = {doc.id: fingerprint(doc) for doc in docs}
+        changed = {destination_id for destination_id, value in current.items() if previous.get(destination_id) != value}
+        removed = set(previous) - set(current)
+
+        self._clear_vectors(len(docs))
+        for doc in docs:
+            self._add_vector(doc)
+        # Rebuild the reverse references and floors of the kept lists
+        kept = {destination_id: entries for destination_id, entries in self._lists.items() if destination_id in current}
+        self._lists = {}
+        for destination_id, entries in kept.items():
+            self._set_list(destination_id, entries)
+        self._fingerprints = current
+
+        self._refresh(changed, removed)
+        if changed or removed:
+            self._save()
+
+    def _upsert(self, doc: DestinationDoc) -> None:
+        value = fingerprint(doc)
+        if self._fingerprints.get(doc.id) == value:
+            # Rating or review count changed; similarity doesn't depend on them
+            return
+        self._drop_vector(doc.id)
+        self._add_vector(doc)
+        self._fingerprints[doc.id] = value
+        self._refresh([doc.id], [])
+
+    def _remove(self, destination_id: int) -> None:
+        if destination_id not in self._vectors:
+            return
+        self._drop_vector(destination_id)
+        self._refresh([], [destination_id])
+
+    # --- persistence ------------------------------------------------------
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        ids = np.fromiter(self._lists.keys(), dtype=np.int64, count=len(self._lists))
+        neighbour_ids = np.full((len(ids), self.neighbours), -1, dtype=np.int64)
+        neighbour_scores = np.zeros((len(ids), self.neighbours), dtype=np.float32)
+        for row, entries in enumerate(self._lists.values()):
+            for column, (other_id, score) in enumerate(entries):
+                neighbour_ids[row, column] = other_id
+                neighbour_scores[row, column] = score
+        terms = list(self._idf.keys())
+        # Write to a temporary file first so readers never see a partial file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                ids=ids,
+                fingerprints=np.array([self._fingerprints[destination_id] for destination_id in ids.tolist()], dtype=np.int64),
+                neighbour_ids=neighbour_ids,
+                neighbour_scores=neighbour_scores,
+                idf_terms=np.array(terms, dtype=str),
+                idf_values=np.array([self._idf[term] for term in terms], dtype=np.float64),
+                default_idf=self._default_idf,
+            )
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        with np.load(self.path) as data:
+            if data["neighbour_ids"].shape[1] != self.neighbours:
+                # Saved with another list length: start over
+                return
+            self._idf = dict(zip(data["idf_terms"].tolist(), data["idf_values"].tolist()))
+            self._default_idf = float(data["default_idf"])
+            self._fingerprints = dict(zip(data["ids"].tolist(), data["fingerprints"].tolist()))
+            self._lists = {
+                destination_id: [(other_id, score) for other_id, score in zip(other_ids, scores) if other_id >= 0]
+                for destination_id, other_ids, scores in zip(
+                    data["ids"].tolist(), data["neighbour_ids"].tolist(), data["neighbour_scores"].tolist()
+                )
+            }
+
+    def rebuild(self, docs: List[DestinationDoc]) -> None:
+        """
+        Recompute every list (and the IDF weights) from scratch and save them.
+        """
+        with self._lock:
+            self._idf = None
+            self._lists = {}
+            self._fingerprints = {}
+            self._reset(docs)
+
+    # --- lookups ----------------------------------------------------------
+
+    def similar(self, destination_id: int, limit: int = 10) -> Optional[List[Tuple[int, float]]]:
+        """
+        Return (destination id, similarity) pairs, most similar first, or
+        None when the destination is not in the index.
+        """
+        with self._lock:
+            entries = self._lists.get(destination_id)
+            return None if entries is None else entries[:limit]
+
+
+similar_index = SimilarIndex(
+    SIMILAR_DESTINATIONS_PATH,
+    neighbours=SIMILAR_DESTINATIONS_NEIGHBOURS,
+    refresh_seconds=DESTINATION_INDEX_REFRESH_SECONDS,
+)
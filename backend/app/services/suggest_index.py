@@ -0,0 +1,189 @@
+# app/services/suggest_index.py
+
+import heapq
+import math
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import DESTINATION_INDEX_REFRESH_SECONDS
+from app.services.destination_index import DestinationDoc, DestinationIndex
+from app.services.search_index import tokenize
+
+# Results for prefixes up to this length are memoized, since one or two
+# letters match a large share of the catalog and are typed on every search.
+SHORT_PREFIX_LENGTH = 2
+
+# The initial build sorts its keys in runs of this size and merges them:
+# one big sort holds the GIL long enough to stall the event loop while the
+# index is rebuilt in a worker thread.
+SORT_RUN_SIZE = 20000
+
+# Suggestion kinds
+TITLE = "title"
+LOCATION = "location"
+
+
+def popularity(doc: DestinationDoc) -> float:
+    """
+    Ranking score of a destination: its rating, boosted by how many reviews back it.
+    """
+    return (doc.rating or 0.0) + math.log1p(doc.review_count or 0)
+
+
+class SuggestIndex(DestinationIndex):
+    """
+    Typeahead index over destination titles and locations.
+
+    Every word start of a title or location is stored as a key in a sorted
+    list, so all completions of a prefix form one contiguous range found
+    with two bisections ("alps" finds "Swiss Alps Ski Trip").
+    Identical titles/locations are grouped into one suggestion.
+    """
+
+    rebuild_off_loop = True
+
+    def __init__(self, refresh_seconds: float):
+        super().__init__("destination_suggest", refresh_seconds=refresh_seconds)
+        self._reset([])
+
+    def _reset(self, docs: List[DestinationDoc]) -> None:
+        self._docs: Dict[int, DestinationDoc] = {}
+        # Each distinct (kind, text) pair is a group with a small integer id;
+        # the sorted key list holds (key, group id) tuples.
+        self._keys: List[Tuple[str, int]] = []
+        self._group_ids: Dict[Tuple[str, str], int] = {}
+        self._groups: Dict[int, Tuple[str, str]] = {}
+        self._members: Dict[int, Set[int]] = {}
+        self._scores: Dict[int, float] = {}
+        self._next_group_id = 0
+        # normalized prefix -> {limit: results}
+        self._short_prefix_cache: Dict[str, Dict[int, list]] = {}
+
+        entries = []
+        for doc in docs:
+            self._docs[doc.id] = doc
+            for group in self._doc_groups(doc):
+                group_id = self._group_ids.get(group)
+                if group_id is None:
+                    group_id = self._add_group(group)
+                    entries.extend(self._group_keys(group_id))
+                self._members[group_id].add(doc.id)
+        # Sorted runs for the initial build instead of an insort per key
+        runs = [sorted(entries[start:start + SORT_RUN_SIZE]) for start in range(0, len(entries), SORT_RUN_SIZE)]
+        self._keys = list(heapq.merge(*runs))
+        for group_id in self._groups:
+            self._rescore(group_id)
+
+    @staticmethod
+    def _doc_groups(doc: DestinationDoc) -> List[Tuple[str, str]]:
+        return [(kind, text) for kind, text in ((TITLE, doc.title), (LOCATION, doc.location)) if text.strip()]
+
+    def _add_group(self, group: Tuple[str, str]) -> int:
+        group_id = self._next_group_id
+        self._next_group_id += 1
+        self._group_ids[group] = group_id
+        self._groups[group_id] = group
+        self._members[group_id] = set()
+        return group_id
+
+    def _group_keys(self, group_id: int) -> List[Tuple[str, int]]:
+        tokens = tokenize(self._groups[group_id][1])
+        return [(" ".join(tokens[start:]), group_id) for start in range(len(tokens))]
+
+    def _rescore(self, group_id: int) -> None:
+        ids = self._members[group_id]
+        score = max(popularity(self._docs[destination_id]) for destination_id in ids)
+        if self._groups[group_id][0] == LOCATION:
+            # Locations with more destinations rank higher
+            score += math.log1p(len(ids))
+        self._scores[group_id] = score
+
+    def _forget_short_prefixes(self, group_id: int) -> None:
+        """
+        Drop the memoized results a group could appear in.
+        """
+        for key, _ in self._group_keys(group_id):
+            for length in range(1, SHORT_PREFIX_LENGTH + 1):
+                self._short_prefix_cache.pop(key[:length], None)
+
+    def _upsert(self, doc: DestinationDoc) -> None:
+        self._remove(doc.id)
+        self._docs[doc.id] = doc
+        for group in self._doc_groups(doc):
+            group_id = self._group_ids.get(group)
+            if group_id is None:
+                group_id = self._add_group(group)
+                for key in self._group_keys(group_id):
+                    insort(self._keys, key)
+            self._members[group_id].add(doc.id)
+            self._rescore(group_id)
+            self._forget_short_prefixes(group_id)
+
+    def _remove(self, destination_id: int) -> None:
+        doc = self._docs.pop(destination_id, None)
+        if doc is None:
+            return
+
+        for group in self._doc_groups(doc):
+            group_id = self._group_ids.get(group)
+            if group_id is None:
+                continue
+            self._forget_short_prefixes(group_id)
+            ids = self._members[group_id]
+            ids.discard(destination_id)
+            if ids:
+                self._rescore(group_id)
+                continue
+
+            for key in self._group_keys(group_id):
+                index = bisect_left(self._keys, key)
+                if index < len(self._keys) and self._keys[index] == key:
+                    del self._keys[index]
+            del self._group_ids[group]
+            del self._groups[group_id]
+            del self._members[group_id]
+            del self._scores[group_id]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        Return the best-ranked titles and locations starting with `prefix`
+        (at any word boundary).
+        """
+        normalized = " ".join(tokenize(prefix))
+        if not normalized:
+            return []
+        # Keep a trailing space meaningful: "rome " should not match "romeo"
+        if prefix.endswith(" "):
+            normalized += " "
+
+        with self._lock:
+            short = len(normalized) <= SHORT_PREFIX_LENGTH
+            if short:
+                cached = self._short_prefix_cache.get(normalized, {}).get(limit)
+                if cached is not None:
+                    return cached
+
+            start = bisect_left(self._keys, (normalized,))
+            end = bisect_left(self._keys, (normalized + "\uffff",))
+            group_ids = {group_id for _, group_id in self._keys[start:end]}
+            best = heapq.nlargest(limit, group_ids, key=self._scores.__getitem__)
+
+            results = []
+            for group_id in best:
+                kind, text = self._groups[group_id]
+                members = self._members[group_id]
+                results.append({
+                    "text": text,
+                    "type": kind,
+                    "destination_id": self._best_destination(members) if kind == TITLE else None,
+                    "count": len(members),
+                })
+            if short:
+                self._short_prefix_cache.setdefault(normalized, {})[limit] = results
+            return results
+
+    def _best_destination(self, members: Set[int]) -> Optional[int]:
+        return max(members, key=lambda destination_id: popularity(self._docs[destination_id]))
+
+
+suggest_index = SuggestIndex(refresh_seconds=DESTINATION_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,247 @@
+# app/services/trending.py
+
+import asyncio
+import heapq
+import math
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import (
+    DESTINATION_INDEX_REFRESH_SECONDS,
+    TRENDING_HALF_LIFE_HOURS,
+    TRENDING_TOP_SIZE,
+)
+from app.models.booking import Booking
+from app.models.review import Review
+from app.services.destination_index import DestinationDoc, DestinationIndex
+from app.services.recommendations import IGNORED_BOOKING_STATUSES
+
+# How much each kind of event adds to a destination's popularity
+BOOKING_WEIGHT = 5.0
+REVIEW_WEIGHT = 3.0
+VIEW_WEIGHT = 1.0
+
+# Events older than this many half-lives weigh less than 0.1% of a new one,
+# so the initial load from the database ignores them
+SEED_HALF_LIVES = 10
+
+# Scores are kept relative to a reference time (see TrendingCounters) and
+# rescaled once that time is this many half-lives in the past, long before
+# the values could overflow a float
+RESCALE_HALF_LIVES = 64
+
+
+def _timestamp(value: datetime) -> float:
+    # The models store naive UTC datetimes (datetime.utcnow)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class TrendingCounters(DestinationIndex):
+    """
+    Exponentially time-decayed popularity of the active destinations.
+
+    Instead of decaying every counter as time passes, an event at time t
+    adds weight * 2 ** ((t - reference) / half_life): all counters then
+    decay at the same rate, so recording an event is O(1) and the ranking
+    only changes when a destination gets a new event. Counters live in a
+    NumPy array indexed by slot.
+
+    The top destinations are kept in a min-heap (with lazily discarded
+    stale entries): a destination can only enter the top list through its
+    own event, by beating the current minimum. Only removing a destination
+    that is in the top list needs a pass over the array.
+
+    Bookings and reviews made before the process started are loaded from
+    the database once (a plain range scan, no GROUP BY); after that the
+    counters only see the events of this process. Destination views are
+    not stored anywhere, so they only count from process start.
+    """
+
+    def __init__(self, half_life_hours: float, top_size: int, refresh_seconds: float):
+        super().__init__("destination_trending", refresh_seconds=refresh_seconds)
+        self.half_life = half_life_hours * 3600
+        self.top_size = top_size
+        self.started_at = time.time()
+        self._reference = self.started_at
+        self._slots: Dict[int, int] = {}
+        self._slot_ids = np.full(64, -1, dtype=np.int64)
+        self._scores = np.zeros(64)
+        self._free_slots: List[int] = []
+        self._active: Optional[Set[int]] = None
+        self._seeded = False
+        self._seed_lock: Optional[asyncio.Lock] = None
+        self._clear_top()
+
+    # --- counters ---------------------------------------------------------
+
+    def _slot(self, destination_id: int) -> int:
+        slot = self._slots.get(destination_id)
+        if slot is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = len(self._slots)
+                if slot >= len(self._scores):
+                    size = len(self._scores)
+                    self._slot_ids = np.concatenate([self._slot_ids, np.full(size, -1, dtype=np.int64)])
+                    self._scores = np.concatenate([self._scores, np.zeros(size)])
+            self._slots[destination_id] = slot
+            self._slot_ids[slot] = destination_id
+        return slot
+
+    def _drop(self, destination_id: int) -> bool:
+        """
+        Forget a destination; returns True when the top list needs a rebuild.
+        """
+        slot = self._slots.pop(destination_id, None)
+        if slot is None:
+            return False
+        self._slot_ids[slot] = -1
+        self._scores[slot] = 0.0
+        self._free_slots.append(slot)
+        return self._top.pop(destination_id, None) is not None
+
+    def _rescale(self, now: float) -> None:
+        half_lives = math.floor((now - self._reference) / self.half_life)
+        self._scores *= 2.0 ** -half_lives
+        self._reference += half_lives * self.half_life
+        self._rebuild_top()
+
+    def _add(self, destination_id: int, weight: float, at: float) -> None:
+        if self._active is not None and destination_id not in self._active:
+            return
+        if at - self._reference > RESCALE_HALF_LIVES * self.half_life:
+            self._rescale(at)
+        slot = self._slot(destination_id)
+        self._scores[slot] += weight * 2.0 ** ((at - self._reference) / self.half_life)
+        self._offer(destination_id, float(self._scores[slot]))
+
+    def record(self, destination_id: int, weight: float, at: Optional[float] = None) -> None:
+        """
+        Count an event for a destination, `at` being a Unix timestamp
+        (defaults to now).
+        """
+        with self._lock:
+            self._add(destination_id, weight, time.time() if at is None else at)
+
+    def record_booking(self, destination_id: int) -> None:
+        self.record(destination_id, BOOKING_WEIGHT)
+
+    def record_review(self, destination_id: int) -> None:
+        self.record(destination_id, REVIEW_WEIGHT)
+
+    def record_view(self, destination_id: int) -> None:
+        self.record(destination_id, VIEW_WEIGHT)
+
+    # --- top list ---------------------------------------------------------
+
+    def _clear_top(self) -> None:
+        # destination id -> score for the current top list; the heap may also
+        # hold older (lower) scores of the same destinations, skipped on pop
+        self._top: Dict[int, float] = {}
+        self._heap: List[Tuple[float, int]] = []
+
+    def _rebuild_top(self) -> None:
+        self._clear_top()
+        used = np.flatnonzero((self._slot_ids >= 0) & (self._scores > 0))
+        if len(used) > self.top_size:
+            used = used[np.argpartition(-self._scores[used], self.top_size - 1)[:self.top_size]]
+        for slot in used:
+            self._top[int(self._slot_ids[slot])] = float(self._scores[slot])
+        self._heap = [(score, destination_id) for destination_id, score in self._top.items()]
+        heapq.heapify(self._heap)
+
+    def _minimum(self) -> Tuple[float, int]:
+        while self._top.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def _offer(self, destination_id: int, score: float) -> None:
+        if destination_id not in self._top and len(self._top) >= self.top_size:
+            if self.top_size <= 0 or score <= self._minimum()[0]:
+                return
+            _, evicted_id = heapq.heappop(self._heap)
+            del self._top[evicted_id]
+        self._top[destination_id] = score
+        heapq.heappush(self._heap, (score, destination_id))
+        if len(self._heap) > 4 * max(self.top_size, 16):
+            # Too many stale entries: keep only the current ones
+            self._heap = [(score, destination_id) for destination_id, score in self._top.items()]
+            heapq.heapify(self._heap)
+
+    def trending(self, limit: int = 10) -> List[Tuple[int, float]]:
+        """
+        Return (destination id, decayed score) pairs, most popular first.
+        The score is in "event weights": a booking made now adds BOOKING_WEIGHT.
+        """
+        with self._lock:
+            decay = 2.0 ** ((self._reference - time.time()) / self.half_life)
+            ranked = sorted(self._top.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [(destination_id, score * decay) for destination_id, score in ranked]
+
+    # --- loading ----------------------------------------------------------
+
+    async def ensure_loaded(self, db: Optional[AsyncSession] = None) -> None:
+        """
+        Load the bookings and reviews made before the process started (once),
+        then keep the set of active destinations up to date.
+        """
+        if not self._seeded:
+            if self._seed_lock is None:
+                self._seed_lock = asyncio.Lock()
+            async with self._seed_lock:
+                if not self._seeded:
+                    await self._seed(db)
+                    self._seeded = True
+        await super().ensure_loaded(db)
+
+    async def _seed(self, db: AsyncSession) -> None:
+        # Live events are recorded from started_at on, so stop the scan there
+        since = datetime.utcfromtimestamp(self.started_at - SEED_HALF_LIVES * self.half_life)
+        until = datetime.utcfromtimestamp(self.started_at)
+        bookings = await db.execute(
+            select(Booking.destination_id, Booking.booking_date)
+            .where(Booking.booking_date >= since, Booking.booking_date < until)
+            .where(func.lower(Booking.status).not_in(IGNORED_BOOKING_STATUSES))
+        )
+        reviews = await db.execute(
+            select(Review.destination_id, Review.created_at)
+            .where(Review.created_at >= since, Review.created_at < until)
+        )
+        with self._lock:
+            for destination_id, booked_at in bookings.all():
+                self._add(destination_id, BOOKING_WEIGHT, _timestamp(booked_at))
+            for destination_id, reviewed_at in reviews.all():
+                self._add(destination_id, REVIEW_WEIGHT, _timestamp(reviewed_at))
+
+    # --- DestinationIndex hooks -----------------------------------------
+
+    def _reset(self, docs: List[DestinationDoc]) -> None:
+        self._active = {doc.id for doc in docs}
+        dropped = [self._drop(destination_id) for destination_id in list(self._slots) if destination_id not in self._active]
+        if any(dropped):
+            self._rebuild_top()
+
+    def _upsert(self, doc: DestinationDoc) -> None:
+        if self._active is not None:
+            self._active.add(doc.id)
+
+    def _remove(self, destination_id: int) -> None:
+        if self._active is not None:
+            self._active.discard(destination_id)
+        if self._drop(destination_id):
+            self._rebuild_top()
+
+
+trending_counters = TrendingCounters(
+    half_life_hours=TRENDING_HALF_LIFE_HOURS,
+    top_size=TRENDING_TOP_SIZE,
+    refresh_seconds=DESTINATION_INDEX_REFRESH_SECONDS,
+)
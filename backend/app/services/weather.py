@@ -0,0 +1,384 @@
+# app/services/weather.py
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional
+
+import httpx
+from sqlalchemy import select
+
+from app.core.cache import MISSING, create_cache
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import (
+    WEATHER_API_KEY,
+    WEATHER_API_URL,
+    WEATHER_BATCH_CONCURRENCY,
+    WEATHER_BATCH_TIMEOUT_SECONDS,
+    WEATHER_CACHE_MAX_SIZE,
+    WEATHER_CACHE_TTL_SECONDS,
+    WEATHER_CIRCUIT_FAILURE_THRESHOLD,
+    WEATHER_CIRCUIT_RESET_SECONDS,
+    WEATHER_COORDINATE_DECIMALS,
+    WEATHER_MAX_CONNECTIONS,
+    WEATHER_PREFETCH_CONCURRENCY,
+    WEATHER_PREFETCH_INTERVAL_SECONDS,
+    WEATHER_STALE_TTL_SECONDS,
+    WEATHER_TIMEOUT_SECONDS,
+)
+from app.core.database import AsyncSessionLocal
+from app.models.destination import Destination
+
+logger = logging.getLogger(__name__)
+
+# Placeholder key from the sample .env; treated as "no key configured"
+PLACEHOLDER_API_KEY = "your-weather-api-key"
+
+
+def mock_weather(location: str) -> Dict[str, Any]:
+    """
+    Weather returned when no API key is configured or the upstream fails.
+    """
+    return {
+        "location": location,
+        "temperature": 22.5,
+        "description": "Partly cloudy",
+        "humidity": 65,
+        "wind_speed": 5.2,
+        "icon": "02d"
+    }
+
+
+class WeatherQuery(NamedTuple):
+    """
+    One weather lookup: its cache key, the upstream query parameters and
+    the location name to report (None: use the name the upstream returns).
+    """
+    key: Hashable
+    params: Dict[str, Any]
+    location: Optional[str]
+
+
+class WeatherService:
+    """
+    Proxy for the OpenWeatherMap current weather API.
+
+    Requests go through one pooled httpx.AsyncClient for the lifetime of the
+    app, so connections (and their TLS sessions) are reused. Successful
+    responses are cached per city name or per coordinates rounded to
+    `coordinate_decimals`, and concurrent misses for the same key share a
+    single upstream request. Upstream failures fall back to mock data and
+    are not cached.
+
+    Answers are fresh for `cache_ttl` seconds. After that they are still
+    served, for up to `stale_ttl` seconds, while a refresh runs in the
+    background (stale-while-revalidate). A circuit breaker stops calling
+    the upstream for a while once it keeps failing.
+
+    Point `api_url` at a local server (WEATHER_API_URL) to stub the upstream.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        cache_ttl: float,
+        stale_ttl: float,
+        cache_max_size: int,
+        coordinate_decimals: int,
+        timeout: float,
+        max_connections: int,
+        batch_concurrency: int,
+        batch_timeout: float,
+        breaker: CircuitBreaker,
+    ):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.coordinate_decimals = coordinate_decimals
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.batch_concurrency = batch_concurrency
+        self.batch_timeout = batch_timeout
+        self.breaker = breaker
+        self.fresh_ttl = cache_ttl
+        # Entries are (weather, fetched at) and stay in the cache while usable
+        self.cache = create_cache("weather", max_size=cache_max_size, ttl=max(stale_ttl, cache_ttl))
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key) and self.api_key != PLACEHOLDER_API_KEY
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled client (on application shutdown).
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # --- queries ----------------------------------------------------------
+
+    def coordinates_query(self, lat: float, lon: float) -> WeatherQuery:
+        # Query the rounded coordinates, so the cached answer is the same
+        # whichever request in the cell populated it
+        lat, lon = round(lat, self.coordinate_decimals), round(lon, self.coordinate_decimals)
+        return WeatherQuery(("coords", lat, lon), {"lat": lat, "lon": lon}, None)
+
+    @staticmethod
+    def city_query(location: str) -> WeatherQuery:
+        return WeatherQuery(("city", location.strip().lower()), {"q": location}, location)
+
+    # --- lookups ----------------------------------------------------------
+
+    async def by_coordinates(self, lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Current weather at the given coordinates.
+        """
+        weather = await self.lookup(self.coordinates_query(lat, lon))
+        return mock_weather("Your location") if weather is None else weather
+
+    async def by_city(self, location: str) -> Dict[str, Any]:
+        """
+        Current weather for a city name.
+        """
+        weather = await self.lookup(self.city_query(location))
+        return mock_weather(location) if weather is None else weather
+
+    def cached(self, query: WeatherQuery) -> Optional[Dict[str, Any]]:
+        """
+        The cached weather for a query, or None on a miss. A stale answer is
+        still returned, and refreshed in the background.
+        """
+        entry = self.cache.get(query.key)
+        if entry is MISSING:
+            return None
+        weather, fetched_at = entry
+        if time.monotonic() - fetched_at >= self.fresh_ttl and self.enabled:
+            self._start_fetch(query)
+        return weather
+
+    def age(self, query: WeatherQuery) -> Optional[float]:
+        """
+        Seconds since the cached answer for a query was fetched (None if not cached).
+        """
+        entry = self.cache.get(query.key)
+        return None if entry is MISSING else time.monotonic() - entry[1]
+
+    async def lookup(self, query: WeatherQuery) -> Optional[Dict[str, Any]]:
+        """
+        Weather for a query, or None when it is unavailable (no API key
+        configured or the upstream failed).
+        """
+        weather = self.cached(query)
+        if weather is not None or not self.enabled:
+            return weather
+        # A caller that gives up must not cancel the fetch for the others
+        return await asyncio.shield(self._start_fetch(query))
+
+    async def refresh_many(self, queries: List[WeatherQuery], max_age: float, concurrency: int) -> int:
+        """
+        Re-fetch the queries whose answer is missing or older than `max_age`
+        seconds, at most `concurrency` at a time. Returns how many were
+        refreshed successfully.
+        """
+        if not self.enabled:
+            return 0
+        due = {}
+        for query in queries:
+            age = self.age(query)
+            if age is None or age >= max_age:
+                due[query.key] = query
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def refresh(query: WeatherQuery) -> bool:
+            async with semaphore:
+                return await self._start_fetch(query) is not None
+
+        return sum(await asyncio.gather(*[refresh(query) for query in due.values()]))
+
+    async def lookup_many(self, queries: List[WeatherQuery]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Weather for several queries at once (None where unavailable).
+
+        Cache hits are answered directly; the misses are fetched concurrently,
+        at most `batch_concurrency` at a time and each within `batch_timeout`
+        seconds. A fetch that times out keeps running and fills the cache for
+        later requests.
+        """
+        results = [self.cached(query) for query in queries]
+        missing = {query.key: query for query, weather in zip(queries, results) if weather is None}
+        if not missing or not self.enabled:
+            return results
+
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def fetch(query: WeatherQuery) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self.lookup(query), self.batch_timeout)
+                except asyncio.TimeoutError:
+                    return None
+
+        fetched = dict(zip(missing, await asyncio.gather(*[fetch(query) for query in missing.values()])))
+        return [
+            fetched[query.key] if weather is None else weather
+            for query, weather in zip(queries, results)
+        ]
+
+    def _start_fetch(self, query: WeatherQuery) -> asyncio.Future:
+        """
+        Fetch a query in the background, once for all concurrent callers
+        (single-flight). The future resolves to the weather, or None.
+        """
+        future = self._inflight.get(query.key)
+        if future is None:
+            async def run():
+                try:
+                    data = await self._fetch(query.params)
+                    weather = None
+                    if data is not None:
+                        weather = _parse(data, query.location or data.get("name") or "Your location")
+                    if weather is not None:
+                        self.cache.set(query.key, (weather, time.monotonic()))
+                    return weather
+                finally:
+                    self._inflight.pop(query.key, None)
+
+            future = asyncio.ensure_future(run())
+            self._inflight[query.key] = future
+        return future
+
+    async def _fetch(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Call the upstream API; None on any failure or while the circuit is open.
+        """
+        if not self.breaker.allow():
+            return None
+        try:
+            response = await self.client.get(
+                self.api_url,
+                params={**params, "appid": self.api_key, "units": "metric"}
+            )
+        except httpx.HTTPError:
+            self.breaker.record_failure()
+            return None
+
+        # Client errors (e.g. an unknown city) don't mean the upstream is down
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if response.status_code != 200:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+
+def _parse(data: Dict[str, Any], location: str) -> Optional[Dict[str, Any]]:
+    try:
+        return {
+            "location": location,
+            "temperature": data["main"]["temp"],
+            "description": data["weather"][0]["description"],
+            "humidity": data["main"]["humidity"],
+            "wind_speed": data["wind"]["speed"],
+            "icon": data["weather"][0]["icon"]
+        }
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+weather_service = WeatherService(
+    WEATHER_API_URL,
+    WEATHER_API_KEY,
+    cache_ttl=WEATHER_CACHE_TTL_SECONDS,
+    stale_ttl=WEATHER_STALE_TTL_SECONDS,
+    cache_max_size=WEATHER_CACHE_MAX_SIZE,
+    coordinate_decimals=WEATHER_COORDINATE_DECIMALS,
+    timeout=WEATHER_TIMEOUT_SECONDS,
+    max_connections=WEATHER_MAX_CONNECTIONS,
+    batch_concurrency=WEATHER_BATCH_CONCURRENCY,
+    batch_timeout=WEATHER_BATCH_TIMEOUT_SECONDS,
+    breaker=CircuitBreaker(
+        "weather",
+        failure_threshold=WEATHER_CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds=WEATHER_CIRCUIT_RESET_SECONDS,
+    ),
+)
+
+
+class WeatherPrefetcher:
+    """
+    Background task keeping the weather of every active destination cached.
+
+    Every `interval_seconds` it re-fetches the destinations whose answer
+    would otherwise go stale before the next run, so requests for them are
+    served from the cache without waiting on the upstream.
+    """
+
+    def __init__(self, service: WeatherService, interval_seconds: float, concurrency: int):
+        self.service = service
+        self.interval_seconds = interval_seconds
+        self.concurrency = concurrency
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if not self.service.enabled or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._run(), name="weather-prefetcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Destination.latitude, Destination.longitude)
+                .where(Destination.is_active == True)
+                .where(Destination.latitude.is_not(None), Destination.longitude.is_not(None))
+            )
+            queries = [self.service.coordinates_query(lat, lon) for lat, lon in result.all()]
+        return await self.service.refresh_many(
+            queries,
+            max_age=self.service.fresh_ttl - self.interval_seconds,
+            concurrency=self.concurrency,
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Weather prefetch failed")
+            await asyncio.sleep(self.interval_seconds)
+
+
+weather_prefetcher = WeatherPrefetcher(
+    weather_service,
+    interval_seconds=WEATHER_PREFETCH_INTERVAL_SECONDS,
+    concurrency=WEATHER_PREFETCH_CONCURRENCY,
+)
@@ -0,0 +1,145 @@
+# benchmark_booking_contention.py
+#
+# Contention benchmark for BookingService.create_booking: many concurrent
+# bookers race for the seats of one destination on one hot travel day.
+# Reports bookings/s, how many were turned away once the day was full, and
+# checks that the day was not oversold.
+#
+# Creates a throwaway user and destination in the configured database and
+# removes them (with their bookings and inventory) afterwards.
+# Usage: python benchmark_booking_contention.py [--bookers 32] [--capacity 500]
+#        [--attempts 2000] [--travelers 1]
+
+import argparse
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select
+
+from app.core.database import SessionLocal
+from app.models.booking import Booking
+from app.models.destination import Destination
+from app.models.inventory import DestinationInventory
+from app.models.review import Review  # noqa: F401 - registers the mappers used by Destination
+from app.models.user import User
+from app.schemas.booking import BookingCreate
+from app.services.booking_service import BookingService
+
+def _setup(capacity: int):
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        user = User(
+            username=f"bench-{tag}",
+            email=f"bench-{tag}@example.com",
+            hashed_password="!",
+            full_name="Benchmark User",
+        )
+        destination = Destination(
+            title=f"Benchmark destination {tag}",
+            location="Benchmark",
+            price=100.0,
+            is_active=True,
+            daily_capacity=capacity,
+        )
+        db.add_all([user, destination])
+        db.commit()
+        return user.id, destination.id
+    finally:
+        db.close()
+
+def _cleanup(user_id: int, destination_id: int) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(delete(Booking).where(Booking.destination_id == destination_id))
+        db.execute(delete(DestinationInventory).where(DestinationInventory.destination_id == destination_id))
+        db.execute(delete(Destination).where(Destination.id == destination_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+    finally:
+        db.close()
+
+def benchmark_booking_contention(bookers: int, capacity: int, attempts: int, travelers: int):
+    """Run the benchmark and print the results"""
+    user_id, destination_id = _setup(capacity)
+    travel_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=30)
+    request = BookingCreate(
+        destination_id=destination_id,
+        travel_date=travel_date,
+        number_of_travelers=travelers,
+        contact_email="bench@example.com",
+    )
+    lock = threading.Lock()
+    remaining = [attempts]
+    counts = {"booked": 0, "full": 0, "errors": 0}
+    latencies = []
+
+    def booker():
+        db = SessionLocal()
+        service = BookingService(db)
+        try:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                started = time.perf_counter()
+                try:
+                    service.create_booking(request, user_id)
+                    outcome = "booked"
+                except ValueError:
+                    outcome = "full"
+                except Exception:
+                    db.rollback()
+                    outcome = "errors"
+                with lock:
+                    counts[outcome] += 1
+                    latencies.append(time.perf_counter() - started)
+        finally:
+            db.close()
+
+    try:
+        threads = [threading.Thread(target=booker) for _ in range(bookers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        db = SessionLocal()
+        try:
+            booked_travelers = db.execute(
+                select(func.coalesce(func.sum(Booking.number_of_travelers), 0))
+                .where(Booking.destination_id == destination_id)
+            ).scalar_one()
+            reserved = db.execute(
+                select(DestinationInventory.reserved).where(DestinationInventory.destination_id == destination_id)
+            ).scalar() or 0
+        finally:
+            db.close()
+
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0
+        print(f"📊 {bookers} bookers, {attempts} attempts, capacity {capacity}, {travelers} traveler(s) each")
+        print(f"   {attempts / elapsed:.0f} attempts/s, {counts['booked'] / elapsed:.0f} bookings/s in {elapsed:.2f}s")
+        print(f"   booked {counts['booked']}, turned away {counts['full']}, errors {counts['errors']}")
+        print(f"   latency p50 {p50:.1f} ms, p99 {p99:.1f} ms")
+        if booked_travelers <= capacity and booked_travelers == reserved:
+            print(f"✅ Not oversold: {booked_travelers}/{capacity} seats booked, inventory says {reserved}")
+        else:
+            print(f"❌ Oversold or out of sync: {booked_travelers}/{capacity} seats booked, inventory says {reserved}")
+    finally:
+        _cleanup(user_id, destination_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Booking contention benchmark")
+    parser.add_argument("--bookers", type=int, default=32, help="concurrent booking threads")
+    parser.add_argument("--capacity", type=int, default=500, help="seats on the hot day")
+    parser.add_argument("--attempts", type=int, default=2000, help="booking attempts in total")
+    parser.add_argument("--travelers", type=int, default=1, help="travelers per booking")
+    args = parser.parse_args()
+    benchmark_booking_contention(args.bookers, args.capacity, args.attempts, args.travelers)
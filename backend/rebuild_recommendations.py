@@ -0,0 +1,37 @@
+# rebuild_recommendations.py
+#
+# Offline full rebuild of the item-item recommendation model.
+# Reads all bookings and reviews, computes the destination neighbours and
+# saves them to RECOMMENDATION_MODEL_PATH; running API workers pick up the
+# new file on their next update.
+# New bookings and reviews are applied incrementally by the API itself, and
+# its updater also rebuilds the model periodically to account for cancelled
+# bookings or edited/deleted reviews, so this is only needed for the initial
+# model or to force a rebuild right away.
+# Usage: python rebuild_recommendations.py
+
+import time
+
+from app.core.config import RECOMMENDATION_MODEL_PATH
+from app.core.database import SessionLocal
+from app.models.user import User  # noqa: F401 - registers the mappers used by Destination
+from app.services.recommendations import build_model
+
+def rebuild_recommendations():
+    """Build the recommendation model and save it for the API workers"""
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        model = build_model(db)
+        model.save(RECOMMENDATION_MODEL_PATH)
+        print(
+            f"✅ Saved recommendation model for {len(model.item_ids)} destinations "
+            f"to {RECOMMENDATION_MODEL_PATH} in {time.perf_counter() - started:.1f}s"
+        )
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_recommendations()
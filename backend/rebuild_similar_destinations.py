@@ -0,0 +1,39 @@
+# rebuild_similar_destinations.py
+#
+# Recomputes every "similar destinations" list (including the TF-IDF
+# weights) from scratch and saves them to SIMILAR_DESTINATIONS_PATH.
+# The API keeps the lists up to date on its own; run this after large
+# catalog imports so the term weights reflect the new catalog, or before
+# the first start on a large catalog so the API finds the lists on disk.
+# Usage: python rebuild_similar_destinations.py
+
+import time
+
+from sqlalchemy import select
+
+from app.core.config import SIMILAR_DESTINATIONS_PATH
+from app.core.database import SessionLocal
+from app.models.user import User  # noqa: F401 - registers the mappers used by Destination
+from app.models.destination import Destination
+from app.services.destination_index import DestinationDoc
+from app.services.similar_index import similar_index
+
+def rebuild_similar_destinations():
+    """Recompute and save the similar destinations lists"""
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = db.execute(select(Destination).where(Destination.is_active == True)).scalars()
+        docs = [DestinationDoc.from_destination(row) for row in rows]
+        similar_index.rebuild(docs)
+        print(
+            f"✅ Saved similar destinations for {len(docs)} destinations "
+            f"to {SIMILAR_DESTINATIONS_PATH} in {time.perf_counter() - started:.1f}s"
+        )
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_similar_destinations()
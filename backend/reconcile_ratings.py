@@ -0,0 +1,29 @@
+# reconcile_ratings.py
+#
+# One-off repair command for the destination review aggregates
+# (review_count, rating_sum and the derived rating).
+# Usage: python reconcile_ratings.py
+
+from app.core.database import SessionLocal
+from app.models.user import User  # noqa: F401 - registers the mappers used by Destination
+from app.models.booking import Booking  # noqa: F401
+from app.crud.review import reconcile_destination_ratings
+
+def reconcile_ratings():
+    """Recompute review aggregates for every destination that has drifted"""
+    db = SessionLocal()
+    try:
+        repaired = reconcile_destination_ratings(db)
+        db.commit()
+        if repaired:
+            print(f"✅ Repaired ratings for {len(repaired)} destinations: {repaired}")
+        else:
+            print("✅ All destination ratings are consistent")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    reconcile_ratings()
@@ -0,0 +1,35 @@
+# run_payment_workers.py
+#
+# Charges queued payments outside of the API processes: runs
+# PAYMENT_WORKERS worker threads (or --workers) against PAYMENT_GATEWAY
+# until interrupted. Start the API with PAYMENT_WORKERS=0 to leave all
+# payments to these workers.
+# Usage: python run_payment_workers.py [--workers 8]
+
+import argparse
+import time
+
+from app.core.config import PAYMENT_GATEWAY, PAYMENT_WORKERS
+from app.models.user import User  # noqa: F401 - registers the mappers used by Booking
+from app.models.destination import Destination  # noqa: F401
+from app.models.review import Review  # noqa: F401
+from app.services.payments import payment_workers
+
+def run_payment_workers(workers: int):
+    """Run the payment workers until Ctrl+C"""
+    payment_workers.workers = workers
+    payment_workers.start()
+    print(f"💳 {workers} payment worker(s) charging through the '{PAYMENT_GATEWAY}' gateway, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Stopping payment workers...")
+    finally:
+        payment_workers.stop(timeout=30)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Payment workers")
+    parser.add_argument("--workers", type=int, default=max(PAYMENT_WORKERS, 1), help="worker threads")
+    args = parser.parse_args()
+    run_payment_workers(args.workers)
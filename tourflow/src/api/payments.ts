@@ -1,14 +1,33 @@
 // src/api/payments.ts
 
 // CORRECT: Import the shared, configured instance from your central lib file
-import api from './index'; 
+import api from './index';
+
+// Payments are charged in the background: poll until they are settled.
+// A payment still PENDING or PROCESSING after MAX_POLLS is returned as is:
+// it may yet go through, so it must not be reported as failed.
+const POLL_INTERVAL_MS = 1000;
+const MAX_POLLS = 60;
+
+const getPayment = (paymentId: string) => api.get(`/payments/${paymentId}`);
 
 export const paymentsAPI = {
-  processPayment: (paymentData: {
+  processPayment: async (paymentData: {
     booking_id: number;
     card_number: string;
     expiry_date: string;
     cvv: string;
     cardholder_name: string;
-  }) => api.post('/payments/process', paymentData),
-};
\ No newline at end of file
+  }) => {
+    let response = await api.post('/payments/process', paymentData);
+    for (let i = 0; i < MAX_POLLS && ['PENDING', 'PROCESSING'].includes(response.data.status); i++) {
+      await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+      response = await getPayment(response.data.payment_id);
+    }
+    if (response.data.status === 'FAILED') {
+      throw new Error(response.data.message);
+    }
+    return response;
+  },
+  getPayment,
+};
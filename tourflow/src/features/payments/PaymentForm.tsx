@@ -55,9 +55,15 @@ const PaymentForm = () => {
   const paymentMutation = useMutation({
     // Assign the explicitly defined function to mutationFn
     mutationFn: processPayment,
-    onSuccess: () => {
-      toast.success('Payment successful!');
-      navigate('/payment-success');
+    onSuccess: (response) => {
+      if (response.data.status === 'SUCCEEDED') {
+        toast.success('Payment successful!');
+        navigate('/payment-success');
+      } else {
+        // Not settled yet: the booking is confirmed once the payment goes through
+        toast('Your payment is still being processed. Check My Bookings for its status.');
+        navigate('/my-bookings');
+      }
     },
     onError: () => {
       toast.error('Payment failed. Please try again.');